@@ -1,26 +1,67 @@
 """Main FastAPI application entrypoint."""
 
+import os
+from collections.abc import AsyncIterator, Callable, Hashable
+from contextlib import asynccontextmanager
 from datetime import timedelta
+from pathlib import Path
 from uuid import uuid4
 
-from fastapi import Depends, FastAPI, HTTPException, status
+from fastapi import Depends, FastAPI, HTTPException, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
 from fastapi.security import OAuth2PasswordRequestForm
 
-from backend.auth import (ACCESS_TOKEN_EXPIRE_MINUTES, authenticate_user,
-                          create_access_token, get_current_user,
-                          get_password_hash, set_access_token_cookie,
+from backend.auth import (ACCESS_TOKEN_EXPIRE_MINUTES, MONGODB_URI,
+                          authenticate_user,
+                          create_access_token, get_current_admin,
+                          get_current_user,
+                          password_hasher, session_cache,
+                          set_access_token_cookie, user_repository,
                           validate_username)
-from backend.graph.builder import build_graph
-from backend.graph.utils import get_course_subgraph
-from backend.models.concepts import Concept
-from backend.models.courses import Course
-from backend.models.graph import CourseGraph
-from backend.models.users import User, UserCreate
-from backend.sample_data import concepts, courses, fake_users_db
+from backend.cache import ResponseCache
+from backend.catalog import Catalog, CatalogEdit, CatalogStore
+from backend.compression import MIN_COMPRESS_BYTES, negotiate, variant_etag
+from backend.graph.layout import LayoutCache
+from backend.graph.toposort import CycleError
+from backend.hashing import HashingOverloadedError
+from backend.metrics import REGISTRY, MetricsMiddleware, span
+from backend.profiling import ProfiledRoute, ProfilingMiddleware, RequestProfiler
+from backend.progress import ProgressTracker
+from backend.repositories.progress import (InMemoryProgressRepository,
+                                           MongoProgressRepository,
+                                           ProgressRepository)
+from backend.snapshot import SnapshotWatcher, load_sources, open_catalog
+from backend.models.catalog import CatalogInfo
+from backend.models.concepts import (MAX_BATCH_SIZE, Concept, ConceptBatch,
+                                     ConceptBatchRequest, LearningPath,
+                                     PrerequisiteCheck)
+from backend.models.courses import Course, CoursePage, CourseSummary
+from backend.models.graph import (ConceptNeighborhood, ConceptNode,
+                                  CourseGraph, CourseGraphPage)
+from backend.models.profiling import ProfilerSettings, ProfilerStatus
+from backend.models.progress import Completion, CourseFrontier
+from backend.models.search import SearchHit, SearchResults
+from backend.models.users import User, UserCreate, UserInDB
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Start watching the catalog snapshot on startup and release application resources on shutdown."""
+    if SNAPSHOT_WATCHER is not None:
+        SNAPSHOT_WATCHER.start()
+    yield
+    if SNAPSHOT_WATCHER is not None:
+        SNAPSHOT_WATCHER.stop()
+    PROFILER.disable()
+    password_hasher.shutdown()
+
+
+app = FastAPI(lifespan=lifespan)
+app.router.route_class = ProfiledRoute
+PROFILER = RequestProfiler()
 
 DEV_ORIGINS = [
     "http://localhost:3000",
@@ -33,18 +74,136 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing"],
+)
+# Stored responses carry precompressed variants; this only compresses the others on the fly.
+app.add_middleware(GZipMiddleware, minimum_size=MIN_COMPRESS_BYTES, compresslevel=6)
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(ProfilingMiddleware, profiler=PROFILER)
+
+# Set both to load the catalog from a JSONL export instead of the sample data.
+CONCEPTS_PATH = os.environ.get("NEXUS_CONCEPTS_PATH")
+COURSES_PATH = os.environ.get("NEXUS_COURSES_PATH")
+# A snapshot built with `python -m backend.snapshot` from the same sources skips validation at startup.
+SNAPSHOT_PATH = os.environ.get("NEXUS_SNAPSHOT_PATH")
+
+CATALOG = CatalogStore(
+    open_catalog(
+        Path(SNAPSHOT_PATH) if SNAPSHOT_PATH else None,
+        Path(CONCEPTS_PATH) if CONCEPTS_PATH else None,
+        Path(COURSES_PATH) if COURSES_PATH else None,
+    ),
+)
+# Every worker maps the same snapshot file and swaps in a new catalog when the file is replaced.
+SNAPSHOT_WATCHER = (
+    SnapshotWatcher(
+        CATALOG,
+        Path(SNAPSHOT_PATH),
+        interval=float(os.environ.get("NEXUS_SNAPSHOT_POLL_SECONDS", "5")),
+    )
+    if SNAPSHOT_PATH
+    else None
+)
+# Serialized catalog responses with their ETags, keyed by (route, resource ID, parameters...).
+RESPONSE_CACHE = ResponseCache()
+# The latest layout of each course graph; kept across versions so a recompute can reuse unchanged layers.
+LAYOUTS = LayoutCache()
+
+
+def invalidate_responses(catalog: Catalog, course_ids: set[str] | None) -> None:
+    """Drop cached responses rendered from a previous catalog version, and the layouts of courses that no longer have concepts.
+
+    Stale entries could no longer be hit anyway, since lookups compare versions; this frees their memory right away. Layouts of courses that still have concepts are kept, so their next recompute can reuse unchanged layers.
+
+    Args:
+        catalog (Catalog): The catalog that changed.
+        course_ids (set[str] | None): The courses that changed, or None if the whole catalog was reloaded.
+    """
+    if course_ids is None:
+        RESPONSE_CACHE.clear()
+        LAYOUTS.retain(catalog.concepts_by_course)
+        return
+    for course_id in course_ids:
+        if not catalog.concepts_in_course(course_id):
+            LAYOUTS.discard(course_id)
+        for layout in (True, False):
+            for requested in CONCEPT_FIELD_VARIANTS:
+                RESPONSE_CACHE.discard(("graph", course_id, layout, requested))
+        for fields in COURSE_FIELD_VARIANTS:
+            RESPONSE_CACHE.discard(("course", course_id, fields))
+
+
+CATALOG.subscribe(invalidate_responses)
+
+progress_repository: ProgressRepository = (
+    MongoProgressRepository.from_uri(MONGODB_URI)
+    if MONGODB_URI
+    else InMemoryProgressRepository()
+)
+PROGRESS = ProgressTracker(progress_repository)
+
+REGISTRY.stats("password_hashing", "Password hashing pool", password_hasher.stats)
+REGISTRY.stats("session_cache", "Session cache", session_cache.stats)
+REGISTRY.stats("response_cache", "Catalog response cache", RESPONSE_CACHE.stats)
+REGISTRY.stats("progress", "Learner progress tracker", PROGRESS.stats)
+REGISTRY.stats("graph_layouts", "Course graph layout cache", LAYOUTS.stats)
+REGISTRY.stats("content", "Concept content store", lambda: CATALOG.current.content.stats())
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# Heavy fields are left out of responses unless requested with `fields=`.
+COURSE_HEAVY_FIELDS = frozenset({"concepts", "concepts.content"})
+CONCEPT_HEAVY_FIELDS = frozenset({"content"})
+COURSE_FIELD_VARIANTS: tuple[frozenset[str], ...] = (
+    frozenset(),
+    frozenset({"concepts"}),
+    COURSE_HEAVY_FIELDS,
 )
+CONCEPT_FIELD_VARIANTS: tuple[frozenset[str], ...] = (frozenset(), CONCEPT_HEAVY_FIELDS)
 
-CONCEPTS = [Concept.model_validate(c) for c in concepts]
-COURSES = [Course.model_validate(c) for c in courses]
-CONCEPT_GRAPH = build_graph(CONCEPTS)
+# Page sizes of the layered course graph are counted in concepts; a page always holds whole layers.
+DEFAULT_GRAPH_PAGE_SIZE = 200
+MAX_GRAPH_PAGE_SIZE = 2000
+MAX_NEIGHBORHOOD_HOPS = 5
+MAX_NEIGHBORHOOD_NODES = 1000
+
+DEFAULT_SEARCH_LIMIT = 10
+MAX_SEARCH_LIMIT = 50
+MAX_QUERY_LENGTH = 200
+
+# Catalog responses are per user and may change with any admin edit, so clients must revalidate; with ETags that costs a 304.
+CATALOG_CACHE_CONTROL = "private, no-cache"
+
+
+@app.exception_handler(HashingOverloadedError)
+async def hashing_overloaded_handler(
+    request: Request,
+    exc: HashingOverloadedError,
+) -> JSONResponse:
+    """Shed load with a 503 when the password hashing queue is full."""
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Server busy, please try again"},
+        headers={"Retry-After": "1"},
+    )
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics() -> PlainTextResponse:
+    """Expose request, span and service metrics in Prometheus text format.
+
+    Returns:
+        PlainTextResponse: Every registered metric, for a Prometheus scraper.
+    """
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
 
 
 @app.post("/signup")
-def signup(user: UserCreate) -> JSONResponse:
+async def signup(user: UserCreate) -> JSONResponse:
     """Register a new user and issue an access token.
 
-    This endpoint validates the username, hashes the password, stores the user in the database, and returns a response with a session cookie set.
+    This endpoint validates the username, hashes the password, stores the user in the database, and returns a response with a session cookie set. Hashing and database calls run off the event loop.
 
     Args:
         user (UserCreate): The user signup data including username, full name, email, and password.
@@ -53,28 +212,33 @@ def signup(user: UserCreate) -> JSONResponse:
         JSONResponse: A response indicating success, with an access token set as a secure cookie.
 
     Raises:
-        HTTPException: If the username is already registered.
+        HTTPException: If the username is already registered, or the server is too busy to hash the password.
 
     """
-    if not validate_username(user.username):
+    if not await run_in_threadpool(validate_username, user.username):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Username already registered",
         )
 
-    hashed_password = get_password_hash(user.password)
+    hashed_password = await password_hasher.hash(user.password)
 
-    new_user = {
-        "id": str(uuid4()),
-        "username": user.username,
-        "full_name": user.full_name,
-        "email": user.email,
-        "hashed_password": hashed_password,
-    }
+    new_user = UserInDB(
+        id=uuid4(),
+        username=user.username,
+        full_name=user.full_name,
+        email=user.email,
+        hashed_password=hashed_password,
+    )
 
-    fake_users_db.append(new_user)
+    # The username may have been taken while the password was being hashed.
+    if not await run_in_threadpool(user_repository.add, new_user):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Username already registered",
+        )
 
-    access_token = create_access_token(data={"sub": new_user["id"]})
+    access_token = create_access_token(data={"sub": str(new_user.id)})
     response = JSONResponse({"message": "User created"})
     set_access_token_cookie(response, access_token)
     return response
@@ -93,10 +257,12 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends()) -> JSONRespons
         JSONResponse: A response indicating success, with an access token set as a secure cookie.
 
     Raises:
-        HTTPException: If authentication fails due to invalid username or password.
+        HTTPException: If authentication fails due to invalid username or password, or the server is too busy to verify it.
 
     """
-    user = authenticate_user(fake_users_db, form_data.username, form_data.password)
+    user = await authenticate_user(
+        user_repository, form_data.username, form_data.password
+    )
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -116,12 +282,19 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends()) -> JSONRespons
 
 
 @app.post("/logout")
-def logout() -> JSONResponse:
-    """Log out a user by clearing the access token cookie.
+def logout(request: Request) -> JSONResponse:
+    """Log out a user by clearing the access token cookie and its cached session.
+
+    Args:
+        request (Request): The incoming HTTP request.
 
     Returns:
         JSONResponse: A response confirming that the user has been logged out.
     """
+    token = request.cookies.get("access_token")
+    if token:
+        session_cache.evict_token(token)
+
     response = JSONResponse({"message": "Logged out"})
     response.delete_cookie("access_token")
     return response
@@ -140,77 +313,872 @@ def me(current_user: User = Depends(get_current_user)) -> User:
     return User(**current_user.dict())
 
 
-@app.get("/courses")
-def get_courses(user: User = Depends(get_current_user)) -> list[Course]:
-    """Retrieve the list of available courses.
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Check an `If-None-Match` header against an ETag, using weak comparison as RFC 9110 requires.
 
     Args:
+        if_none_match (str | None): The raw header value.
+        etag (str): The current ETag of the resource.
+
+    Returns:
+        bool: True if the client's copy is current.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(",")
+    )
+
+
+def cached_response(
+    request: Request,
+    key: tuple,
+    version: Hashable,
+    render: Callable[[], bytes],
+) -> Response:
+    """Serve a catalog response from `RESPONSE_CACHE`, honouring `If-None-Match`.
+
+    On a hit, a client holding the current ETag gets a 304 without any model being built or serialized. On a miss, `render` produces the body, which is cached with its content ETag and precompressed variants for this version. The variant is chosen from `Accept-Encoding`, and each encoding has its own ETag; the identity body's is weak when `GZipMiddleware` might compress it.
+
+    Args:
+        request (Request): The incoming HTTP request.
+        key (tuple): The cache key of the resource and its parameters.
+        version (Hashable): The current catalog version of the resource.
+        render (Callable[[], bytes]): Builds the JSON body on a miss.
+
+    Returns:
+        Response: A 304, or the JSON body in the negotiated encoding, with `ETag`, `Cache-Control` and `Vary` headers.
+    """
+    entry = RESPONSE_CACHE.get(key, version)
+    if entry is None:
+        entry = RESPONSE_CACHE.put(key, version, render())
+
+    encoding = negotiate(request.headers.get("accept-encoding"), entry.variants)
+    etag = variant_etag(entry.etag, encoding)
+    headers = {
+        "ETag": etag,
+        "Cache-Control": CATALOG_CACHE_CONTROL,
+        "Vary": "Accept-Encoding",
+    }
+    if encoding is None and len(entry.body) >= MIN_COMPRESS_BYTES:
+        # GZipMiddleware gzips identity bodies of this size for any `Accept-Encoding` mentioning gzip, even at q=0, so their tag is only weak.
+        headers["ETag"] = f"W/{etag}"
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    if encoding is None:
+        if len(entry.body) >= MIN_COMPRESS_BYTES:
+            # GZipMiddleware adds its own Vary to identity bodies of this size.
+            del headers["Vary"]
+        return Response(content=entry.body, media_type="application/json", headers=headers)
+    headers["Content-Encoding"] = encoding
+    return Response(
+        content=entry.variants[encoding],
+        media_type="application/json",
+        headers=headers,
+    )
+
+
+@app.get("/courses", response_model=CoursePage)
+def get_courses(
+    request: Request,
+    cursor: str | None = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    user: User = Depends(get_current_user),
+) -> Response:
+    """Retrieve a page of course summaries, ordered by course ID.
+
+    Args:
+        request (Request): The incoming HTTP request.
+        cursor (str | None): The `next_cursor` of the previous page, or None for the first page.
+        limit (int): The maximum number of courses to return.
         user (User): The currently authenticated user, injected via dependency.
 
     Returns:
-        list[Course]: A list of all available courses.
+        Response: The JSON-encoded `CoursePage` of course summaries, with a cursor for the next page if there is one, or a 304 if the client's copy is current.
+    """
+    catalog = CATALOG.current
+
+    def render() -> bytes:
+        page = catalog.list_courses(after=cursor, limit=limit + 1)
+        items = [
+            CourseSummary(
+                id=c.id,
+                name=c.name,
+                description=c.description,
+                concept_count=len(catalog.concepts_in_course(c.id)),
+            )
+            for c in page[:limit]
+        ]
+        next_cursor = items[-1].id if len(page) > limit else None
+        return CoursePage(items=items, next_cursor=next_cursor).model_dump_json().encode()
+
+    return cached_response(request, ("courses", cursor, limit), catalog.revision, render)
+
+
+def parse_fields(fields: str | None, allowed: frozenset[str]) -> set[str]:
+    """Parse a comma-separated `fields` projection parameter.
+
+    Args:
+        fields (str | None): The raw parameter value.
+        allowed (frozenset[str]): The heavy fields the endpoint can include.
+
+    Returns:
+        set[str]: The requested fields.
+
+    Raises:
+        HTTPException: If an unknown field is requested.
     """
-    return COURSES
+    requested = {f.strip() for f in (fields or "").split(",") if f.strip()}
+    unknown = requested - allowed
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}",
+        )
+    return requested
 
 
-@app.get("/courses/{course_id}")
+@app.get("/courses/{course_id}", response_model=Course)
 def get_course(
+    request: Request,
     course_id: str,
+    fields: str | None = None,
     current_user: User = Depends(get_current_user),
-) -> Course:
+) -> Response:
     """Retrieve course information by ID.
 
+    The course's `concepts` are only included when requested with `fields=concepts`, and their `content` only with `fields=concepts.content`, which implies `concepts`.
+
     Args:
+        request (Request): The incoming HTTP request.
         course_id (str): The ID of the course to retrieve.
+        fields (str | None): Comma-separated heavy fields to include.
         current_user (User): The currently authenticated user, injected via dependency.
 
     Returns:
-        Course: The course object containing course details.
+        Response: The JSON-encoded course, projected to the requested fields, or a 304 if the client's copy is current.
 
     Raises:
-        HTTPException: If the course does not exist.
+        HTTPException: If the course does not exist or an unknown field is requested.
     """
-    course = next((c for c in COURSES if c.id == course_id), None)
+    requested = frozenset(parse_fields(fields, COURSE_HEAVY_FIELDS))
+    if "concepts.content" in requested:
+        # Content is only served inside the concepts, so asking for it implies them.
+        requested = COURSE_HEAVY_FIELDS
+    catalog = CATALOG.current
+    course = catalog.get_course(course_id)
     if not course:
         raise HTTPException(status_code=404, detail="Course not found")
-    return course
 
+    def render() -> bytes:
+        exclude: dict | None = None
+        if "concepts" not in requested:
+            exclude = {"concepts": True}
+        elif "concepts.content" not in requested:
+            exclude = {"concepts": {"__all__": {"content"}}}
+        else:
+            concepts = [catalog.with_content(c, cached=False) for c in course.concepts]
+            return course.model_copy(update={"concepts": concepts}).model_dump_json().encode()
+        return course.model_dump_json(exclude=exclude).encode()
+
+    return cached_response(
+        request,
+        ("course", course_id, requested),
+        catalog.course_version(course_id),
+        render,
+    )
 
-@app.get("/courses/{course_id}/graph")
+
+@app.get("/courses/{course_id}/graph", response_model=CourseGraph)
 def get_course_graph(
+    request: Request,
     course_id: str,
+    layout: bool = False,
+    fields: str | None = None,
     current_user: User = Depends(get_current_user),
-) -> CourseGraph:
+) -> Response:
     """Retrieve the concept graph for a course by ID.
 
+    The serialized graph is cached per course and catalog version, so repeated requests return the stored JSON bytes without rebuilding or revalidating any models, and clients holding the current ETag get a 304. The layered layout is only included when requested with `layout=true`; it is likewise computed once per course version, and only for the layers an edit changed. Concept `content` is only included when requested with `fields=content`.
+
     Args:
+        request (Request): The incoming HTTP request.
         course_id (str): The ID of the course for which to retrieve the graph.
+        layout (bool): Whether to include node coordinates and edge bend points. Defaults to False.
+        fields (str | None): Comma-separated heavy concept fields to include.
         current_user (User): The currently authenticated user, injected via dependency.
 
     Returns:
-        CourseGraph: A graph object representing all concepts and their relationships within the course.
+        Response: The JSON-encoded `CourseGraph` representing all concepts and their relationships within the course, or a 304 if the client's copy is current.
 
     Raises:
-        HTTPException: If the course does not exist or has no concepts.
+        HTTPException: If the course does not exist, has no concepts, or an unknown field is requested.
     """
-    course = next((c for c in COURSES if c.id == course_id), None)
-    if not course:
+    requested = frozenset(parse_fields(fields, CONCEPT_HEAVY_FIELDS))
+    catalog = CATALOG.current
+    version = catalog.course_version(course_id)
+
+    def render() -> bytes:
+        if catalog.get_course(course_id) is None:
+            raise HTTPException(status_code=404, detail="Course not found")
+
+        with span("graph"):
+            course = catalog.compact.course(course_id)
+            if course is None:
+                raise HTTPException(status_code=404, detail="No concepts found for this course")
+            node_ids, edges = course.ids, course.edges()
+
+        course_layout = None
+        if layout:
+            with span("layout"):
+                course_layout = LAYOUTS.get(course_id, version, node_ids, edges)
+
+        with span("serialize"):
+            graph = CourseGraph.from_subgraph(course_id, course.concepts, edges, course_layout)
+            if "content" in requested:
+                fill_content(catalog, graph.nodes)
+            exclude = {"nodes": {"__all__": {"concept": set(CONCEPT_HEAVY_FIELDS - requested)}}}
+            return graph.model_dump_json(exclude=exclude).encode()
+
+    return cached_response(request, ("graph", course_id, layout, requested), version, render)
+
+
+@app.get("/courses/{course_id}/graph/layers", response_model=CourseGraphPage)
+def get_course_graph_layers(
+    request: Request,
+    course_id: str,
+    cursor: str | None = None,
+    limit: int = Query(DEFAULT_GRAPH_PAGE_SIZE, ge=1, le=MAX_GRAPH_PAGE_SIZE),
+    fields: str | None = None,
+    current_user: User = Depends(get_current_user),
+) -> Response:
+    """Retrieve a course graph one page of topological layers at a time.
+
+    Each page holds whole layers, starting with the concepts that have no prerequisites in the course, and every edge into its concepts; a client can draw the first page right away and lazy-load the rest with `next_cursor`. Concept `content` is only included when requested with `fields=content`.
+
+    Args:
+        request (Request): The incoming HTTP request.
+        course_id (str): The ID of the course.
+        cursor (str | None): The `next_cursor` of the previous page, or None for the first page.
+        limit (int): The maximum number of concepts per page; a single layer larger than this is returned whole.
+        fields (str | None): Comma-separated heavy concept fields to include.
+        current_user (User): The currently authenticated user, injected via dependency.
+
+    Returns:
+        Response: The JSON-encoded `CourseGraphPage`, or a 304 if the client's copy is current.
+
+    Raises:
+        HTTPException: If the course does not exist, the cursor is invalid or an unknown field is requested.
+    """
+    requested = frozenset(parse_fields(fields, CONCEPT_HEAVY_FIELDS))
+    if cursor is not None and not cursor.isdigit():
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    start = int(cursor) if cursor is not None else 0
+    catalog = CATALOG.current
+    if catalog.get_course(course_id) is None:
         raise HTTPException(status_code=404, detail="Course not found")
 
-    subG = get_course_subgraph(CONCEPT_GRAPH, course_id)
-    if subG.number_of_nodes() == 0:
-        raise HTTPException(status_code=404, detail="No concepts found for this course")
+    def render() -> bytes:
+        with span("graph"):
+            page = CourseGraphPage.from_compact(course_id, catalog.compact, start, limit)
+        if "content" in requested:
+            with span("content"):
+                fill_content(catalog, [node for layer in page.layers for node in layer.nodes])
+        with span("serialize"):
+            exclude = {"layers": {"__all__": {"nodes": {"__all__": {"concept": set(CONCEPT_HEAVY_FIELDS - requested)}}}}}
+            return page.model_dump_json(exclude=exclude).encode()
+
+    return cached_response(
+        request,
+        ("graph_layers", course_id, start, limit, requested),
+        catalog.course_version(course_id),
+        render,
+    )
+
 
-    return CourseGraph.from_networkx(course_id, subG)
+@app.get("/concepts/{concept_id}/neighborhood", response_model=ConceptNeighborhood)
+def get_concept_neighborhood(
+    request: Request,
+    concept_id: str,
+    up: int = Query(1, ge=0, le=MAX_NEIGHBORHOOD_HOPS),
+    down: int = Query(1, ge=0, le=MAX_NEIGHBORHOOD_HOPS),
+    fields: str | None = None,
+    current_user: User = Depends(get_current_user),
+) -> Response:
+    """Retrieve the concepts within a few hops of a concept, and the edges between them.
+
+    Prerequisites are followed `up` hops and dependents `down` hops, across courses. At most `MAX_NEIGHBORHOOD_NODES` concepts are returned; `truncated` tells whether the limit was hit. Concept `content` is only included when requested with `fields=content`.
+
+    Args:
+        request (Request): The incoming HTTP request.
+        concept_id (str): The ID of the center concept.
+        up (int): How many levels of prerequisites to include.
+        down (int): How many levels of dependents to include.
+        fields (str | None): Comma-separated heavy concept fields to include.
+        current_user (User): The currently authenticated user, injected via dependency.
+
+    Returns:
+        Response: The JSON-encoded `ConceptNeighborhood`, with concepts in topological order, or a 304 if the client's copy is current.
+
+    Raises:
+        HTTPException: If the concept does not exist or an unknown field is requested.
+    """
+    requested = frozenset(parse_fields(fields, CONCEPT_HEAVY_FIELDS))
+    catalog = CATALOG.current
+    if catalog.get_concept(concept_id) is None:
+        raise HTTPException(status_code=404, detail="Concept not found")
+
+    def render() -> bytes:
+        with span("graph"):
+            node_ids, edges, truncated = catalog.neighborhood(concept_id, up, down, MAX_NEIGHBORHOOD_NODES)
+            neighborhood = ConceptNeighborhood.from_subgraph(
+                concept_id, [catalog.concepts[n] for n in node_ids], edges, truncated
+            )
+        if "content" in requested:
+            with span("content"):
+                fill_content(catalog, neighborhood.nodes)
+        with span("serialize"):
+            exclude = {"nodes": {"__all__": {"concept": set(CONCEPT_HEAVY_FIELDS - requested)}}}
+            return neighborhood.model_dump_json(exclude=exclude).encode()
+
+    # The neighborhood can span courses, so it is versioned with the whole catalog.
+    return cached_response(
+        request,
+        ("neighborhood", concept_id, up, down, requested),
+        catalog.revision,
+        render,
+    )
+
+
+def fill_content(catalog: Catalog, nodes: list[ConceptNode]) -> None:
+    """Replace the resident concepts of freshly built graph nodes with copies holding their content.
+
+    Bodies are read around the content store's LRU, so a large page does not evict the concepts being viewed.
+    """
+    for node in nodes:
+        node.concept = catalog.with_content(node.concept, cached=False)
+
+
+def render_concept_batch(catalog: Catalog, ids: list[str], requested: frozenset[str]) -> bytes:
+    """Look up many concepts by ID and serialize them.
+
+    Args:
+        catalog (Catalog): The catalog to read from.
+        ids (list[str]): The concept IDs; duplicates are returned once.
+        requested (frozenset[str]): The heavy fields to include.
+
+    Returns:
+        bytes: The JSON-encoded `ConceptBatch`.
+    """
+    items, not_found = [], []
+    for concept_id in dict.fromkeys(ids):
+        concept = catalog.get_concept(concept_id)
+        if concept is None:
+            not_found.append(concept_id)
+        elif "content" in requested:
+            items.append(catalog.with_content(concept, cached=False))
+        else:
+            items.append(concept)
+    batch = ConceptBatch(items=items, not_found=not_found)
+    return batch.model_dump_json(exclude={"items": {"__all__": set(CONCEPT_HEAVY_FIELDS - requested)}}).encode()
 
 
-@app.get("/concepts/{concept_id}")
+@app.get("/concepts", response_model=ConceptBatch)
+def get_concepts(
+    request: Request,
+    ids: str,
+    fields: str | None = None,
+    current_user: User = Depends(get_current_user),
+) -> Response:
+    """Get many concepts in one request.
+
+    Args:
+        request (Request): The incoming HTTP request.
+        ids (str): Comma-separated IDs of the concepts to retrieve, at most `MAX_BATCH_SIZE`.
+        fields (str | None): Comma-separated heavy fields to include.
+        current_user (User): The currently authenticated user, injected via dependency.
+
+    Returns:
+        Response: The JSON-encoded `ConceptBatch`, or a 304 if the client's copy is current.
+
+    Raises:
+        HTTPException: If no or too many IDs are given, or an unknown field is requested.
+    """
+    requested = frozenset(parse_fields(fields, CONCEPT_HEAVY_FIELDS))
+    concept_ids = list(dict.fromkeys(i.strip() for i in ids.split(",") if i.strip()))
+    if not concept_ids:
+        raise HTTPException(status_code=400, detail="No concept IDs given")
+    if len(concept_ids) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_SIZE} concept IDs per request")
+    catalog = CATALOG.current
+    # The concepts can come from any course, so the batch is versioned with the whole catalog.
+    return cached_response(
+        request,
+        ("concepts", tuple(concept_ids), requested),
+        catalog.revision,
+        lambda: render_concept_batch(catalog, concept_ids, requested),
+    )
+
+
+@app.post("/concepts:batch", response_model=ConceptBatch)
+def batch_get_concepts(
+    batch: ConceptBatchRequest,
+    current_user: User = Depends(get_current_user),
+) -> Response:
+    """Get many concepts in one request, for ID lists too long for a query string.
+
+    Args:
+        batch (ConceptBatchRequest): The IDs of the concepts to retrieve, at most `MAX_BATCH_SIZE`, and the heavy fields to include.
+        current_user (User): The currently authenticated user, injected via dependency.
+
+    Returns:
+        Response: The JSON-encoded `ConceptBatch`.
+
+    Raises:
+        HTTPException: If an unknown field is requested.
+    """
+    requested = frozenset(parse_fields(",".join(batch.fields), CONCEPT_HEAVY_FIELDS))
+    body = render_concept_batch(CATALOG.current, batch.ids, requested)
+    return Response(content=body, media_type="application/json")
+
+
+@app.get("/concepts/{concept_id}", response_model=Concept)
 def get_concept(
+    request: Request,
     concept_id: str,
+    fields: str | None = None,
     current_user: User = Depends(get_current_user),
-) -> Concept:
-    """Get information on a concept."""
-    concept = next((c for c in CONCEPTS if c.id == concept_id), None)
+) -> Response:
+    """Get information on a concept.
+
+    The concept's `content` is only included when requested with `fields=content`; it is the one field read from the catalog's content store rather than memory.
+
+    Args:
+        request (Request): The incoming HTTP request.
+        concept_id (str): The ID of the concept to retrieve.
+        fields (str | None): Comma-separated heavy fields to include.
+        current_user (User): The currently authenticated user, injected via dependency.
+
+    Returns:
+        Response: The JSON-encoded concept, projected to the requested fields, or a 304 if the client's copy is current.
+
+    Raises:
+        HTTPException: If the concept does not exist or an unknown field is requested.
+    """
+    requested = frozenset(parse_fields(fields, CONCEPT_HEAVY_FIELDS))
+    catalog = CATALOG.current
+    concept = catalog.get_concept(concept_id)
     if not concept:
         raise HTTPException(status_code=404, detail="Concept not found")
+
+    def render() -> bytes:
+        if "content" in requested:
+            return catalog.with_content(concept).model_dump_json().encode()
+        return concept.model_dump_json(exclude=set(CONCEPT_HEAVY_FIELDS)).encode()
+
+    return cached_response(
+        request,
+        ("concept", concept_id, requested),
+        catalog.course_version(concept.course_id),
+        render,
+    )
+
+
+@app.get(
+    "/concepts/{concept_id}/path",
+    response_model_exclude={"prerequisites": {"__all__": {"content"}}},
+)
+def get_learning_path(
+    concept_id: str,
+    current_user: User = Depends(get_current_user),
+) -> LearningPath:
+    """Get every prerequisite of a concept, direct or indirect, in the order to study them.
+
+    The prerequisites' `content` is left out; fetch a concept on its own for that.
+
+    Args:
+        concept_id (str): The ID of the concept to learn.
+        current_user (User): The currently authenticated user, injected via dependency.
+
+    Returns:
+        LearningPath: The concept's prerequisite closure in topological order.
+
+    Raises:
+        HTTPException: If the concept does not exist.
+    """
+    catalog = CATALOG.current
+    if catalog.get_concept(concept_id) is None:
+        raise HTTPException(status_code=404, detail="Concept not found")
+    return LearningPath(
+        concept_id=concept_id,
+        prerequisites=catalog.learning_path(concept_id),
+    )
+
+
+@app.get("/concepts/{concept_id}/prerequisites/{prereq_id}")
+def check_prerequisite(
+    concept_id: str,
+    prereq_id: str,
+    current_user: User = Depends(get_current_user),
+) -> PrerequisiteCheck:
+    """Check whether one concept is a direct or indirect prerequisite of another.
+
+    Args:
+        concept_id (str): The ID of the dependent concept.
+        prereq_id (str): The ID of the possible prerequisite.
+        current_user (User): The currently authenticated user, injected via dependency.
+
+    Returns:
+        PrerequisiteCheck: Whether `prereq_id` must be studied before `concept_id`.
+
+    Raises:
+        HTTPException: If either concept does not exist.
+    """
+    try:
+        is_prerequisite = CATALOG.current.is_prerequisite(prereq_id, concept_id)
+    except KeyError as err:
+        raise HTTPException(status_code=404, detail="Concept not found") from err
+    return PrerequisiteCheck(
+        concept_id=concept_id,
+        prereq_id=prereq_id,
+        is_prerequisite=is_prerequisite,
+    )
+
+
+@app.post("/concepts/{concept_id}/complete")
+def complete_concept(
+    concept_id: str,
+    current_user: User = Depends(get_current_user),
+) -> Completion:
+    """Mark a concept as completed by the current user.
+
+    Only the concept's direct dependents are updated, so the cost does not grow with the size of the course. Completing a concept again is harmless.
+
+    Args:
+        concept_id (str): The ID of the completed concept.
+        current_user (User): The currently authenticated user, injected via dependency.
+
+    Returns:
+        Completion: The concept and its dependents whose prerequisites are now all completed.
+
+    Raises:
+        HTTPException: If the concept does not exist.
+    """
+    catalog = CATALOG.current
+    if catalog.get_concept(concept_id) is None:
+        raise HTTPException(status_code=404, detail="Concept not found")
+    unlocked = PROGRESS.complete(catalog, current_user.id, concept_id)
+    return Completion(concept_id=concept_id, unlocked=unlocked)
+
+
+@app.get("/courses/{course_id}/frontier")
+def get_course_frontier(
+    course_id: str,
+    current_user: User = Depends(get_current_user),
+) -> CourseFrontier:
+    """Get the concepts of a course the current user can study next.
+
+    A concept is on the frontier when the user has not completed it but has completed all of its prerequisites, including those in other courses.
+
+    Args:
+        course_id (str): The ID of the course.
+        current_user (User): The currently authenticated user, injected via dependency.
+
+    Returns:
+        CourseFrontier: The user's completion count in the course and its frontier, in study order.
+
+    Raises:
+        HTTPException: If the course does not exist.
+    """
+    catalog = CATALOG.current
+    if catalog.get_course(course_id) is None:
+        raise HTTPException(status_code=404, detail="Course not found")
+    frontier, completed = PROGRESS.frontier(catalog, current_user.id, course_id)
+    return CourseFrontier(
+        course_id=course_id,
+        completed=completed,
+        total=len(catalog.concepts_in_course(course_id)),
+        frontier=frontier,
+    )
+
+
+@app.get("/search")
+def search_concepts(
+    q: str = Query(min_length=1, max_length=MAX_QUERY_LENGTH),
+    course_id: str | None = None,
+    limit: int = Query(DEFAULT_SEARCH_LIMIT, ge=1, le=MAX_SEARCH_LIMIT),
+    prefix: bool = True,
+    current_user: User = Depends(get_current_user),
+) -> SearchResults:
+    """Search concepts by name, description and content, ranked with BM25.
+
+    By default the last word of the query also matches every term it is a prefix of, so results can be shown as the user types.
+
+    Args:
+        q (str): The free-text query.
+        course_id (str | None): Only return concepts of this course.
+        limit (int): The maximum number of results.
+        prefix (bool): Whether to complete the last word of the query.
+        current_user (User): The currently authenticated user, injected via dependency.
+
+    Returns:
+        SearchResults: The matching concepts, best first.
+
+    Raises:
+        HTTPException: If the course does not exist.
+    """
+    catalog = CATALOG.current
+    if course_id is not None and catalog.get_course(course_id) is None:
+        raise HTTPException(status_code=404, detail="Course not found")
+    with span("search"):
+        hits = catalog.search(q, course_id=course_id, limit=limit, prefix=prefix)
+    return SearchResults(
+        query=q,
+        items=[
+            SearchHit(
+                id=c.id,
+                name=c.name,
+                description=c.description,
+                course_id=c.course_id,
+                score=score,
+            )
+            for c, score in hits
+        ],
+    )
+
+
+def apply_catalog_edit(edit: CatalogEdit) -> None:
+    """Apply an edit to the catalog, translating its errors into HTTP errors.
+
+    With a snapshot configured, the edit is written to the snapshot, so every worker installs it on its next poll and it survives restarts. Otherwise it only applies to this worker, until its next reload.
+
+    Args:
+        edit (CatalogEdit): The edit to apply to the current catalog.
+
+    Raises:
+        HTTPException: 404 if a referenced concept or course does not exist, 409 if the edit would create a prerequisite cycle, or 400 if it is otherwise invalid.
+    """
+    try:
+        if SNAPSHOT_WATCHER is not None:
+            SNAPSHOT_WATCHER.edit(edit)
+        else:
+            CATALOG.edit(edit)
+    except KeyError as err:
+        raise HTTPException(status_code=404, detail=err.args[0]) from err
+    except CycleError as err:
+        raise HTTPException(status_code=409, detail=str(err)) from err
+    except ValueError as err:
+        raise HTTPException(status_code=400, detail=str(err)) from err
+
+
+@app.post("/admin/concepts", status_code=status.HTTP_201_CREATED)
+def create_concept(
+    concept: Concept,
+    admin: User = Depends(get_current_admin),
+) -> Concept:
+    """Add a new concept to the catalog.
+
+    Args:
+        concept (Concept): The concept to add. Its prerequisites must already exist.
+        admin (User): The currently authenticated admin, injected via dependency.
+
+    Returns:
+        Concept: The added concept.
+
+    Raises:
+        HTTPException: If the course does not exist, or the concept ID or a prerequisite is invalid.
+    """
+    apply_catalog_edit(lambda catalog: catalog.add_concept(concept))
     return concept
+
+
+@app.delete("/admin/concepts/{concept_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_concept(
+    concept_id: str,
+    admin: User = Depends(get_current_admin),
+) -> None:
+    """Remove a concept from the catalog, along with its prerequisite edges.
+
+    Args:
+        concept_id (str): The ID of the concept to remove.
+        admin (User): The currently authenticated admin, injected via dependency.
+
+    Raises:
+        HTTPException: If the concept does not exist.
+    """
+    apply_catalog_edit(lambda catalog: catalog.remove_concept(concept_id))
+
+
+@app.put("/admin/concepts/{concept_id}/prerequisites/{prereq_id}")
+def add_prerequisite(
+    concept_id: str,
+    prereq_id: str,
+    admin: User = Depends(get_current_admin),
+) -> Concept:
+    """Make one concept a prerequisite of another.
+
+    Args:
+        concept_id (str): The ID of the dependent concept.
+        prereq_id (str): The ID of the prerequisite concept.
+        admin (User): The currently authenticated admin, injected via dependency.
+
+    Returns:
+        Concept: The updated dependent concept.
+
+    Raises:
+        HTTPException: If either concept does not exist, or the edge would create a cycle.
+    """
+    apply_catalog_edit(lambda catalog: catalog.add_prerequisite(concept_id, prereq_id))
+    catalog = CATALOG.current
+    return catalog.with_content(catalog.concepts[concept_id])
+
+
+@app.delete("/admin/concepts/{concept_id}/prerequisites/{prereq_id}")
+def remove_prerequisite(
+    concept_id: str,
+    prereq_id: str,
+    admin: User = Depends(get_current_admin),
+) -> Concept:
+    """Remove a prerequisite from a concept.
+
+    Args:
+        concept_id (str): The ID of the dependent concept.
+        prereq_id (str): The ID of the prerequisite to remove.
+        admin (User): The currently authenticated admin, injected via dependency.
+
+    Returns:
+        Concept: The updated dependent concept.
+
+    Raises:
+        HTTPException: If either concept does not exist or is not a prerequisite of the other.
+    """
+    apply_catalog_edit(lambda catalog: catalog.remove_prerequisite(concept_id, prereq_id))
+    catalog = CATALOG.current
+    return catalog.with_content(catalog.concepts[concept_id])
+
+
+def catalog_info(catalog: Catalog) -> CatalogInfo:
+    """Summarize a catalog version."""
+    return CatalogInfo(
+        version=catalog.version,
+        concepts=len(catalog.concepts),
+        courses=len(catalog.courses),
+    )
+
+
+@app.get("/admin/catalog")
+def get_catalog_info(admin: User = Depends(get_current_admin)) -> CatalogInfo:
+    """Get the catalog version this worker is serving.
+
+    Args:
+        admin (User): The currently authenticated admin, injected via dependency.
+
+    Returns:
+        CatalogInfo: The version number and size of the current catalog.
+    """
+    return catalog_info(CATALOG.current)
+
+
+@app.post("/admin/catalog/reload")
+def reload_catalog(admin: User = Depends(get_current_admin)) -> CatalogInfo:
+    """Reload the catalog from its sources without a restart.
+
+    With a snapshot configured, the snapshot is rebuilt and swapped in here at once; other workers pick it up on their next poll. Otherwise only this worker reloads. Requests in flight finish on the previous version, and edits made through the admin endpoints are discarded.
+
+    Args:
+        admin (User): The currently authenticated admin, injected via dependency.
+
+    Returns:
+        CatalogInfo: The version number and size of the new catalog.
+
+    Raises:
+        HTTPException: If the sources are invalid; the current catalog is left in place.
+    """
+    concepts_path = Path(CONCEPTS_PATH) if CONCEPTS_PATH else None
+    courses_path = Path(COURSES_PATH) if COURSES_PATH else None
+    try:
+        if SNAPSHOT_WATCHER is not None:
+            SNAPSHOT_WATCHER.rebuild(concepts_path, courses_path)
+        else:
+            CATALOG.reload(*load_sources(concepts_path, courses_path))
+    except ValueError as err:
+        raise HTTPException(status_code=400, detail=str(err)) from err
+    return catalog_info(CATALOG.current)
+
+
+@app.get("/admin/profiler")
+def get_profiler(admin: User = Depends(get_current_admin)) -> ProfilerStatus:
+    """Get the request profiler's settings and counters.
+
+    Args:
+        admin (User): The currently authenticated admin, injected via dependency.
+
+    Returns:
+        ProfilerStatus: Whether profiling is enabled, which requests it selects, and how much it has collected.
+    """
+    return PROFILER.status()
+
+
+@app.put("/admin/profiler")
+def enable_profiler(
+    settings: ProfilerSettings,
+    admin: User = Depends(get_current_admin),
+) -> ProfilerStatus:
+    """Start profiling live requests.
+
+    Args:
+        settings (ProfilerSettings): Which requests to profile, and how often to sample them.
+        admin (User): The currently authenticated admin, injected via dependency.
+
+    Returns:
+        ProfilerStatus: The profiler's new status.
+
+    Raises:
+        HTTPException: If the settings select no requests.
+    """
+    if settings.every is None and settings.route is None and settings.header is None:
+        raise HTTPException(
+            status_code=400,
+            detail="Set at least one of every, route or header",
+        )
+    PROFILER.enable(settings)
+    return PROFILER.status()
+
+
+@app.delete("/admin/profiler")
+def disable_profiler(admin: User = Depends(get_current_admin)) -> ProfilerStatus:
+    """Stop profiling live requests. Samples collected so far are kept for download.
+
+    Args:
+        admin (User): The currently authenticated admin, injected via dependency.
+
+    Returns:
+        ProfilerStatus: The profiler's new status.
+    """
+    PROFILER.disable()
+    return PROFILER.status()
+
+
+@app.get("/admin/profiler/stacks")
+def download_profile(
+    reset: bool = False,
+    admin: User = Depends(get_current_admin),
+) -> PlainTextResponse:
+    """Download the collected samples in collapsed-stack format, e.g. for flamegraph.pl or speedscope.
+
+    Args:
+        reset (bool): Whether to drop the samples after downloading them.
+        admin (User): The currently authenticated admin, injected via dependency.
+
+    Returns:
+        PlainTextResponse: One `frame;frame;frame count` line per distinct stack.
+    """
+    body = PROFILER.sampler.collapsed()
+    if reset:
+        PROFILER.sampler.reset()
+    return PlainTextResponse(
+        body,
+        headers={"Content-Disposition": 'attachment; filename="profile.folded"'},
+    )
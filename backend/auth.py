@@ -2,19 +2,28 @@
 
 from __future__ import annotations
 
+import math
 import os
 from datetime import datetime, timedelta, timezone
 from uuid import UUID
 
 import jwt
-from fastapi import HTTPException, Request, status
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import JSONResponse
 from fastapi.security import OAuth2PasswordBearer
-from pwdlib import PasswordHash
 from pydantic import BaseModel
 
+from backend.hashing import PasswordHashingService
+from backend.metrics import span
 from backend.models.users import UserInDB
+from backend.repositories.users import (
+    InMemoryUserRepository,
+    MongoUserRepository,
+    UserRepository,
+)
 from backend.sample_data import fake_users_db
+from backend.sessions import SessionCache
 
 SECRET_KEY = os.environ.get("JWT_SECRET_KEY")
 if not SECRET_KEY:
@@ -23,7 +32,22 @@ if not SECRET_KEY:
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
-password_hash = PasswordHash.recommended()
+# Comma-separated usernames allowed to use the /admin endpoints.
+ADMIN_USERNAMES = frozenset(
+    u.strip() for u in os.environ.get("ADMIN_USERNAMES", "").split(",") if u.strip()
+)
+
+password_hasher = PasswordHashingService()
+
+MONGODB_URI = os.environ.get("MONGODB_URI")
+user_repository: UserRepository = (
+    MongoUserRepository.from_uri(MONGODB_URI)
+    if MONGODB_URI
+    else InMemoryUserRepository(fake_users_db)
+)
+session_cache = SessionCache()
+# A written user may differ from the one cached for its tokens.
+user_repository.subscribe(lambda user: session_cache.evict_user(user.id))
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
 
 
@@ -49,79 +73,57 @@ def validate_username(username: str) -> bool:
     Returns:
         bool: True if the username is available, False if already taken.
     """
-    return all(u["username"] != username for u in fake_users_db)
+    return user_repository.username_available(username)
 
 
-def verify_password(password: str, hashed_password: str) -> bool:
-    """Verify a plaintext password against its hashed version.
-
-    Args:
-        password (str): The plaintext password to verify.
-        hashed_password (str): The stored hashed password.
-
-    Returns:
-        bool: True if the password is valid, False otherwise.
-    """
-    return password_hash.verify(password, hashed_password)
-
-
-def get_password_hash(password: str) -> str:
-    """Hash a plaintext password using the recommended algorithm.
-
-    Args:
-        password (str): The plaintext password to hash.
-
-    Returns:
-        str: The securely hashed password.
-    """
-    return password_hash.hash(password)
-
-
-def get_user_by_username(db: list[dict], username: str) -> UserInDB | None:
+def get_user_by_username(db: UserRepository, username: str) -> UserInDB | None:
     """Retrieve a user by username from the database.
 
     Args:
-        db (list[dict]): The database of users (will eventually use an actual db).
+        db (UserRepository): The user repository.
         username (str): The username to look up.
 
     Returns:
         UserInDB | None: The matching user, or None if not found.
     """
-    for u in db:
-        if u.get("username") == username:
-            return UserInDB(**u)
-    return None
+    return db.get_by_username(username)
 
 
-def get_user_by_id(db: list[dict], user_id: UUID) -> UserInDB | None:
+def get_user_by_id(db: UserRepository, user_id: UUID) -> UserInDB | None:
     """Retrieve a user by ID from the database.
 
     Args:
-        db (list[dict]): The database of users (will eventually use an actual db).
+        db (UserRepository): The user repository.
         user_id (UUID): The ID of the user to look up.
 
     Returns:
         UserInDB | None: The matching user, or None if not found.
     """
-    for u in db:
-        if u.get("id") == str(user_id):
-            return UserInDB(**u)
-    return None
+    return db.get_by_id(user_id)
 
 
-def authenticate_user(db: list[dict], username: str, password: str) -> UserInDB | None:
+async def authenticate_user(
+    db: UserRepository,
+    username: str,
+    password: str,
+) -> UserInDB | None:
     """Authenticate a user by username and password.
 
+    The user is looked up in a worker thread, since the repository may block on a database, and the password is verified in the `password_hasher` process pool, so the event loop is not blocked.
+
     Args:
-        db (list[dict]): The database of users (will eventually use an actual db).
+        db (UserRepository): The user repository.
         username (str): The username to authenticate.
         password (str): The plaintext password to verify.
 
     Returns:
         UserInDB | None: The authenticated user if credentials are valid, otherwise None.
+
+    Raises:
+        HashingOverloadedError: If the password hashing queue is full.
     """
-    user = get_user_by_username(db, username)
-    if user and verify_password(password, user.hashed_password):
+    user = await run_in_threadpool(get_user_by_username, db, username)
+    if user and await password_hasher.verify(password, user.hashed_password):
         return user
     return None
 
@@ -165,7 +167,7 @@ def set_access_token_cookie(response: JSONResponse, token: str) -> None:
 async def get_current_user(request: Request) -> UserInDB:
     """Retrieve the currently authenticated user from the request cookies.
 
-    Decodes the JWT token stored in the `access_token` cookie and fetches the corresponding user from the database.
+    Decodes the JWT token stored in the `access_token` cookie and fetches the corresponding user from the database, in a worker thread. The result is kept in `session_cache` until the token expires, so repeat requests with the same token skip verification and the user lookup.
 
     Args:
         request (Request): The incoming HTTP request.
@@ -176,6 +178,11 @@ async def get_current_user(request: Request) -> UserInDB:
     Raises:
         HTTPException: If no token is provided, the token is invalid/expired, or the user does not exist.
     """
+    with span("auth"):
+        return await _resolve_user(request)
+
+
+async def _resolve_user(request: Request) -> UserInDB:
     token = request.cookies.get("access_token")
     if not token:
         raise HTTPException(
@@ -184,6 +191,10 @@ async def get_current_user(request: Request) -> UserInDB:
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    cached = session_cache.get(token)
+    if cached is not None:
+        return cached
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         sub: str | None = payload.get("sub")
@@ -195,7 +206,29 @@ async def get_current_user(request: Request) -> UserInDB:
     except jwt.InvalidTokenError as err:
         raise HTTPException(status_code=401, detail="Invalid token") from err
 
-    user = get_user_by_id(fake_users_db, user_id=token_data.user_id)
+    user = await run_in_threadpool(get_user_by_id, user_repository, token_data.user_id)
     if user is None:
         raise HTTPException(status_code=401, detail="User not found")
+
+    session_cache.put(token, user, expires_at=float(payload.get("exp", math.inf)))
+    return user
+
+
+async def get_current_admin(user: UserInDB = Depends(get_current_user)) -> UserInDB:
+    """Retrieve the currently authenticated user and require admin rights.
+
+    Args:
+        user (UserInDB): The currently authenticated user, injected via dependency.
+
+    Returns:
+        UserInDB: The authenticated admin user.
+
+    Raises:
+        HTTPException: If the user is not listed in `ADMIN_USERNAMES`.
+    """
+    if user.username not in ADMIN_USERNAMES:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin privileges required",
+        )
     return user
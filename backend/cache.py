@@ -0,0 +1,136 @@
+"""In-memory cache for serialized response bodies."""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import NamedTuple
+
+from backend.compression import compress_variants
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+class CachedResponse(NamedTuple):
+    """A cached response body, the catalog version it was rendered from, its ETag and its precompressed variants."""
+
+    version: Hashable
+    body: bytes
+    etag: str
+    variants: dict[str, bytes]
+
+    @property
+    def nbytes(self) -> int:
+        """Return the summed size of the body and its variants."""
+        return len(self.body) + sum(map(len, self.variants.values()))
+
+
+def content_etag(body: bytes) -> str:
+    """Return a strong ETag derived from a body's content, so every worker computes the same one."""
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+class ResponseCache:
+    """A thread-safe LRU cache of response bodies bounded by total size in bytes.
+
+    Each body is stored together with the catalog version it was rendered from, and a lookup only hits when the caller's current version matches, so entries from an older catalog can never be served. `discard` drops a single resource when it is patched and `clear` drops everything when the catalog is rebuilt.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, compress: bool = True) -> None:
+        """Create an empty cache.
+
+        Args:
+            max_bytes (int, optional): Upper bound on the summed size of all cached bodies and variants. Defaults to 64 MiB.
+            compress (bool, optional): Whether to store precompressed variants of each body. Defaults to True.
+        """
+        self.max_bytes = max_bytes
+        self.compress = compress
+        self._entries: OrderedDict[Hashable, CachedResponse] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        """Return the number of cached entries."""
+        return len(self._entries)
+
+    @property
+    def size(self) -> int:
+        """Return the summed size in bytes of all cached bodies and variants."""
+        return self._size
+
+    def stats(self) -> dict[str, float]:
+        """Return a snapshot of the cache's counters."""
+        return {
+            "entries": len(self._entries),
+            "bytes": self._size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def get(self, key: Hashable, version: Hashable) -> CachedResponse | None:
+        """Return the cached response for a key and mark it as recently used.
+
+        Args:
+            key (Hashable): The cache key, e.g. a course ID.
+            version (Hashable): The current catalog version of the resource.
+
+        Returns:
+            CachedResponse | None: The cached response, or None on a miss or if it was rendered from another version.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.version != version:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: Hashable, version: Hashable, body: bytes) -> CachedResponse:
+        """Store a body with its ETag and compressed variants, evicting least recently used entries until it fits.
+
+        Bodies larger than `max_bytes` are not cached, nor compressed here.
+
+        Args:
+            key (Hashable): The cache key, e.g. a course ID.
+            version (Hashable): The catalog version the body was rendered from.
+            body (bytes): The serialized response body.
+
+        Returns:
+            CachedResponse: The body with its computed ETag, whether or not it was stored.
+        """
+        if len(body) > self.max_bytes:
+            return CachedResponse(version, body, content_etag(body), {})
+        variants = compress_variants(body) if self.compress else {}
+        entry = CachedResponse(version, body, content_etag(body), variants)
+        with self._lock:
+            self._pop(key)
+            self._entries[key] = entry
+            self._size += entry.nbytes
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= evicted.nbytes
+                self.evictions += 1
+        return entry
+
+    def discard(self, key: Hashable) -> None:
+        """Remove a single entry, if present."""
+        with self._lock:
+            self._pop(key)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _pop(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= entry.nbytes
@@ -0,0 +1,808 @@
+"""Indexed in-memory store for the course catalog (concepts, courses and their graph)."""
+
+from __future__ import annotations
+
+import threading
+from bisect import bisect_right
+from collections.abc import (
+    Callable,
+    Collection,
+    Iterable,
+    Iterator,
+    Mapping,
+    MutableMapping,
+)
+from functools import partial
+from typing import TypeVar
+
+import networkx as nx
+
+from backend.content import ContentStore
+from backend.graph.builder import build_graph
+from backend.graph.closure import PrerequisiteClosure
+from backend.graph.compact import CompactCourse, CompactGraph
+from backend.graph.toposort import IncrementalTopologicalOrder, topological_order
+from backend.models.concepts import Concept
+from backend.models.courses import Course
+from backend.search import SearchIndex
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+# Called with the affected catalog and the IDs of the courses whose content changed, or None if the whole catalog was replaced.
+CatalogListener = Callable[["Catalog", set[str] | None], None]
+# Edits a catalog, returning the edited copy and the IDs of the courses whose content changed, like `Catalog.add_concept`.
+CatalogEdit = Callable[["Catalog"], tuple["Catalog", set[str]]]
+
+
+class LazyMapping(MutableMapping[K, V]):
+    """A read-only mapping over a fixed set of keys whose values are computed on first access, then kept.
+
+    Catalogs loaded from a snapshot index their records through these, so a request only decodes the courses it touches. Copying one with `dict()` computes every value. It is a `MutableMapping` only so that it can stand in for the dicts of a catalog built from sources; writing to it raises `TypeError`.
+    """
+
+    def __init__(self, keys: Collection[K], compute: Callable[[K], V]) -> None:
+        """Create a mapping whose values are computed by a function.
+
+        Args:
+            keys (Collection[K]): The keys, e.g. a dict; only membership, iteration and length are used.
+            compute (Callable[[K], V]): Computes the value of a key. It is called at most once per key, and must not read this mapping.
+        """
+        self._keys = keys
+        self._compute = compute
+        self._values: dict[K, V] = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, key: K) -> V:
+        """Return the value of a key, computing it on first access."""
+        try:
+            return self._values[key]
+        except KeyError:
+            pass
+        if key not in self._keys:
+            raise KeyError(key)
+        with self._lock:
+            # Computed under the lock, so every reader of a key gets the same object.
+            if key not in self._values:
+                self._values[key] = self._compute(key)
+            return self._values[key]
+
+    def __contains__(self, key: object) -> bool:
+        """Return True if the key is in the mapping, without computing its value."""
+        return key in self._keys
+
+    def __iter__(self) -> Iterator[K]:
+        """Iterate over the keys."""
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        """Return the number of keys."""
+        return len(self._keys)
+
+    def __setitem__(self, key: K, value: V) -> None:
+        """Raise `TypeError`; the mapping is read-only."""
+        raise TypeError(f"{type(self).__name__} is read-only")
+
+    def __delitem__(self, key: K) -> None:
+        """Raise `TypeError`; the mapping is read-only."""
+        raise TypeError(f"{type(self).__name__} is read-only")
+
+
+class _Adjacency:
+    """The prerequisite edges of one catalog version, in the shape `IncrementalTopologicalOrder` and `PrerequisiteClosure` traverse."""
+
+    def __init__(self, catalog: Catalog) -> None:
+        self._catalog = catalog
+
+    def successors(self, node: str) -> list[str]:
+        return self._catalog.dependents.get(node, [])
+
+    def predecessors(self, node: str) -> Iterable[str]:
+        return dict.fromkeys(self._catalog.concepts[node].prerequisites)
+
+
+class Catalog:
+    """One immutable version of the catalog, with all of its lookup indexes.
+
+    A course's `concepts` list is resolved from the concept index rather than taken from the course record, so every concept exists exactly once in memory and is shared by the course, the index and the graph.
+
+    Those resident concepts do not hold their `content`: bodies are moved into a `ContentStore` when the catalog is indexed and read back on demand with `get_content` or `with_content`, so graph and listing responses never touch them.
+
+    A catalog is never changed once built. Full reloads produce a new `Catalog` with a higher `version`; incremental edits (`add_concept`, `add_prerequisite`, ...) return an edited copy that shares every structure the edit does not touch, and bump the revision of every course they touch. `course_version` combines both, so it changes exactly when a course's rendered content may have changed. Readers holding an older catalog keep a consistent view of it, and its lazily built structures (`graph`, `compact`, ...) are never invalidated under them. Edits should go through `CatalogStore`, which serializes them and swaps the copy in.
+    """
+
+    def __init__(
+        self,
+        concepts: Iterable[Concept],
+        courses: Iterable[Course],
+        version: int = 1,
+        content: ContentStore | None = None,
+    ) -> None:
+        """Index a set of validated concepts and courses.
+
+        Args:
+            concepts (Iterable[Concept]): The validated concepts of the catalog.
+            courses (Iterable[Course]): The validated courses of the catalog. Their embedded `concepts` are ignored.
+            version (int, optional): The catalog version number. Defaults to 1.
+            content (ContentStore | None, optional): Where concept content is stored. Defaults to a new store.
+
+        Raises:
+            ValueError: If a concept or course ID is duplicated, or a prerequisite does not exist.
+        """
+        self.version = version
+        self._index_records(concepts, courses, content)
+        self._index_graph(build_graph(self.concepts.values()))
+
+    @classmethod
+    def from_views(
+        cls,
+        concepts: MutableMapping[str, Concept],
+        concepts_by_course: MutableMapping[str, list[Concept]],
+        dependents: MutableMapping[str, list[str]],
+        course_graphs: Mapping[str, CompactCourse],
+        courses: Iterable[Course],
+        version: int = 1,
+        content: ContentStore | None = None,
+        order: Callable[[], Iterable[str]] | None = None,
+    ) -> Catalog:
+        """Wrap records that were already indexed and checked, e.g. the lazy views of a snapshot (see `LazyMapping`).
+
+        Nothing is validated, compacted or sorted: the views are used as-is, and the graph, topological order and closure are only built once something needs them.
+
+        Args:
+            concepts (MutableMapping[str, Concept]): Every concept by ID, without its content.
+            concepts_by_course (MutableMapping[str, list[Concept]]): The concepts of every course that has any; the same objects as in `concepts`.
+            dependents (MutableMapping[str, list[str]]): The IDs of the direct dependents of concepts, by concept ID. Concepts without dependents may be left out or map to an empty list.
+            course_graphs (Mapping[str, CompactCourse]): The graph of every course that has concepts, over the same objects as `concepts_by_course`.
+            courses (Iterable[Course]): The validated courses of the catalog. Their embedded `concepts` are ignored.
+            version (int, optional): The catalog version number. Defaults to 1.
+            content (ContentStore | None, optional): Where concept content is stored, e.g. over the snapshot's content section. Defaults to a new store.
+            order (Callable[[], Iterable[str]] | None, optional): Returns every concept ID in a topological order of the whole catalog; only called once the order is needed. Defaults to sorting the graph.
+
+        Returns:
+            Catalog: The catalog.
+
+        Raises:
+            ValueError: If a course ID is duplicated.
+        """
+        catalog = cls.__new__(cls)
+        catalog.version = version
+        catalog.content = content if content is not None else ContentStore()
+        catalog.concepts = concepts
+        catalog.concepts_by_course = concepts_by_course
+        catalog.dependents = dependents
+        catalog._roots = LazyMapping(
+            concepts_by_course,
+            lambda course_id: {c.id: None for c in concepts_by_course[course_id] if not c.prerequisites},
+        )
+        records: dict[str, Course] = {}
+        for course in courses:
+            if course.id in records:
+                raise ValueError(f"Duplicate course ID {course.id}")
+            records[course.id] = course
+        catalog.courses = LazyMapping(
+            records,
+            lambda course_id: records[course_id].model_copy(
+                update={"concepts": concepts_by_course.get(course_id, [])},
+            ),
+        )
+        catalog.course_order = sorted(records)
+        catalog._index_graph()
+        catalog._stored_graphs = course_graphs
+        catalog._topological = order
+        return catalog
+
+    def _index_records(
+        self,
+        concepts: Iterable[Concept],
+        courses: Iterable[Course],
+        content: ContentStore | None,
+    ) -> None:
+        self.content = content if content is not None else ContentStore()
+        bodies: list[tuple[str, str]] = []
+        self.concepts: MutableMapping[str, Concept] = {}
+        self.concepts_by_course: MutableMapping[str, list[Concept]] = {}
+        self.dependents: MutableMapping[str, list[str]] = {}
+        # The concepts of each course without prerequisites, as an insertion-ordered set.
+        self._roots: MutableMapping[str, dict[str, None]] = {}
+        for c in concepts:
+            if c.id in self.concepts:
+                raise ValueError(f"Duplicate concept ID {c.id}")
+            if c.content:
+                bodies.append((c.id, c.content))
+                c = c.model_copy(update={"content": ""})
+            self.concepts[c.id] = c
+            self.concepts_by_course.setdefault(c.course_id, []).append(c)
+            if not c.prerequisites:
+                self._roots.setdefault(c.course_id, {})[c.id] = None
+            for prereq_id in dict.fromkeys(c.prerequisites):
+                self.dependents.setdefault(prereq_id, []).append(c.id)
+        self.content.extend(bodies)
+
+        self.courses: MutableMapping[str, Course] = {}
+        for course in courses:
+            if course.id in self.courses:
+                raise ValueError(f"Duplicate course ID {course.id}")
+            self.courses[course.id] = course.model_copy(
+                update={"concepts": self.concepts_by_course.setdefault(course.id, [])},
+            )
+
+        self.course_order: list[str] = sorted(self.courses)
+
+    def _index_graph(self, graph: nx.DiGraph | None = None) -> None:
+        self.revisions: dict[str, int] = {}
+        self._edits = 0
+        self._graph = graph
+        self._topological: Callable[[], Iterable[str]] | None = None
+        self._order: IncrementalTopologicalOrder | None = None
+        self._closure: PrerequisiteClosure | None = None
+        self._compact = CompactGraph(self._load_course)
+        # Course graphs stored with the records, e.g. in a snapshot; only used for courses not edited since.
+        self._stored_graphs: Mapping[str, CompactCourse] = {}
+        self._search_index: SearchIndex | None = None
+        # Changes to state shared with the catalog this one was edited from, applied once this one is installed (see `_commit`).
+        self._pending: list[Callable[[], None]] = []
+
+    # The structures below are built on first use. A catalog never changes, so two threads racing to build one get equal results and either may be kept.
+
+    @property
+    def graph(self) -> nx.DiGraph:
+        """Return the concept graph in the form returned by `build_graph`, for tools and tests; the serving path uses `compact`."""
+        graph = self._graph
+        if graph is None:
+            graph = nx.DiGraph()
+            graph.add_nodes_from((n, {"concept": c}) for n, c in self.concepts.items())
+            graph.add_edges_from(
+                (prereq_id, n) for prereq_id, dependents in self.dependents.items() for n in dependents
+            )
+            self._graph = graph
+        return graph
+
+    @property
+    def order(self) -> IncrementalTopologicalOrder:
+        """Return the topological order of the concepts, which edits copy and maintain."""
+        order = self._order
+        if order is None:
+            initial = self._topological() if self._topological is not None else nx.topological_sort(self.graph)
+            order = IncrementalTopologicalOrder(_Adjacency(self), initial)
+            self._order = order
+        return order
+
+    @property
+    def closure(self) -> PrerequisiteClosure:
+        """Return the transitive prerequisite closure, computed per concept on first use; edits copy it and drop what they affect."""
+        closure = self._closure
+        if closure is None:
+            closure = PrerequisiteClosure(_Adjacency(self))
+            self._closure = closure
+        return closure
+
+    @property
+    def search_index(self) -> SearchIndex:
+        """Return the full-text index over concept names, descriptions and content, built when a `CatalogStore` installs the catalog, or else on first use.
+
+        Once built, it is shared with the catalogs edited from this one and patched as their edits are installed, so an older catalog's search may return concepts it does not have; `search` drops them.
+        """
+        index = self._search_index
+        if index is None:
+            concepts = list(self.concepts.values())
+            index = SearchIndex(self.with_content(c, cached=False) for c in concepts)
+            self._search_index = index
+        return index
+
+    @property
+    def compact(self) -> CompactGraph:
+        """Return the per-course CSR graphs used on the serving path, each built on first use."""
+        return self._compact
+
+    def _load_course(self, course_id: str) -> CompactCourse | None:
+        if course_id not in self.revisions and course_id in self._stored_graphs:
+            return self._stored_graphs[course_id]
+        concepts = self.concepts_by_course.get(course_id)
+        return CompactCourse.from_concepts(concepts) if concepts else None
+
+    def get_concept(self, concept_id: str) -> Concept | None:
+        """Return a concept by ID, or None if it does not exist."""
+        return self.concepts.get(concept_id)
+
+    def get_content(self, concept_id: str, cached: bool = True) -> str:
+        """Return the content of a concept, or an empty string if it has none.
+
+        Args:
+            concept_id (str): The ID of the concept.
+            cached (bool, optional): Whether to read through the content store's LRU; bulk reads should not, so they do not flush it. Defaults to True.
+
+        Returns:
+            str: The concept's content.
+        """
+        body = self.content.get(concept_id) if cached else self.content.read(concept_id)
+        return body or ""
+
+    def with_content(self, concept: Concept, cached: bool = True) -> Concept:
+        """Return a copy of a resident concept with its content filled in. See `get_content`."""
+        return concept.model_copy(update={"content": self.get_content(concept.id, cached)})
+
+    def get_course(self, course_id: str) -> Course | None:
+        """Return a course by ID, or None if it does not exist."""
+        return self.courses.get(course_id)
+
+    def list_courses(self, after: str | None = None, limit: int | None = None) -> list[Course]:
+        """Return courses ordered by ID, for cursor pagination.
+
+        Args:
+            after (str | None, optional): Only return courses whose ID sorts after this one. Defaults to None.
+            limit (int | None, optional): Maximum number of courses to return. Defaults to all.
+
+        Returns:
+            list[Course]: The requested page of courses.
+        """
+        start = bisect_right(self.course_order, after) if after is not None else 0
+        end = None if limit is None else start + limit
+        return [self.courses[c] for c in self.course_order[start:end]]
+
+    def search(
+        self,
+        query: str,
+        course_id: str | None = None,
+        limit: int = 10,
+        prefix: bool = False,
+    ) -> list[tuple[Concept, float]]:
+        """Rank concepts by how well their text matches a query. See `SearchIndex.search`.
+
+        Returns:
+            list[tuple[Concept, float]]: The matching concepts and their BM25 scores, best first.
+        """
+        hits = self.search_index.search(query, course_id=course_id, limit=limit, prefix=prefix)
+        # The index is shared with later versions, so it may return concepts this catalog does not have.
+        return [
+            (concept, score)
+            for concept_id, score in hits
+            if (concept := self.concepts.get(concept_id)) is not None
+        ]
+
+    def concepts_in_course(self, course_id: str) -> list[Concept]:
+        """Return the concepts that belong to a course."""
+        return self.concepts_by_course.get(course_id, [])
+
+    def roots(self, course_id: str) -> list[str]:
+        """Return the IDs of the concepts of a course that have no prerequisites."""
+        return list(self._roots.get(course_id, ()))
+
+    def dependents_of(self, concept_id: str) -> list[str]:
+        """Return the IDs of concepts that list `concept_id` as a direct prerequisite."""
+        return self.dependents.get(concept_id, [])
+
+    def learning_path(self, concept_id: str) -> list[Concept]:
+        """Return every direct and indirect prerequisite of a concept, in study order.
+
+        Args:
+            concept_id (str): The ID of the concept.
+
+        Returns:
+            list[Concept]: The prerequisites, each listed after all of its own prerequisites.
+
+        Raises:
+            KeyError: If the concept does not exist.
+        """
+        return [self.concepts[n] for n in self.closure.ancestors(concept_id)]
+
+    def is_prerequisite(self, prereq_id: str, concept_id: str) -> bool:
+        """Return True if `prereq_id` is a direct or indirect prerequisite of `concept_id`.
+
+        Raises:
+            KeyError: If either concept does not exist.
+        """
+        self._require(concept_id)
+        self._require(prereq_id)
+        return self.closure.is_prerequisite(prereq_id, concept_id)
+
+    def neighborhood(
+        self,
+        concept_id: str,
+        up: int,
+        down: int,
+        max_nodes: int | None = None,
+    ) -> tuple[list[str], list[tuple[str, str]], bool]:
+        """Extract the concepts within `up` prerequisite hops and `down` dependent hops of a concept, across courses.
+
+        Args:
+            concept_id (str): The ID of the center concept.
+            up (int): How many levels of prerequisites to include.
+            down (int): How many levels of dependents to include.
+            max_nodes (int | None, optional): Stop expanding once this many concepts are included. Defaults to no limit.
+
+        Returns:
+            tuple[list[str], list[tuple[str, str]], bool]: The concept IDs in topological order, the edges between them, and whether `max_nodes` cut the expansion short.
+
+        Raises:
+            KeyError: If the concept does not exist.
+        """
+        self._require(concept_id)
+        seen = {concept_id: None}
+        truncated = False
+        directions: tuple[tuple[int, Callable[[str], Iterable[str]]], ...] = (
+            (up, lambda n: self.concepts[n].prerequisites),
+            (down, self.dependents_of),
+        )
+        for hops, neighbors in directions:
+            frontier = [concept_id]
+            for _ in range(hops):
+                next_frontier = []
+                for n in frontier:
+                    for m in neighbors(n):
+                        if m in seen:
+                            continue
+                        if max_nodes is not None and len(seen) >= max_nodes:
+                            truncated = True
+                            break
+                        seen[m] = None
+                        next_frontier.append(m)
+                frontier = next_frontier
+                if not frontier:
+                    break
+
+        nodes = list(seen)
+        position = {n: i for i, n in enumerate(nodes)}
+        order = topological_order(
+            [[position[p] for p in dict.fromkeys(self.concepts[n].prerequisites) if p in position] for n in nodes]
+        )
+        members = [nodes[i] for i in order]
+        edges = [(u, v) for u in members for v in self.dependents_of(u) if v in seen]
+        return members, edges, truncated
+
+    def course_version(self, course_id: str) -> tuple[int, int]:
+        """Return a version key for a course that changes whenever its concepts or edges do."""
+        return self.version, self.revisions.get(course_id, 0)
+
+    @property
+    def revision(self) -> tuple[int, int]:
+        """Return a version key for the whole catalog that changes whenever any course does."""
+        return self.version, self._edits
+
+    def add_concept(self, concept: Concept) -> tuple[Catalog, set[str]]:
+        """Add a new concept, with edges from its prerequisites.
+
+        Args:
+            concept (Concept): The concept to add.
+
+        Returns:
+            tuple[Catalog, set[str]]: The edited catalog, and the IDs of the courses whose content changed.
+
+        Raises:
+            KeyError: If the concept's course does not exist.
+            ValueError: If the concept ID is taken or a prerequisite does not exist.
+        """
+        if concept.id in self.concepts:
+            raise ValueError(f"Duplicate concept ID {concept.id}")
+        if concept.course_id not in self.courses:
+            raise KeyError(f"Course {concept.course_id} not found")
+        for prereq_id in concept.prerequisites:
+            if prereq_id not in self.concepts:
+                raise ValueError(
+                    f"Prerequisite {prereq_id} not found for concept {concept.id}",
+                )
+
+        new = self._copy()
+        if new._search_index is not None:
+            new._pending.append(partial(new._search_index.add, concept))
+        if concept.content:
+            new.content.put(concept.id, concept.content)
+            concept = concept.model_copy(update={"content": ""})
+        new.concepts[concept.id] = concept
+        new._set_course_concepts(
+            concept.course_id,
+            [*new.concepts_by_course.get(concept.course_id, []), concept],
+        )
+        if not concept.prerequisites:
+            new._roots[concept.course_id] = {**new._roots.get(concept.course_id, {}), concept.id: None}
+        new.order.add_node(concept.id)
+        for prereq_id in dict.fromkeys(concept.prerequisites):
+            # A new node has no dependents yet, so these edges cannot form a cycle.
+            new.order.add_edge(prereq_id, concept.id)
+            new.dependents[prereq_id] = [*new.dependents.get(prereq_id, ()), concept.id]
+        new.closure.add_node(concept.id)
+        return new._touch({concept.course_id})
+
+    def remove_concept(self, concept_id: str) -> tuple[Catalog, set[str]]:
+        """Remove a concept, dropping it from the prerequisites of its dependents.
+
+        Args:
+            concept_id (str): The ID of the concept to remove.
+
+        Returns:
+            tuple[Catalog, set[str]]: The edited catalog, and the IDs of the courses whose content changed.
+
+        Raises:
+            KeyError: If the concept does not exist.
+        """
+        concept = self._require(concept_id)
+        affected = {concept.course_id}
+
+        new = self._copy()
+        dependents = new.dependents.pop(concept_id, [])
+        for dependent_id in dependents:
+            dependent = new.concepts[dependent_id]
+            new._replace(
+                dependent,
+                [p for p in dependent.prerequisites if p != concept_id],
+            )
+            affected.add(dependent.course_id)
+        for prereq_id in dict.fromkeys(concept.prerequisites):
+            new.dependents[prereq_id] = [n for n in new.dependents[prereq_id] if n != concept_id]
+
+        del new.concepts[concept_id]
+        new._set_course_concepts(
+            concept.course_id,
+            [c for c in new.concepts_by_course[concept.course_id] if c.id != concept_id],
+        )
+        if concept_id in new._roots.get(concept.course_id, {}):
+            roots = dict(new._roots[concept.course_id])
+            del roots[concept_id]
+            new._roots[concept.course_id] = roots
+        new.closure.remove_node(concept_id, dependents)
+        new.order.remove_node(concept_id)
+        # The index and store are shared with this catalog, which must keep the concept's entries until the edit is installed.
+        if new._search_index is not None:
+            new._pending.append(partial(new._search_index.remove, concept_id))
+        new._pending.append(partial(new.content.discard, concept_id))
+        return new._touch(affected)
+
+    def add_prerequisite(self, concept_id: str, prereq_id: str) -> tuple[Catalog, set[str]]:
+        """Make `prereq_id` a prerequisite of `concept_id`.
+
+        Args:
+            concept_id (str): The ID of the dependent concept.
+            prereq_id (str): The ID of the prerequisite concept.
+
+        Returns:
+            tuple[Catalog, set[str]]: The edited catalog, and the IDs of the courses whose content changed; this catalog and an empty set if the edge already existed.
+
+        Raises:
+            KeyError: If either concept does not exist.
+            CycleError: If the edge would create a prerequisite cycle.
+        """
+        concept = self._require(concept_id)
+        self._require(prereq_id)
+        if prereq_id in concept.prerequisites:
+            return self, set()
+
+        new = self._copy()
+        new.order.add_edge(prereq_id, concept_id)
+        new.dependents[prereq_id] = [*new.dependents.get(prereq_id, ()), concept_id]
+        new._replace(concept, [*concept.prerequisites, prereq_id])
+        new.closure.add_edge(prereq_id, concept_id)
+        return new._touch({concept.course_id})
+
+    def remove_prerequisite(self, concept_id: str, prereq_id: str) -> tuple[Catalog, set[str]]:
+        """Remove `prereq_id` from the prerequisites of `concept_id`.
+
+        Args:
+            concept_id (str): The ID of the dependent concept.
+            prereq_id (str): The ID of the prerequisite concept.
+
+        Returns:
+            tuple[Catalog, set[str]]: The edited catalog, and the IDs of the courses whose content changed.
+
+        Raises:
+            KeyError: If either concept does not exist, or `prereq_id` is not a prerequisite of `concept_id`.
+        """
+        concept = self._require(concept_id)
+        self._require(prereq_id)
+        if prereq_id not in concept.prerequisites:
+            raise KeyError(f"{prereq_id} is not a prerequisite of {concept_id}")
+
+        new = self._copy()
+        new.dependents[prereq_id] = [n for n in new.dependents[prereq_id] if n != concept_id]
+        new._replace(concept, [p for p in concept.prerequisites if p != prereq_id])
+        new.closure.remove_edge(prereq_id, concept_id)
+        return new._touch({concept.course_id})
+
+    def _require(self, concept_id: str) -> Concept:
+        concept = self.concepts.get(concept_id)
+        if concept is None:
+            raise KeyError(f"Concept {concept_id} not found")
+        return concept
+
+    def _copy(self) -> Catalog:
+        # Top-level maps are copied (a C-level copy, no per-concept work, except that the first edit of a snapshot catalog decodes its lazy views); the lists and dicts they hold are shared and must be replaced, never mutated, by the edit.
+        new = Catalog.__new__(Catalog)
+        new.version = self.version
+        new.content = self.content
+        new.concepts = dict(self.concepts)
+        new.concepts_by_course = dict(self.concepts_by_course)
+        new.dependents = dict(self.dependents)
+        new._roots = dict(self._roots)
+        new.courses = dict(self.courses)
+        new.course_order = self.course_order
+        new._index_graph()
+        new.revisions = dict(self.revisions)
+        new._edits = self._edits
+        new._compact = self._compact
+        new._stored_graphs = self._stored_graphs
+        adjacency = _Adjacency(new)
+        new._order = self.order.copy(adjacency)
+        new._closure = self.closure.copy(adjacency)
+        new._search_index = self._search_index
+        new._pending = list(self._pending)
+        return new
+
+    def _commit(self) -> None:
+        # Called by `CatalogStore` once this catalog is installed; requests still holding an older version may then miss what it drops.
+        pending, self._pending = self._pending, []
+        for apply in pending:
+            apply()
+
+    def _set_course_concepts(self, course_id: str, concepts: list[Concept]) -> None:
+        self.concepts_by_course[course_id] = concepts
+        self.courses[course_id] = self.courses[course_id].model_copy(update={"concepts": concepts})
+
+    def _replace(self, concept: Concept, prerequisites: list[str]) -> None:
+        updated = concept.model_copy(update={"prerequisites": prerequisites})
+        self.concepts[concept.id] = updated
+        self._set_course_concepts(
+            concept.course_id,
+            [updated if c is concept else c for c in self.concepts_by_course[concept.course_id]],
+        )
+        roots = dict(self._roots.get(concept.course_id, {}))
+        if prerequisites:
+            roots.pop(concept.id, None)
+        else:
+            roots[concept.id] = None
+        self._roots[concept.course_id] = roots
+
+    def _touch(self, course_ids: set[str]) -> tuple[Catalog, set[str]]:
+        self._edits += 1
+        self._compact = self._compact.invalidated(course_ids, self._load_course)
+        for course_id in course_ids:
+            self.revisions[course_id] = self.revisions.get(course_id, 0) + 1
+        return self, course_ids
+
+
+class CatalogStore:
+    """Holder of the current `Catalog`, supporting atomic swap-on-reload and swap-on-edit.
+
+    Readers should grab `current` once per request and use that object throughout, so a concurrent reload or edit never exposes a half-updated catalog.
+    """
+
+    def __init__(self, catalog: Catalog) -> None:
+        """Create a store serving the given catalog, indexing it for search first."""
+        catalog.search_index  # noqa: B018
+        self._current = catalog
+        self._lock = threading.Lock()
+        self._listeners: list[CatalogListener] = []
+
+    @classmethod
+    def from_records(
+        cls,
+        concepts: Iterable[Mapping],
+        courses: Iterable[Mapping],
+    ) -> CatalogStore:
+        """Validate raw concept and course records and build a store from them.
+
+        Args:
+            concepts (Iterable[Mapping]): Raw concept records.
+            courses (Iterable[Mapping]): Raw course records.
+
+        Returns:
+            CatalogStore: A store serving version 1 of the catalog.
+        """
+        return cls(Catalog(*validate_records(concepts, courses)))
+
+    @property
+    def current(self) -> Catalog:
+        """Return the catalog currently being served."""
+        return self._current
+
+    def subscribe(self, listener: CatalogListener) -> None:
+        """Register a callback invoked after every reload or edit.
+
+        The callback receives the newly installed catalog and the IDs of the courses that changed, or None after a full reload.
+        """
+        self._listeners.append(listener)
+
+    def reload(
+        self,
+        concepts: Iterable[Concept],
+        courses: Iterable[Course],
+    ) -> Catalog:
+        """Build a new catalog version on the side and atomically swap it in.
+
+        Requests already holding the previous catalog keep using it until they finish.
+
+        Args:
+            concepts (Iterable[Concept]): The validated concepts of the new catalog.
+            courses (Iterable[Course]): The validated courses of the new catalog.
+
+        Returns:
+            Catalog: The newly installed catalog.
+
+        Raises:
+            ValueError: If the new catalog is invalid; the current catalog is left in place.
+        """
+        return self.install(lambda version: Catalog(concepts, courses, version=version))
+
+    def install(self, build: Callable[[int], Catalog]) -> Catalog:
+        """Build the next catalog version and atomically swap it in.
+
+        Requests already holding the previous catalog keep using it until they finish. Edits wait while the new version is built and indexed for search, so no request pays for the index; edits applied to the previous version are not carried over.
+
+        Args:
+            build (Callable[[int], Catalog]): Builds the catalog, given its version number.
+
+        Returns:
+            Catalog: The newly installed catalog.
+
+        Raises:
+            Exception: Whatever `build` raises; the current catalog is left in place.
+        """
+        with self._lock:
+            catalog = build(self._current.version + 1)
+            catalog.search_index  # noqa: B018
+            self._current = catalog
+        self._notify(catalog, None)
+        return catalog
+
+    def add_concept(self, concept: Concept) -> set[str]:
+        """Add a concept to the current catalog. See `Catalog.add_concept`."""
+        return self.edit(lambda catalog: catalog.add_concept(concept))
+
+    def remove_concept(self, concept_id: str) -> set[str]:
+        """Remove a concept from the current catalog. See `Catalog.remove_concept`."""
+        return self.edit(lambda catalog: catalog.remove_concept(concept_id))
+
+    def add_prerequisite(self, concept_id: str, prereq_id: str) -> set[str]:
+        """Add a prerequisite edge to the current catalog. See `Catalog.add_prerequisite`."""
+        return self.edit(lambda catalog: catalog.add_prerequisite(concept_id, prereq_id))
+
+    def remove_prerequisite(self, concept_id: str, prereq_id: str) -> set[str]:
+        """Remove a prerequisite edge from the current catalog. See `Catalog.remove_prerequisite`."""
+        return self.edit(
+            lambda catalog: catalog.remove_prerequisite(concept_id, prereq_id),
+        )
+
+    def edit(self, edit: CatalogEdit) -> set[str]:
+        """Apply an edit to the current catalog and swap the edited copy in.
+
+        Edits are serialized, so each one sees the result of the previous one.
+
+        Args:
+            edit (CatalogEdit): The edit, e.g. `lambda catalog: catalog.add_concept(concept)`.
+
+        Returns:
+            set[str]: The IDs of the courses whose content changed.
+
+        Raises:
+            Exception: Whatever `edit` raises; the current catalog is left in place.
+        """
+        with self._lock:
+            catalog, affected = edit(self._current)
+            self._current = catalog
+            catalog._commit()
+        if affected:
+            self._notify(catalog, affected)
+        return affected
+
+    def _notify(self, catalog: Catalog, course_ids: set[str] | None) -> None:
+        for listener in self._listeners:
+            listener(catalog, course_ids)
+
+
+def validate_records(
+    concepts: Iterable[Mapping],
+    courses: Iterable[Mapping],
+) -> tuple[list[Concept], list[Course]]:
+    """Validate raw concept and course records into models.
+
+    Embedded course concept lists are skipped, since `Catalog` resolves them from the concepts themselves.
+
+    Args:
+        concepts (Iterable[Mapping]): Raw concept records.
+        courses (Iterable[Mapping]): Raw course records.
+
+    Returns:
+        tuple[list[Concept], list[Course]]: The validated concepts and courses.
+    """
+    return (
+        [Concept.model_validate(c) for c in concepts],
+        [Course.model_validate({**c, "concepts": []}) for c in courses],
+    )
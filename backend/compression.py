@@ -0,0 +1,87 @@
+"""Precompressed variants of cached response bodies and `Accept-Encoding` negotiation.
+
+Cached bodies are compressed once, when they are cached, at a high compression level, and every later request is served the stored bytes. gzip is always available; zstd is added when the optional `zstandard` package is installed.
+"""
+
+from __future__ import annotations
+
+import gzip
+from collections.abc import Callable, Collection
+
+# Bodies smaller than this are not worth compressing; also the threshold for on-the-fly gzip of uncached responses.
+MIN_COMPRESS_BYTES = 1024
+GZIP_LEVEL = 9
+ZSTD_LEVEL = 12
+
+ENCODERS: dict[str, Callable[[bytes], bytes]] = {
+    "gzip": lambda body: gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0),
+}
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    pass
+else:
+    ENCODERS["zstd"] = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress
+
+# Server preference when the client accepts several encodings with the same q-value.
+PREFERENCE = ("zstd", "gzip")
+
+
+def compress_variants(body: bytes) -> dict[str, bytes]:
+    """Compress a body with every available encoding.
+
+    Args:
+        body (bytes): The identity-encoded body.
+
+    Returns:
+        dict[str, bytes]: The compressed body by content coding, leaving out encodings that do not make it smaller. Empty for bodies under `MIN_COMPRESS_BYTES`.
+    """
+    if len(body) < MIN_COMPRESS_BYTES:
+        return {}
+    variants = {}
+    for encoding, encode in ENCODERS.items():
+        compressed = encode(body)
+        if len(compressed) < len(body):
+            variants[encoding] = compressed
+    return variants
+
+
+def negotiate(accept_encoding: str | None, available: Collection[str]) -> str | None:
+    """Pick the content coding to serve for an `Accept-Encoding` header.
+
+    Args:
+        accept_encoding (str | None): The raw request header.
+        available (Collection[str]): The encodings a precompressed variant exists for.
+
+    Returns:
+        str | None: The accepted encoding with the highest q-value (ties broken by `PREFERENCE`), or None to serve the identity body.
+    """
+    if not accept_encoding or not available:
+        return None
+    weights: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[coding.strip().lower()] = q
+
+    default = weights.get("*", 0.0)
+    best, best_q = None, 0.0
+    for encoding in PREFERENCE:
+        q = weights.get(encoding, default)
+        if encoding in available and q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def variant_etag(etag: str, encoding: str | None) -> str:
+    """Return the strong ETag of one encoding of a representation, since each encoding has different bytes."""
+    if encoding is None:
+        return etag
+    return f'{etag[:-1]}-{encoding}"'
@@ -0,0 +1,185 @@
+"""Out-of-core storage for concept content bodies.
+
+Only a concept's detail view ever needs its content, so the catalog keeps concept metadata in memory and moves the bodies here. Bodies are UTF-8 encoded into a single append-only byte space, read back through a memory map: the only per-concept state held in memory is an `(offset, length)` entry in the index, plus the decoded bodies of the most recently read concepts in a small LRU.
+
+The byte space may start with a read-only buffer, such as the content section of a mapped catalog snapshot, whose pages are then shared by every worker process mapping the same file. Bodies added later are appended to a private temporary file. Replacing a body appends the new one and repoints the index; the old bytes are left in place.
+"""
+
+from __future__ import annotations
+
+import mmap
+import tempfile
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable, Sequence
+from typing import IO
+
+DEFAULT_CACHE_SIZE = 256
+
+
+class ContentStore:
+    """Append-only, memory-mapped store of content bodies keyed by concept ID, with an LRU of decoded bodies.
+
+    Reads only take the lock to update the LRU or to remap the file after it grew; appends are serialized by the lock, and a body is written before the index points at it.
+    """
+
+    def __init__(self, cache_size: int = DEFAULT_CACHE_SIZE, directory: str | None = None) -> None:
+        """Create an empty store.
+
+        Args:
+            cache_size (int, optional): Maximum number of decoded bodies kept in memory. Defaults to 256.
+            directory (str | None, optional): Where to create the file bodies are appended to. Defaults to the system temporary directory.
+        """
+        self.cache_size = cache_size
+        self._directory = directory
+        self._base: memoryview | bytes = b""
+        self._file: IO[bytes] | None = None
+        self._map: mmap.mmap | None = None
+        self._size = 0
+        self._index: dict[str, tuple[int, int]] = {}
+        self._cache: OrderedDict[str, str] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_buffer(
+        cls,
+        buffer: memoryview,
+        ids: Sequence[str],
+        offsets: Sequence[int],
+        cache_size: int = DEFAULT_CACHE_SIZE,
+    ) -> ContentStore:
+        """Create a store over bodies already laid out back to back in a buffer, e.g. a snapshot section.
+
+        Args:
+            buffer (memoryview): The encoded bodies. It is read in place, never copied as a whole.
+            ids (Sequence[str]): The concept ID of each body, in buffer order.
+            offsets (Sequence[int]): `len(ids) + 1` offsets into `buffer`; body `i` spans `offsets[i]:offsets[i + 1]`.
+            cache_size (int, optional): Maximum number of decoded bodies kept in memory. Defaults to 256.
+
+        Returns:
+            ContentStore: A store whose later additions are appended after `buffer`.
+        """
+        store = cls(cache_size)
+        store._base = buffer
+        store._index = {
+            concept_id: (offsets[i], offsets[i + 1] - offsets[i])
+            for i, concept_id in enumerate(ids)
+        }
+        return store
+
+    def __len__(self) -> int:
+        """Return the number of stored bodies."""
+        return len(self._index)
+
+    def __contains__(self, concept_id: object) -> bool:
+        """Return whether a concept has a stored body."""
+        return concept_id in self._index
+
+    def stats(self) -> dict[str, float]:
+        """Return a snapshot of the store's counters."""
+        return {
+            "bodies": len(self._index),
+            "bytes": len(self._base) + self._size,
+            "cached": len(self._cache),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def put(self, concept_id: str, body: str) -> None:
+        """Store a concept's body, replacing any previous one."""
+        self.extend([(concept_id, body)])
+
+    def extend(self, bodies: Iterable[tuple[str, str]]) -> None:
+        """Store many bodies with a single append.
+
+        Args:
+            bodies (Iterable[tuple[str, str]]): `(concept_id, body)` pairs. A later pair for the same ID wins.
+        """
+        with self._lock:
+            offset = len(self._base) + self._size
+            index: dict[str, tuple[int, int]] = {}
+            chunks = []
+            for concept_id, body in bodies:
+                data = body.encode()
+                index[concept_id] = (offset, len(data))
+                chunks.append(data)
+                offset += len(data)
+            if not index:
+                return
+            if self._file is None:
+                self._file = tempfile.TemporaryFile(dir=self._directory)
+            data = b"".join(chunks)
+            self._file.write(data)
+            self._file.flush()
+            self._size += len(data)
+            self._index.update(index)
+            for concept_id in index:
+                self._cache.pop(concept_id, None)
+
+    def discard(self, concept_id: str) -> None:
+        """Forget a concept's body, if stored. Its bytes are left in place."""
+        with self._lock:
+            self._index.pop(concept_id, None)
+            self._cache.pop(concept_id, None)
+
+    def get(self, concept_id: str) -> str | None:
+        """Return a concept's body through the LRU.
+
+        Args:
+            concept_id (str): The ID of the concept.
+
+        Returns:
+            str | None: The body, or None if none is stored.
+        """
+        with self._lock:
+            body = self._cache.get(concept_id)
+            if body is not None:
+                self._cache.move_to_end(concept_id)
+                self.hits += 1
+                return body
+            self.misses += 1
+
+        location = self._index.get(concept_id)
+        if location is None:
+            return None
+        body = self._read(*location)
+        with self._lock:
+            # Only cache the body if it was not replaced meanwhile.
+            if self._index.get(concept_id) == location:
+                self._cache[concept_id] = body
+                self._cache.move_to_end(concept_id)
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return body
+
+    def read(self, concept_id: str) -> str | None:
+        """Return a concept's body without going through the LRU, for bulk reads that would only flush it.
+
+        Args:
+            concept_id (str): The ID of the concept.
+
+        Returns:
+            str | None: The body, or None if none is stored.
+        """
+        location = self._index.get(concept_id)
+        return None if location is None else self._read(*location)
+
+    def _read(self, offset: int, length: int) -> str:
+        if not length:
+            return ""
+        base = self._base
+        if offset < len(base):
+            return bytes(base[offset : offset + length]).decode()
+        offset -= len(base)
+        m = self._map
+        if m is None or offset + length > len(m):
+            with self._lock:
+                if self._map is None or offset + length > len(self._map):
+                    if self._file is None or offset + length > self._size:
+                        raise ValueError(f"Body at offset {offset + len(base)} is past the end of the store")
+                    # Older maps are left to readers still holding them, and closed once released.
+                    self._map = mmap.mmap(self._file.fileno(), self._size, access=mmap.ACCESS_READ)
+                m = self._map
+        return m[offset : offset + length].decode()
@@ -0,0 +1,138 @@
+"""Transitive prerequisite closure of the concept graph, stored as one ancestor bitset per concept."""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Iterable, Iterator
+
+from backend.graph.toposort import Adjacency
+
+
+class PrerequisiteClosure:
+    """Ancestor bitsets of the concepts of a DAG, computed on first use and kept valid under edits.
+
+    Each concept is interned to a bit position, and `ancestors[n]` is a Python int with the bits of every direct or indirect prerequisite of `n` set. "Is X a prerequisite of Y" is then a single bit test, and the full closure of a concept is decoded from its bitset without a graph traversal.
+
+    Nothing is computed up front: a concept's bitset is built by a depth-first search over its prerequisites the first time it is asked for, memoizing every concept the search finishes on the way, so memory and time grow with the part of the graph that is actually queried rather than with its square. Concepts are interned as the search finishes them, i.e. after all of their prerequisites, so bit order is a topological order and a decoded closure needs no sorting.
+
+    Edits only drop what they affect: the bitsets of the edited concept's memoized descendants are forgotten, along with their bits, and recomputed on their next use with fresh bits after every other one, which keeps bit order topological.
+    """
+
+    def __init__(self, G: Adjacency) -> None:
+        """Create an empty closure of a DAG.
+
+        Args:
+            G (Adjacency): The concept graph. It is referenced, not copied.
+        """
+        self._G = G
+        self._bit: dict[str, int] = {}
+        # The concept of every bit ever handed out; the entries of forgotten bits are stale and never read.
+        self._ids: list[str] = []
+        self._ancestors: dict[str, int] = {}
+        # Readers of a published catalog share its closure; misses are computed under the lock so every concept gets one bit.
+        self._lock = threading.Lock()
+
+    def copy(self, G: Adjacency) -> PrerequisiteClosure:
+        """Return an independent copy of the closure over `G`, a copy of the graph about to be edited."""
+        closure = PrerequisiteClosure(G)
+        # Readers may be memoizing misses into this closure; copy a consistent state.
+        with self._lock:
+            closure._bit = dict(self._bit)
+            closure._ids = list(self._ids)
+            closure._ancestors = dict(self._ancestors)
+        return closure
+
+    def is_prerequisite(self, prereq_id: str, concept_id: str) -> bool:
+        """Return True if `prereq_id` is a direct or indirect prerequisite of `concept_id`.
+
+        Raises:
+            KeyError: If `concept_id` does not exist.
+        """
+        bits = self._bits(concept_id)
+        bit = self._bit.get(prereq_id)
+        # Every prerequisite is interned once its dependent's bitset is built, so an uninterned concept is none.
+        return bit is not None and bool(bits >> bit & 1)
+
+    def ancestors(self, concept_id: str) -> list[str]:
+        """Return every direct and indirect prerequisite of a concept, in topological (study) order.
+
+        Args:
+            concept_id (str): The ID of the concept.
+
+        Returns:
+            list[str]: The prerequisite IDs, each listed after all of its own prerequisites.
+
+        Raises:
+            KeyError: If the concept does not exist.
+        """
+        ids = self._ids
+        return [ids[i] for i in _set_bits(self._bits(concept_id))]
+
+    def add_node(self, node: str) -> None:
+        """Forget anything known about a node that was just added to the graph, together with its incoming edges."""
+        self._invalidate([node])
+
+    def remove_node(self, node: str, dependents: Iterable[str]) -> None:
+        """Forget a node that was just removed from the graph.
+
+        Args:
+            node (str): The removed node.
+            dependents (Iterable[str]): The node's direct dependents before it was removed.
+        """
+        if self._ancestors.pop(node, None) is not None:
+            del self._bit[node]
+        self._invalidate(dependents)
+
+    def add_edge(self, u: str, v: str) -> None:
+        """Forget the closure below `v` after the edge `u -> v` was added to the graph."""
+        self._invalidate([v])
+
+    def remove_edge(self, u: str, v: str) -> None:
+        """Forget the closure below `v` after the edge `u -> v` was removed from the graph."""
+        self._invalidate([v])
+
+    def _bits(self, node: str) -> int:
+        ancestors = self._ancestors
+        bits = ancestors.get(node)
+        if bits is not None:
+            return bits
+        predecessors = self._G.predecessors
+        with self._lock:
+            # Iterative post-order DFS; in a DAG a node is never on the stack twice.
+            stack = [(node, iter(predecessors(node)))] if node not in ancestors else []
+            while stack:
+                n, pending = stack[-1]
+                for p in pending:
+                    if p not in ancestors:
+                        stack.append((p, iter(predecessors(p))))
+                        break
+                else:
+                    stack.pop()
+                    bits = 0
+                    for p in predecessors(n):
+                        bits |= ancestors[p] | 1 << self._bit[p]
+                    self._bit[n] = len(self._ids)
+                    self._ids.append(n)
+                    ancestors[n] = bits
+            return ancestors[node]
+
+    def _invalidate(self, roots: Iterable[str]) -> None:
+        # A memoized concept's prerequisites are all memoized, so the walk can stop at the first concept that is not.
+        stack = [n for n in roots if n in self._ancestors]
+        while stack:
+            n = stack.pop()
+            if self._ancestors.pop(n, None) is None:
+                continue
+            del self._bit[n]
+            stack.extend(w for w in self._G.successors(n) if w in self._ancestors)
+        if len(self._ids) > 2 * len(self._ancestors) + 64:
+            # Mostly forgotten bits: start over rather than keep growing every bitset.
+            self._bit, self._ids, self._ancestors = {}, [], {}
+
+
+def _set_bits(bits: int) -> Iterator[int]:
+    digits = bin(bits)[:1:-1]
+    i = digits.find("1")
+    while i >= 0:
+        yield i
+        i = digits.find("1", i + 1)
@@ -0,0 +1,215 @@
+"""Compact, read-only course graphs stored as CSR adjacency arrays."""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Callable, Iterable, Sequence
+from typing import Final
+
+from backend.graph.toposort import topological_order
+from backend.models.concepts import Concept
+
+# Node IDs are 32-bit; offsets are 64-bit so edge counts are not limited to 2**31.
+NODE_TYPECODE: Final = "i"
+OFFSET_TYPECODE: Final = "q"
+
+
+def _csr(n: int, pairs: list[tuple[int, int]]) -> tuple[array, array]:
+    """Build (offsets, targets) arrays for `n` rows from (row, target) pairs."""
+    offsets = array(OFFSET_TYPECODE, [0]) * (n + 1)
+    for row, _ in pairs:
+        offsets[row + 1] += 1
+    for i in range(n):
+        offsets[i + 1] += offsets[i]
+
+    targets = array(NODE_TYPECODE, [0]) * len(pairs)
+    fill = offsets[:-1]
+    for row, target in pairs:
+        targets[fill[row]] = target
+        fill[row] += 1
+    return offsets, targets
+
+
+class CompactCourse:
+    """A frozen graph of one course's concepts and the prerequisite edges between them.
+
+    Node `i` has concept ID `ids[i]`, and nodes are numbered in topological order. Its in-course dependents are `out_targets[out_offsets[i]:out_offsets[i + 1]]` and its in-course prerequisites are `in_sources[in_offsets[i]:in_offsets[i + 1]]`. The offsets may point into target arrays shared with other courses, e.g. sections of a catalog snapshot; the targets themselves are always node numbers of this course.
+    """
+
+    def __init__(
+        self,
+        ids: list[str],
+        concepts: Sequence[Concept],
+        out_offsets: Sequence[int],
+        out_targets: Sequence[int],
+        in_offsets: Sequence[int],
+        in_sources: Sequence[int],
+    ) -> None:
+        """Wrap a course's concepts and CSR arrays, e.g. memory-mapped from a catalog snapshot, without copying the arrays.
+
+        The arrays can be any integer sequences with the layout described on the class, such as `memoryview`s cast to `NODE_TYPECODE`/`OFFSET_TYPECODE`. They are trusted, not checked.
+
+        Args:
+            ids (list[str]): The course's concept IDs, in topological order.
+            concepts (Sequence[Concept]): The concepts with those IDs.
+            out_offsets (Sequence[int]): `len(concepts) + 1` offsets into `out_targets`.
+            out_targets (Sequence[int]): The dependents of every node, back to back.
+            in_offsets (Sequence[int]): `len(concepts) + 1` offsets into `in_sources`.
+            in_sources (Sequence[int]): The prerequisites of every node, back to back.
+        """
+        self.ids = ids
+        self.concepts = concepts
+        self.out_offsets, self.out_targets = out_offsets, out_targets
+        self.in_offsets, self.in_sources = in_offsets, in_sources
+        self._index: dict[str, int] | None = None
+        self._layers: list[list[int]] | None = None
+
+    @classmethod
+    def from_concepts(cls, concepts: Iterable[Concept]) -> CompactCourse:
+        """Compact the concepts of one course, keeping only the prerequisite edges between them.
+
+        Args:
+            concepts (Iterable[Concept]): The course's concepts, in any order. Their prerequisites must not form a cycle.
+
+        Returns:
+            CompactCourse: The course graph. Concepts without an order between them keep their relative order.
+        """
+        concepts = list(concepts)
+        position = {c.id: i for i, c in enumerate(concepts)}
+        predecessors = [
+            [position[p] for p in dict.fromkeys(c.prerequisites) if p in position]
+            for c in concepts
+        ]
+        order = topological_order(predecessors)
+        rank = [0] * len(order)
+        for r, i in enumerate(order):
+            rank[i] = r
+
+        edges = sorted((rank[p], rank[i]) for i, ps in enumerate(predecessors) for p in ps)
+        out_offsets, out_targets = _csr(len(order), edges)
+        in_offsets, in_sources = _csr(len(order), sorted((v, u) for u, v in edges))
+        return cls(
+            [concepts[i].id for i in order],
+            [concepts[i] for i in order],
+            out_offsets,
+            out_targets,
+            in_offsets,
+            in_sources,
+        )
+
+    def __len__(self) -> int:
+        """Return the number of concepts."""
+        return len(self.ids)
+
+    @property
+    def index(self) -> dict[str, int]:
+        """Return the node number of each concept ID, i.e. its rank in the course's topological order."""
+        index = self._index
+        if index is None:
+            index = self._index = {n: i for i, n in enumerate(self.ids)}
+        return index
+
+    @property
+    def number_of_edges(self) -> int:
+        """Return the number of edges."""
+        return self.out_offsets[len(self.ids)] - self.out_offsets[0]
+
+    def out_neighbors(self, i: int) -> Sequence[int]:
+        """Return the node numbers of node `i`'s dependents."""
+        return self.out_targets[self.out_offsets[i] : self.out_offsets[i + 1]]
+
+    def in_neighbors(self, i: int) -> Sequence[int]:
+        """Return the node numbers of node `i`'s prerequisites."""
+        return self.in_sources[self.in_offsets[i] : self.in_offsets[i + 1]]
+
+    def edges(self) -> list[tuple[str, str]]:
+        """Return the (prerequisite, dependent) edges, grouped by prerequisite in topological order."""
+        ids = self.ids
+        return [(ids[i], ids[j]) for i in range(len(ids)) for j in self.out_neighbors(i)]
+
+    def layers(self) -> list[list[int]]:
+        """Group the concepts into layers by the longest chain of prerequisites leading to them.
+
+        Every edge points to a later layer, so the layers can be loaded in order. The result is computed once; a course graph never changes.
+
+        Returns:
+            list[list[int]]: The node numbers of each layer's concepts, in topological order.
+        """
+        layers = self._layers
+        if layers is not None:
+            return layers
+        layers = []
+        layer = [0] * len(self.ids)
+        for i in range(len(self.ids)):
+            k = max((layer[j] + 1 for j in self.in_neighbors(i)), default=0)
+            layer[i] = k
+            if k == len(layers):
+                layers.append([])
+            layers[k].append(i)
+        self._layers = layers
+        return layers
+
+
+class CompactGraph:
+    """The read-only form of the concept graph used on the serving path: one `CompactCourse` per course.
+
+    Course graphs are built on first use by `load`, unless given up front, and kept. An edit only replaces the graphs of the courses it touched (see `invalidated`), so every other course keeps its graph, and its memoized layers, across catalog versions. Prerequisite edges between courses are not part of any course graph.
+    """
+
+    def __init__(
+        self,
+        load: Callable[[str], CompactCourse | None],
+        courses: dict[str, CompactCourse] | None = None,
+    ) -> None:
+        """Create a graph whose course graphs are built on demand.
+
+        Args:
+            load (Callable[[str], CompactCourse | None]): Builds the graph of a course, or returns None if the course has no concepts.
+            courses (dict[str, CompactCourse] | None, optional): Course graphs that are already built. Defaults to none.
+        """
+        self._load = load
+        self._courses = courses if courses is not None else {}
+
+    @classmethod
+    def from_concepts(cls, concepts: Iterable[Concept]) -> CompactGraph:
+        """Compact a set of concepts, building every course graph up front.
+
+        Args:
+            concepts (Iterable[Concept]): The concepts. Their prerequisites must not form a cycle.
+
+        Returns:
+            CompactGraph: The graph of every course that has concepts.
+        """
+        by_course: dict[str, list[Concept]] = {}
+        for c in concepts:
+            by_course.setdefault(c.course_id, []).append(c)
+        courses = {course_id: CompactCourse.from_concepts(members) for course_id, members in by_course.items()}
+        return cls(lambda course_id: None, courses)
+
+    def invalidated(
+        self,
+        course_ids: Iterable[str],
+        load: Callable[[str], CompactCourse | None],
+    ) -> CompactGraph:
+        """Return a graph for an edited catalog, sharing the built graph of every course not in `course_ids`.
+
+        Args:
+            course_ids (Iterable[str]): The courses the edit touched.
+            load (Callable[[str], CompactCourse | None]): Builds the graph of a course from the edited catalog.
+
+        Returns:
+            CompactGraph: The new graph; this one is left as it was.
+        """
+        courses = dict(self._courses)
+        for course_id in course_ids:
+            courses.pop(course_id, None)
+        return CompactGraph(load, courses)
+
+    def course(self, course_id: str) -> CompactCourse | None:
+        """Return the graph of a course, or None if it has no concepts."""
+        course = self._courses.get(course_id)
+        if course is None:
+            course = self._load(course_id)
+            if course is not None:
+                self._courses[course_id] = course
+        return course
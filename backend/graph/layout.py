@@ -0,0 +1,309 @@
+"""Layered (Sugiyama-style) layout of a course's concept DAG.
+
+The layout is computed in three phases: longest-path layering assigns every concept to a layer below all of its prerequisites, barycenter sweeps reorder each layer to reduce edge crossings, and coordinate assignment pulls every node towards its neighbors while keeping a minimum gap within its layer. Edges spanning several layers are routed through one dummy node per intermediate layer, which become the edge's bend points.
+
+Given the layout of a previous version of the same graph, only the layers from the first one whose nodes or incoming edges changed are reordered and re-placed; the layers above it keep their order and coordinates.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Collection, Hashable, Sequence
+from typing import NamedTuple
+
+# Sweeps alternate downward and upward; the ordering with the fewest crossings is kept.
+ORDERING_SWEEPS = 8
+COORDINATE_SWEEPS = 4
+NODE_GAP = 1.0
+LAYER_GAP = 1.0
+
+
+class Layout(NamedTuple):
+    """A layered layout of a DAG.
+
+    `layers` lists the nodes of each layer from left to right, including dummy nodes (tuples `(source, target, layer)`) for edges that span several layers. `x` maps every node, dummy or not, to its horizontal coordinate; a node's vertical coordinate is its layer times `LAYER_GAP`. `signatures` records each layer's nodes and incoming edges, to find the layers a later version changed.
+    """
+
+    layers: list[list[Hashable]]
+    x: dict[Hashable, float]
+    signatures: list[frozenset]
+
+    @property
+    def width(self) -> float:
+        """Return the distance between the leftmost and rightmost node."""
+        return max(self.x.values(), default=0.0)
+
+    @property
+    def height(self) -> float:
+        """Return the distance between the first and last layer."""
+        return max(len(self.layers) - 1, 0) * LAYER_GAP
+
+    def positions(self) -> list[tuple[str, int, float, float]]:
+        """Return `(node, layer, x, y)` for every real node, layer by layer from left to right."""
+        return [
+            (node, k, self.x[node], k * LAYER_GAP)
+            for k, layer in enumerate(self.layers)
+            for node in layer
+            if isinstance(node, str)
+        ]
+
+    def bends(self, source: str, target: str, source_layer: int, target_layer: int) -> list[tuple[float, float]]:
+        """Return the bend points of an edge, one per layer strictly between its endpoints."""
+        return [
+            (self.x[(source, target, k)], k * LAYER_GAP)
+            for k in range(source_layer + 1, target_layer)
+        ]
+
+
+def longest_path_layers(nodes: Sequence[str], edges: Sequence[tuple[str, str]]) -> dict[str, int]:
+    """Assign each node the length of the longest path reaching it from a source.
+
+    Args:
+        nodes (Sequence[str]): The nodes, in topological order.
+        edges (Sequence[tuple[str, str]]): The (prerequisite, dependent) edges between them.
+
+    Returns:
+        dict[str, int]: The layer of each node; every edge points to a strictly higher layer.
+    """
+    preds: dict[str, list[str]] = {}
+    for u, v in edges:
+        preds.setdefault(v, []).append(u)
+    layer: dict[str, int] = {}
+    for n in nodes:
+        layer[n] = max((layer[u] + 1 for u in preds.get(n, ())), default=0)
+    return layer
+
+
+def layered_layout(
+    nodes: Sequence[str],
+    edges: Sequence[tuple[str, str]],
+    previous: Layout | None = None,
+) -> Layout:
+    """Lay out a DAG in layers.
+
+    Args:
+        nodes (Sequence[str]): The nodes, in topological order.
+        edges (Sequence[tuple[str, str]]): The (prerequisite, dependent) edges between them.
+        previous (Layout | None, optional): The layout of an earlier version of the graph, whose unchanged leading layers are reused. Defaults to None.
+
+    Returns:
+        Layout: The layout.
+    """
+    layer_of = longest_path_layers(nodes, edges)
+    depth = max(layer_of.values(), default=-1) + 1
+    layers: list[list[Hashable]] = [[] for _ in range(depth)]
+    up: dict[Hashable, list[Hashable]] = {}
+    down: dict[Hashable, list[Hashable]] = {}
+    for n in nodes:
+        layers[layer_of[n]].append(n)
+    for u, v in edges:
+        prev: Hashable = u
+        for k in range(layer_of[u] + 1, layer_of[v]):
+            dummy = (u, v, k)
+            layers[k].append(dummy)
+            _link(up, down, prev, dummy)
+            prev = dummy
+        _link(up, down, prev, v)
+
+    signatures = [
+        frozenset([*layer, *((u, n) for n in layer for u in up.get(n, ()))])
+        for layer in layers
+    ]
+    start = 0
+    if previous is not None:
+        while (
+            start < depth
+            and start < len(previous.signatures)
+            and signatures[start] == previous.signatures[start]
+        ):
+            start += 1
+        if start == depth == len(previous.signatures):
+            return previous
+        # Keep the previous relative order of surviving nodes as the starting point.
+        rank = {n: i for layer in previous.layers for i, n in enumerate(layer)}
+        for k in range(depth):
+            if k < start:
+                layers[k] = list(previous.layers[k])
+            else:
+                layers[k].sort(key=lambda n: rank.get(n, len(rank)))
+
+    _reduce_crossings(layers, up, down, start)
+    x = {} if previous is None else {n: previous.x[n] for layer in layers[:start] for n in layer}
+    _assign_coordinates(layers, up, down, x, start)
+    shift = min(x.values(), default=0.0)
+    if shift:
+        x = {n: v - shift for n, v in x.items()}
+    return Layout(layers, x, signatures)
+
+
+def _link(up: dict, down: dict, u: Hashable, v: Hashable) -> None:
+    down.setdefault(u, []).append(v)
+    up.setdefault(v, []).append(u)
+
+
+def _reduce_crossings(layers: list[list[Hashable]], up: dict, down: dict, start: int) -> None:
+    """Reorder layers `start` and below in place with alternating barycenter sweeps."""
+    depth = len(layers)
+    pos = {n: i for layer in layers for i, n in enumerate(layer)}
+    first = max(start, 1)
+    best = [list(layer) for layer in layers[start:]]
+    best_crossings = _crossings(layers, down, pos, start)
+
+    for sweep in range(ORDERING_SWEEPS):
+        if best_crossings == 0:
+            break
+        if sweep % 2 == 0:
+            ks, neighbors = range(first, depth), up
+        else:
+            ks, neighbors = range(depth - 2, start - 1, -1), down
+        for k in ks:
+            layer = layers[k]
+            keys = {n: _barycenter(neighbors.get(n), pos, pos[n]) for n in layer}
+            layer.sort(key=keys.__getitem__)
+            for i, n in enumerate(layer):
+                pos[n] = i
+        crossings = _crossings(layers, down, pos, start)
+        if crossings < best_crossings:
+            best_crossings = crossings
+            best = [list(layer) for layer in layers[start:]]
+
+    layers[start:] = best
+
+
+def _barycenter(neighbors: list[Hashable] | None, pos: dict[Hashable, int], default: float) -> float:
+    if not neighbors:
+        return default
+    return sum(pos[n] for n in neighbors) / len(neighbors)
+
+
+def _crossings(layers: list[list[Hashable]], down: dict, pos: dict, start: int) -> int:
+    """Count the edge crossings between consecutive layers from `start - 1` on."""
+    total = 0
+    for k in range(max(start - 1, 0), len(layers) - 1):
+        targets = sorted(
+            (pos[u], pos[v]) for u in layers[k] for v in down.get(u, ())
+        )
+        total += _inversions([t for _, t in targets], len(layers[k + 1]))
+    return total
+
+
+def _inversions(values: list[int], size: int) -> int:
+    """Count pairs i < j with values[i] > values[j], with a Fenwick tree over [0, size)."""
+    tree = [0] * (size + 1)
+    count = 0
+    for seen, v in enumerate(values):
+        # Add the number of earlier values <= v, then subtract from the number seen.
+        i, le = v + 1, 0
+        while i > 0:
+            le += tree[i]
+            i -= i & -i
+        count += seen - le
+        i = v + 1
+        while i <= size:
+            tree[i] += 1
+            i += i & -i
+    return count
+
+
+def _assign_coordinates(
+    layers: list[list[Hashable]],
+    up: dict,
+    down: dict,
+    x: dict[Hashable, float],
+    start: int,
+) -> None:
+    """Place the nodes of layers `start` and below, pulling each towards the mean of its neighbors."""
+    depth = len(layers)
+    for k in range(start, depth):
+        for i, n in enumerate(layers[k]):
+            x[n] = i * NODE_GAP
+
+    for sweep in range(COORDINATE_SWEEPS):
+        if sweep % 2 == 0:
+            ks, neighbors = range(max(start, 1), depth), up
+        else:
+            ks, neighbors = range(depth - 2, start - 1, -1), down
+        for k in ks:
+            layer = layers[k]
+            desired = []
+            for n in layer:
+                adjacent = neighbors.get(n)
+                desired.append(sum(x[m] for m in adjacent) / len(adjacent) if adjacent else x[n])
+            for n, v in zip(layer, _pack(desired), strict=True):
+                x[n] = v
+
+
+def _pack(desired: list[float]) -> list[float]:
+    """Return the positions closest to `desired` that keep their order and are at least `NODE_GAP` apart."""
+    n = len(desired)
+    left = list(desired)
+    for i in range(1, n):
+        left[i] = max(left[i], left[i - 1] + NODE_GAP)
+    right = list(desired)
+    for i in range(n - 2, -1, -1):
+        right[i] = min(right[i], right[i + 1] - NODE_GAP)
+    return [(a + b) / 2 for a, b in zip(left, right, strict=True)]
+
+
+class LayoutCache:
+    """The latest layout of each course, keyed by the course version it was computed for.
+
+    A lookup with a new version recomputes the layout, reusing the previous one for the layers that did not change.
+    """
+
+    def __init__(self) -> None:
+        """Create an empty cache."""
+        self._entries: dict[str, tuple[Hashable, Layout]] = {}
+        self._lock = threading.Lock()
+        self.computed = 0
+
+    def __len__(self) -> int:
+        """Return the number of cached layouts."""
+        return len(self._entries)
+
+    def stats(self) -> dict[str, float]:
+        """Return a snapshot of the cache's counters."""
+        return {"entries": len(self._entries), "computed": self.computed}
+
+    def get(
+        self,
+        course_id: str,
+        version: Hashable,
+        nodes: Sequence[str],
+        edges: Sequence[tuple[str, str]],
+    ) -> Layout:
+        """Return the layout of a course graph, computing it if the cached one is for another version.
+
+        Args:
+            course_id (str): The ID of the course.
+            version (Hashable): The course version the graph belongs to.
+            nodes (Sequence[str]): The course's concepts, in topological order.
+            edges (Sequence[tuple[str, str]]): The prerequisite edges between them.
+
+        Returns:
+            Layout: The course's layout.
+        """
+        with self._lock:
+            entry = self._entries.get(course_id)
+        if entry is not None and entry[0] == version:
+            return entry[1]
+        layout = layered_layout(nodes, edges, entry[1] if entry is not None else None)
+        with self._lock:
+            self._entries[course_id] = (version, layout)
+            self.computed += 1
+        return layout
+
+    def discard(self, course_id: str) -> None:
+        """Remove the layout of a course, e.g. one whose last concept was removed."""
+        with self._lock:
+            self._entries.pop(course_id, None)
+
+    def retain(self, course_ids: Collection[str]) -> None:
+        """Remove the layouts of every course not in `course_ids`, e.g. after a reload dropped some courses."""
+        with self._lock:
+            self._entries = {c: entry for c, entry in self._entries.items() if c in course_ids}
+
+    def clear(self) -> None:
+        """Remove all layouts."""
+        with self._lock:
+            self._entries.clear()
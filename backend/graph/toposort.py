@@ -0,0 +1,187 @@
+"""Online topological ordering of the concept graph (Pearce–Kelly dynamic toposort)."""
+
+from __future__ import annotations
+
+from collections.abc import Hashable, Iterable, Sequence
+from typing import Any, Protocol
+
+import networkx as nx
+
+
+class CycleError(ValueError):
+    """Raised when a prerequisite edge would make the concept graph cyclic."""
+
+
+def check_acyclic(G: nx.DiGraph) -> None:
+    """Raise `CycleError` if the graph contains a directed cycle.
+
+    Args:
+        G (nx.DiGraph): The graph to check.
+
+    Raises:
+        CycleError: If `G` is not acyclic. The message names one offending cycle.
+    """
+    if not nx.is_directed_acyclic_graph(G):
+        cycle = [u for u, _ in nx.find_cycle(G)]
+        raise CycleError(
+            f"Prerequisite cycle found: {' -> '.join(map(str, [*cycle, cycle[0]]))}",
+        )
+
+
+def topological_order(predecessors: Sequence[Iterable[int]]) -> list[int]:
+    """Sort the nodes `0..n-1` of a small DAG topologically (Kahn's algorithm).
+
+    Args:
+        predecessors (Sequence[Iterable[int]]): The predecessors of each node.
+
+    Returns:
+        list[int]: The nodes in topological order; roots come first, in numeric order.
+
+    Raises:
+        CycleError: If the graph is not acyclic.
+    """
+    remaining = [0] * len(predecessors)
+    successors: list[list[int]] = [[] for _ in predecessors]
+    for i, ps in enumerate(predecessors):
+        for p in ps:
+            successors[p].append(i)
+            remaining[i] += 1
+    order = [i for i, count in enumerate(remaining) if not count]
+    # The list grows while it is scanned: each node is appended once all of its predecessors were.
+    for i in order:
+        for j in successors[i]:
+            remaining[j] -= 1
+            if not remaining[j]:
+                order.append(j)
+    if len(order) < len(predecessors):
+        raise CycleError("Graph contains a cycle")
+    return order
+
+
+class Adjacency(Protocol):
+    """The read-only view of a directed graph that the incremental structures traverse; `nx.DiGraph` provides it."""
+
+    def successors(self, node: Any) -> Iterable[Any]:
+        """Return the nodes that `node` has an edge to."""
+        ...
+
+    def predecessors(self, node: Any) -> Iterable[Any]:
+        """Return the nodes that have an edge to `node`."""
+        ...
+
+
+class IncrementalTopologicalOrder:
+    """A topological order of a DAG that is maintained as edges are inserted.
+
+    Implements the Pearce–Kelly algorithm: each node has an integer position, and inserting an edge `u -> v` that violates the order only searches and reorders the nodes whose positions lie between `v` and `u`. A cycle-creating edge is detected inside that same region, so it is rejected without touching the rest of the graph.
+
+    The order never changes the graph it wraps: the caller applies every change to the graph and mirrors it with `add_node`/`add_edge`/`remove_node`. An edge must be inserted into the graph only after `add_edge` accepted it; removing an edge never invalidates a topological order.
+    """
+
+    def __init__(self, G: Adjacency, order: Iterable[Hashable] | None = None) -> None:
+        """Compute the initial order of a DAG.
+
+        Args:
+            G (Adjacency): The graph to order. It is referenced, not copied.
+            order (Iterable[Hashable] | None, optional): A known topological order of every node of `G`, e.g. from a catalog snapshot. It is trusted, not checked. Defaults to None, which sorts `G`, then an `nx.DiGraph`.
+
+        Raises:
+            CycleError: If `G` is not acyclic.
+        """
+        self._G = G
+        try:
+            self._ord: dict[Hashable, int] = {
+                n: i for i, n in enumerate(nx.topological_sort(G) if order is None else order)
+            }
+        except nx.NetworkXUnfeasible as err:
+            raise CycleError("Concept graph contains a cycle") from err
+        self._next = len(self._ord)
+
+    def copy(self, G: Adjacency) -> IncrementalTopologicalOrder:
+        """Return an independent copy of the order that wraps `G`, a copy of the graph about to be edited."""
+        order = IncrementalTopologicalOrder.__new__(IncrementalTopologicalOrder)
+        order._G = G
+        order._ord = dict(self._ord)
+        order._next = self._next
+        return order
+
+    def __contains__(self, node: Hashable) -> bool:
+        """Return True if the node is ordered."""
+        return node in self._ord
+
+    def position(self, node: Hashable) -> int:
+        """Return the node's position; positions increase along every edge but are not contiguous."""
+        return self._ord[node]
+
+    def order(self) -> list[Hashable]:
+        """Return all nodes in topological order."""
+        return sorted(self._ord, key=self._ord.__getitem__)
+
+    def add_node(self, node: Hashable) -> None:
+        """Place a newly added node after every existing node."""
+        if node not in self._ord:
+            self._ord[node] = self._next
+            self._next += 1
+
+    def remove_node(self, node: Hashable) -> None:
+        """Forget a node that was removed from the graph."""
+        self._ord.pop(node, None)
+
+    def add_edge(self, u: Hashable, v: Hashable) -> int:
+        """Reorder the nodes so that the edge `u -> v` can be inserted into the graph.
+
+        Args:
+            u (Hashable): The source node (prerequisite).
+            v (Hashable): The target node (dependent).
+
+        Returns:
+            int: The number of nodes whose positions were reassigned.
+
+        Raises:
+            CycleError: If the edge would create a cycle. The order is left unchanged.
+        """
+        if u == v:
+            raise CycleError(f"{u} cannot be a prerequisite of itself")
+
+        lower, upper = self._ord[v], self._ord[u]
+        if lower > upper:
+            return 0
+        forward = self._search_forward(v, upper, u)
+        backward = self._search_backward(u, lower)
+        return self._reorder(backward, forward)
+
+    def _search_forward(self, start: Hashable, upper: int, target: Hashable) -> list:
+        visited = {start}
+        stack = [start]
+        while stack:
+            n = stack.pop()
+            for w in self._G.successors(n):
+                if w == target:
+                    raise CycleError(
+                        f"Adding {target} -> {start} would create a prerequisite cycle",
+                    )
+                if w not in visited and self._ord[w] < upper:
+                    visited.add(w)
+                    stack.append(w)
+        return list(visited)
+
+    def _search_backward(self, start: Hashable, lower: int) -> list:
+        visited = {start}
+        stack = [start]
+        while stack:
+            n = stack.pop()
+            for w in self._G.predecessors(n):
+                if w not in visited and self._ord[w] > lower:
+                    visited.add(w)
+                    stack.append(w)
+        return list(visited)
+
+    def _reorder(self, backward: list, forward: list) -> int:
+        key = self._ord.__getitem__
+        backward.sort(key=key)
+        forward.sort(key=key)
+        nodes = backward + forward
+        slots = sorted(self._ord[n] for n in nodes)
+        for n, slot in zip(nodes, slots, strict=True):
+            self._ord[n] = slot
+        return len(nodes)
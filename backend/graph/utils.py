@@ -8,6 +8,8 @@ import networkx as nx
 def get_course_subgraph(G: nx.DiGraph, course_id: str) -> nx.DiGraph:
     """Return a subgraph containing only the concepts for a given course.
 
+    This scans every node of `G`, so it costs time proportional to the whole catalog; the serving path and benchmarks look courses up in `Catalog.compact` instead.
+
     Args:
         G (nx.DiGraph): The full concept dependency graph.
         course_id (str): The ID of the course for which to extract the subgraph.
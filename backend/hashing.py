@@ -0,0 +1,129 @@
+"""Password hashing service that runs argon2 off the event loop in a bounded process pool."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter
+from typing import TypeVar
+
+from pwdlib import PasswordHash
+
+T = TypeVar("T")
+
+password_hash = PasswordHash.recommended()
+
+
+def _hash(password: str) -> str:
+    return password_hash.hash(password)
+
+
+def _verify(password: str, hashed_password: str) -> bool:
+    return password_hash.verify(password, hashed_password)
+
+
+class HashingOverloadedError(RuntimeError):
+    """Raised when the hashing queue is full and a request must be shed."""
+
+
+class PasswordHashingService:
+    """Async front end to a process pool that hashes and verifies passwords.
+
+    At most `max_workers` jobs run at once and at most `max_queue` more may wait for a worker; anything beyond that is rejected immediately with `HashingOverloadedError` instead of queueing without bound. Latency is only recorded for completed jobs; jobs that raise or are cancelled count as failed. All counters are updated on the event loop thread, so no locking is needed.
+    """
+
+    def __init__(self, max_workers: int | None = None, max_queue: int = 64) -> None:
+        """Create the service. The process pool is started lazily on first use.
+
+        Args:
+            max_workers (int | None, optional): Number of worker processes. Defaults to the number of CPU cores.
+            max_queue (int, optional): Number of jobs allowed to wait for a free worker. Defaults to 64.
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_queue = max_queue
+        self._executor: ProcessPoolExecutor | None = None
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        """Return the number of jobs waiting for a free worker."""
+        return max(0, self.in_flight - self.max_workers)
+
+    def stats(self) -> dict[str, float]:
+        """Return a snapshot of the service's queue and latency metrics."""
+        return {
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "avg_latency_seconds": self.total_latency / self.completed if self.completed else 0.0,
+            "max_latency_seconds": self.max_latency,
+        }
+
+    async def hash(self, password: str) -> str:
+        """Hash a plaintext password.
+
+        Args:
+            password (str): The plaintext password to hash.
+
+        Returns:
+            str: The securely hashed password.
+
+        Raises:
+            HashingOverloadedError: If the queue is full.
+        """
+        return await self._run(_hash, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        """Verify a plaintext password against its hashed version.
+
+        Args:
+            password (str): The plaintext password to verify.
+            hashed_password (str): The stored hashed password.
+
+        Returns:
+            bool: True if the password is valid, False otherwise.
+
+        Raises:
+            HashingOverloadedError: If the queue is full.
+        """
+        return await self._run(_verify, password, hashed_password)
+
+    def shutdown(self) -> None:
+        """Stop the worker processes, if they were started."""
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+    async def _run(self, fn: Callable[..., T], *args: str) -> T:
+        if self.in_flight >= self.max_workers + self.max_queue:
+            self.rejected += 1
+            raise HashingOverloadedError("Password hashing queue is full")
+
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+
+        self.in_flight += 1
+        start = perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self._executor, fn, *args)
+        except BaseException:
+            # Errors and cancellations would skew the latency of completed jobs.
+            self.failed += 1
+            raise
+        finally:
+            self.in_flight -= 1
+        latency = perf_counter() - start
+        self.completed += 1
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+        return result
@@ -0,0 +1,241 @@
+"""Streaming ingestion of catalog exports in JSONL (NDJSON) format.
+
+Concepts are read in chunks of lines and each chunk is validated in one call to a pydantic `TypeAdapter`, straight from JSON text into `Concept` models, so no intermediate dicts are kept around. Chunks can optionally be validated across a process pool. Errors from every chunk are collected, prerequisites are resolved across the whole stream, and everything is reported at once.
+
+Usage:
+    python -m backend.ingest concepts.jsonl [--courses courses.jsonl] [--workers N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import TypeVar
+
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+from backend.models.concepts import Concept
+from backend.models.courses import Course
+
+M = TypeVar("M", bound=BaseModel)
+
+DEFAULT_BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 100
+
+
+class IngestError(ValueError):
+    """Raised when an export contains invalid records; lists every problem found."""
+
+    def __init__(self, errors: list[str]) -> None:
+        """Create the error from a list of problem descriptions."""
+        self.errors = errors
+        shown = "\n".join(errors[:MAX_REPORTED_ERRORS])
+        more = len(errors) - MAX_REPORTED_ERRORS
+        super().__init__(
+            f"{len(errors)} invalid record(s):\n{shown}"
+            + (f"\n... and {more} more" if more > 0 else ""),
+        )
+
+
+def iter_batches(path: Path, batch_size: int) -> Iterator[tuple[list[str], list[int]]]:
+    """Read a JSONL file in batches of non-blank lines.
+
+    Args:
+        path (Path): The file to read.
+        batch_size (int): The number of records per batch.
+
+    Yields:
+        tuple[list[str], list[int]]: The lines of a batch and their 1-based line numbers in the file.
+    """
+    with path.open(encoding="utf-8") as f:
+        numbered = ((line, n) for n, line in enumerate(f, start=1) if line.strip())
+        while batch := list(islice(numbered, batch_size)):
+            lines, numbers = zip(*batch, strict=True)
+            yield list(lines), list(numbers)
+
+
+def validate_batch(
+    model: type[M],
+    lines: list[str],
+    line_numbers: list[int],
+) -> tuple[list[M], list[str]]:
+    """Validate a batch of JSON lines into models.
+
+    The whole batch is validated in a single `TypeAdapter` call; only if that fails are the lines revalidated one by one to keep the valid records and locate the bad ones.
+
+    Args:
+        model (type[M]): The model to validate into.
+        lines (list[str]): One JSON object per line.
+        line_numbers (list[int]): The file line number of each entry in `lines`.
+
+    Returns:
+        tuple[list[M], list[str]]: The valid records, and a description of each invalid one.
+    """
+    try:
+        return _adapter(model).validate_json(f"[{','.join(lines)}]"), []
+    except ValidationError:
+        pass
+
+    records: list[M] = []
+    errors: list[str] = []
+    for n, line in zip(line_numbers, lines, strict=True):
+        try:
+            records.append(model.model_validate_json(line))
+        except ValidationError as err:
+            for e in err.errors():
+                loc = ".".join(str(part) for part in e["loc"])
+                errors.append(f"line {n}: {loc + ': ' if loc else ''}{e['msg']}")
+    return records, errors
+
+
+def load_records(
+    path: Path,
+    model: type[M],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    workers: int = 0,
+) -> tuple[list[M], list[str]]:
+    """Stream a JSONL file and validate every record.
+
+    Args:
+        path (Path): The file to read.
+        model (type[M]): The model to validate into.
+        batch_size (int, optional): The number of records per batch. Defaults to 1000.
+        workers (int, optional): The number of worker processes to validate batches in; 0 validates in this process. Defaults to 0.
+
+    Returns:
+        tuple[list[M], list[str]]: The valid records in file order, and a description of each invalid one.
+    """
+    records: list[M] = []
+    errors: list[str] = []
+    batches = _validate_batches(path, model, batch_size, workers)
+    for batch_records, batch_errors in batches:
+        records.extend(batch_records)
+        errors.extend(batch_errors)
+    return records, errors
+
+
+def check_references(
+    concepts: Iterable[Concept],
+    courses: Iterable[Course] | None = None,
+) -> list[str]:
+    """Check IDs and prerequisites across the whole catalog.
+
+    Args:
+        concepts (Iterable[Concept]): Every concept of the catalog.
+        courses (Iterable[Course] | None, optional): Every course of the catalog; if given, each concept's course must exist. Defaults to None.
+
+    Returns:
+        list[str]: A description of each duplicate ID and dangling reference.
+    """
+    concepts = list(concepts)
+    errors: list[str] = []
+    ids: set[str] = set()
+    for c in concepts:
+        if c.id in ids:
+            errors.append(f"concept {c.id}: duplicate ID")
+        ids.add(c.id)
+
+    course_ids = {c.id for c in courses} if courses is not None else None
+    for c in concepts:
+        errors.extend(
+            f"concept {c.id}: prerequisite {p} not found"
+            for p in c.prerequisites
+            if p not in ids
+        )
+        if course_ids is not None and c.course_id not in course_ids:
+            errors.append(f"concept {c.id}: course {c.course_id} not found")
+    return errors
+
+
+def load_catalog(
+    concepts_path: Path,
+    courses_path: Path,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    workers: int = 0,
+) -> tuple[list[Concept], list[Course]]:
+    """Load and validate a full catalog export, ready for `Catalog`/`build_graph`.
+
+    Args:
+        concepts_path (Path): The JSONL file of concepts.
+        courses_path (Path): The JSONL file of courses. Embedded course concept lists are dropped, since `Catalog` resolves them from the concepts.
+        batch_size (int, optional): The number of records per batch. Defaults to 1000.
+        workers (int, optional): The number of worker processes to validate batches in. Defaults to 0.
+
+    Returns:
+        tuple[list[Concept], list[Course]]: The validated concepts and courses.
+
+    Raises:
+        IngestError: If any record is invalid or references a missing concept or course.
+    """
+    concepts, errors = load_records(concepts_path, Concept, batch_size, workers)
+    courses, course_errors = load_records(courses_path, Course, batch_size)
+    errors += [f"{courses_path.name} {e}" for e in course_errors]
+    courses = [c.model_copy(update={"concepts": []}) for c in courses]
+    errors += check_references(concepts, courses)
+    if errors:
+        raise IngestError(errors)
+    return concepts, courses
+
+
+def _validate_batches(
+    path: Path,
+    model: type[M],
+    batch_size: int,
+    workers: int,
+) -> Iterator[tuple[list[M], list[str]]]:
+    batches = iter_batches(path, batch_size)
+    if workers <= 0:
+        for lines, numbers in batches:
+            yield validate_batch(model, lines, numbers)
+        return
+
+    # Keep a bounded number of batches in flight so memory stays flat however large the file is.
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: list[Future] = []
+        for lines, numbers in batches:
+            pending.append(pool.submit(validate_batch, model, lines, numbers))
+            if len(pending) >= 2 * workers:
+                yield pending.pop(0).result()
+        for future in pending:
+            yield future.result()
+
+
+_adapters: dict[type, TypeAdapter] = {}
+
+
+def _adapter(model: type[M]) -> TypeAdapter[list[M]]:
+    adapter = _adapters.get(model)
+    if adapter is None:
+        adapter = _adapters[model] = TypeAdapter(list[model])  # type: ignore[valid-type]
+    return adapter
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Validate a catalog export from the command line and report every problem."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("concepts", type=Path, help="JSONL file of concepts")
+    parser.add_argument("--courses", type=Path, help="JSONL file of courses")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--workers", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    concepts, errors = load_records(args.concepts, Concept, args.batch_size, args.workers)
+    courses = None
+    if args.courses:
+        courses, course_errors = load_records(args.courses, Course, args.batch_size)
+        errors += [f"{args.courses.name} {e}" for e in course_errors]
+    errors += check_references(concepts, courses)
+
+    if errors:
+        print(IngestError(errors), file=sys.stderr)
+        return 1
+    print(f"{len(concepts)} concepts OK" + (f", {len(courses)} courses OK" if courses else ""))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
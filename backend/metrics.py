@@ -0,0 +1,306 @@
+"""Lightweight request metrics: counters, gauges, histograms, timing spans and Prometheus text output.
+
+`MetricsMiddleware` records per-route latency histograms, status counters and an in-flight gauge for every HTTP request. Code inside a request can wrap expensive steps in `span("name")`; span durations are added to a per-span histogram and reported back to the client in a `Server-Timing` header. Everything is in-process and lock-light so it can stay enabled in production.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import Callable, Iterator, Mapping, Sequence
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TypeVar
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Labels = tuple[str, ...]
+M = TypeVar("M", bound="_Metric")
+
+
+def _format_labels(names: Sequence[str], values: Labels, extra: str = "") -> str:
+    pairs = [
+        f'{n}="{v.replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+        for n, v in zip(names, values, strict=True)
+    ]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class _Metric:
+    type_name = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def render(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type_name}"]
+
+
+class Counter(_Metric):
+    """A monotonically increasing count, optionally split by labels."""
+
+    type_name = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()) -> None:
+        """Create a counter; see `Registry.counter`."""
+        super().__init__(name, help, labelnames)
+        self._values: dict[Labels, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        """Increase the count for a label combination."""
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels: str) -> float:
+        """Return the count for a label combination."""
+        return self._values.get(labels, 0)
+
+    def render(self) -> list[str]:
+        """Return the metric in Prometheus text format."""
+        lines = super().render()
+        for labels, value in sorted(self._values.items()):
+            lines.append(
+                f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}",
+            )
+        return lines
+
+
+class Gauge(Counter):
+    """A value that can go up and down."""
+
+    type_name = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        """Decrease the value for a label combination."""
+        self.inc(*labels, amount=-amount)
+
+    def set(self, *labels: str, value: float) -> None:
+        """Set the value for a label combination."""
+        with self._lock:
+            self._values[labels] = value
+
+
+class StatsGauges(_Metric):
+    """A family of gauges read from a `stats()` snapshot each time metrics are rendered.
+
+    Each key of the snapshot becomes its own gauge named `<name>_<key>`, so services that already keep counters (the hashing pool, session and response caches) can be exported without touching their hot paths.
+    """
+
+    type_name = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        callback: Callable[[], Mapping[str, float]],
+    ) -> None:
+        """Create a stats gauge family; see `Registry.stats`."""
+        super().__init__(name, help)
+        self._callback = callback
+
+    def render(self) -> list[str]:
+        """Return the metrics in Prometheus text format."""
+        lines = []
+        for key, value in self._callback().items():
+            name = f"{self.name}_{key}"
+            lines += [
+                f"# HELP {name} {self.help} ({key.replace('_', ' ')})",
+                f"# TYPE {name} gauge",
+                f"{name} {_format_value(value)}",
+            ]
+        return lines
+
+
+class Histogram(_Metric):
+    """A distribution of observed values over fixed buckets, optionally split by labels."""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        """Create a histogram; see `Registry.histogram`."""
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label combination: one count per bucket (plus +Inf), then the sum.
+        self._series: dict[Labels, list[float]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        """Record one observation for a label combination."""
+        i = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0.0] * (len(self.buckets) + 2)
+            series[i] += 1
+            series[-1] += value
+
+    def count(self, *labels: str) -> int:
+        """Return the number of observations for a label combination."""
+        series = self._series.get(labels)
+        return int(sum(series[:-1])) if series else 0
+
+    def render(self) -> list[str]:
+        """Return the metric in Prometheus text format."""
+        lines = super().render()
+        bounds = [*(repr(b) for b in self.buckets), "+Inf"]
+        for labels, series in sorted(self._series.items()):
+            cumulative = 0.0
+            for bound, count in zip(bounds, series[:-1], strict=True):
+                cumulative += count
+                le = _format_labels(self.labelnames, labels, f'le="{bound}"')
+                lines.append(f"{self.name}_bucket{le} {_format_value(cumulative)}")
+            suffix = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{suffix} {_format_value(series[-1])}")
+            lines.append(f"{self.name}_count{suffix} {_format_value(cumulative)}")
+        return lines
+
+
+class Registry:
+    """A collection of metrics that renders them all in Prometheus text format."""
+
+    def __init__(self) -> None:
+        """Create an empty registry."""
+        self._metrics: dict[str, _Metric] = {}
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Create and register a counter."""
+        return self._register(Counter(name, help, labelnames))
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Gauge:
+        """Create and register a gauge."""
+        return self._register(Gauge(name, help, labelnames))
+
+    def stats(
+        self,
+        name: str,
+        help: str,
+        callback: Callable[[], Mapping[str, float]],
+    ) -> StatsGauges:
+        """Create and register gauges that read their values from a `stats()` callback."""
+        return self._register(StatsGauges(name, help, callback))
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        """Create and register a histogram."""
+        return self._register(Histogram(name, help, labelnames, buckets))
+
+    def render(self) -> str:
+        """Return every registered metric in Prometheus text exposition format."""
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def _register(self, metric: M) -> M:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+
+REGISTRY = Registry()
+
+REQUEST_LATENCY = REGISTRY.histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route.",
+    ("method", "route"),
+)
+REQUESTS = REGISTRY.counter(
+    "http_requests_total",
+    "HTTP requests by route and status code.",
+    ("method", "route", "status"),
+)
+IN_FLIGHT = REGISTRY.gauge("http_requests_in_flight", "HTTP requests being served.")
+SPAN_LATENCY = REGISTRY.histogram(
+    "span_duration_seconds",
+    "Duration of named timing spans inside requests.",
+    ("span",),
+)
+
+_spans: ContextVar[list[tuple[str, float]] | None] = ContextVar("spans", default=None)
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Time a named step of the current request.
+
+    The duration is recorded in `span_duration_seconds` and, inside a request handled by `MetricsMiddleware`, reported in the `Server-Timing` response header.
+
+    Args:
+        name (str): The span name, e.g. "auth" or "serialize".
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        SPAN_LATENCY.observe(elapsed, name)
+        spans = _spans.get()
+        if spans is not None:
+            spans.append((name, elapsed))
+
+
+def server_timing(spans: list[tuple[str, float]]) -> bytes:
+    """Format recorded spans as a `Server-Timing` header value."""
+    return ", ".join(f"{name};dur={elapsed * 1e3:.3f}" for name, elapsed in spans).encode()
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency, status and in-flight metrics per route."""
+
+    def __init__(self, app: Callable) -> None:
+        """Wrap an ASGI app."""
+        self.app = app
+
+    async def __call__(self, scope: dict, receive: Callable, send: Callable) -> None:
+        """Handle one ASGI connection."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        spans: list[tuple[str, float]] = []
+        token = _spans.set(spans)
+        status = 500
+        start = time.perf_counter()
+
+        async def send_with_timing(message: dict) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if spans:
+                    message["headers"] = [
+                        *message.get("headers", []),
+                        (b"server-timing", server_timing(spans)),
+                    ]
+            await send(message)
+
+        IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            IN_FLIGHT.dec()
+            _spans.reset(token)
+            route = getattr(scope.get("route"), "path", "unmatched")
+            method = scope["method"]
+            REQUEST_LATENCY.observe(time.perf_counter() - start, method, route)
+            REQUESTS.inc(method, route, str(status))
@@ -0,0 +1,11 @@
+"""Data models for the catalog as a whole."""
+
+from pydantic import BaseModel
+
+
+class CatalogInfo(BaseModel):
+    """Represents the catalog version a worker process is serving."""
+
+    version: int
+    concepts: int
+    courses: int
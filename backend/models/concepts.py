@@ -1,6 +1,8 @@
 """Data models for concepts in courses."""
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+MAX_BATCH_SIZE = 100
 
 
 class Concept(BaseModel):
@@ -12,3 +14,33 @@ class Concept(BaseModel):
     course_id: str
     prerequisites: list[str]
     content: str
+
+
+class LearningPath(BaseModel):
+    """Represents everything a learner needs to study before a concept."""
+
+    concept_id: str
+    prerequisites: list[Concept]
+
+
+class PrerequisiteCheck(BaseModel):
+    """Represents whether one concept must be studied before another."""
+
+    concept_id: str
+    prereq_id: str
+    is_prerequisite: bool
+
+
+class ConceptBatchRequest(BaseModel):
+    """Represents a request for many concepts at once."""
+
+    ids: list[str] = Field(min_length=1, max_length=MAX_BATCH_SIZE)
+    fields: list[str] = []
+
+
+class ConceptBatch(BaseModel):
+    """Represents the concepts found for a batch of IDs, in request order, and the IDs that were not found."""
+
+    items: list[Concept]
+    not_found: list[str]
+
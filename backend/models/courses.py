@@ -11,4 +11,20 @@ class Course(BaseModel):
     id: str
     name: str
     description: str
-    concepts: list[Concept]
+    concepts: list[Concept] = []
+
+
+class CourseSummary(BaseModel):
+    """Represents the lightweight listing form of a course."""
+
+    id: str
+    name: str
+    description: str
+    concept_count: int
+
+
+class CoursePage(BaseModel):
+    """Represents one page of the course listing."""
+
+    items: list[CourseSummary]
+    next_cursor: str | None = None
@@ -1,8 +1,12 @@
 """Data models for course graphs."""
 
+from collections.abc import Sequence
+
 import networkx as nx
 from pydantic import BaseModel
 
+from backend.graph.compact import CompactGraph
+from backend.graph.layout import Layout
 from backend.models.concepts import Concept
 
 
@@ -20,12 +24,62 @@ class ConceptEdge(BaseModel):
     target: str
 
 
+class NodePosition(BaseModel):
+    """Represents where a concept is drawn in a course graph layout."""
+
+    id: str
+    layer: int
+    x: float
+    y: float
+
+
+class EdgeRoute(BaseModel):
+    """Represents the bend points of an edge that spans more than one layer."""
+
+    source: str
+    target: str
+    points: list[tuple[float, float]]
+
+
+class GraphLayout(BaseModel):
+    """Represents a layered layout of a course graph, in units of the gap between nodes and between layers."""
+
+    width: float
+    height: float
+    nodes: list[NodePosition]
+    routes: list[EdgeRoute]
+
+    @classmethod
+    def from_layout(cls, layout: Layout, edges: list[tuple[str, str]]) -> "GraphLayout":
+        """Convert a computed layout into its response form.
+
+        Args:
+            layout (Layout): The layout of the course graph.
+            edges (list[tuple[str, str]]): The edges of the course graph.
+
+        Returns:
+            GraphLayout: The position of every concept, and the bend points of every edge that skips a layer.
+        """
+        nodes = [
+            NodePosition(id=node_id, layer=layer, x=x, y=y)
+            for node_id, layer, x, y in layout.positions()
+        ]
+        layer_of = {node.id: node.layer for node in nodes}
+        routes = [
+            EdgeRoute(source=u, target=v, points=layout.bends(u, v, layer_of[u], layer_of[v]))
+            for u, v in edges
+            if layer_of[v] - layer_of[u] > 1
+        ]
+        return cls(width=layout.width, height=layout.height, nodes=nodes, routes=routes)
+
+
 class CourseGraph(BaseModel):
-    """Represents a course as a graph of concepts."""
+    """Represents a course as a graph of concepts, optionally with a precomputed layout."""
 
     course_id: str
     nodes: list[ConceptNode]
     links: list[ConceptEdge]
+    layout: GraphLayout | None = None
 
     @classmethod
     def from_networkx(cls, course_id: str, G: nx.DiGraph) -> "CourseGraph":
@@ -44,3 +98,144 @@ class CourseGraph(BaseModel):
         ]
         links = [ConceptEdge(source=u, target=v) for u, v in G.edges()]
         return cls(course_id=course_id, nodes=nodes, links=links)
+
+    @classmethod
+    def from_compact(cls, course_id: str, G: CompactGraph) -> "CourseGraph":
+        """Build a CourseGraph for one course from a compact graph, without going through networkx.
+
+        Args:
+            course_id (str): The ID of the course.
+            G (CompactGraph): The compact form of the concept graph.
+
+        Returns:
+            CourseGraph: The course's concepts in topological order and the prerequisite edges between them.
+        """
+        course = G.course(course_id)
+        if course is None:
+            return cls(course_id=course_id, nodes=[], links=[])
+        return cls.from_subgraph(course_id, course.concepts, course.edges())
+
+    @classmethod
+    def from_subgraph(
+        cls,
+        course_id: str,
+        concepts: Sequence[Concept],
+        edges: list[tuple[str, str]],
+        layout: Layout | None = None,
+    ) -> "CourseGraph":
+        """Build a CourseGraph from a course's concepts and the edges between them, e.g. those of a `CompactCourse`.
+
+        Args:
+            course_id (str): The ID of the course.
+            concepts (Sequence[Concept]): The course's concepts.
+            edges (list[tuple[str, str]]): The prerequisite edges between them.
+            layout (Layout | None, optional): A layout of the subgraph to include. Defaults to None.
+
+        Returns:
+            CourseGraph: The course's concepts and edges, with the layout if one was given.
+        """
+        nodes = [ConceptNode(id=c.id, concept=c) for c in concepts]
+        links = [ConceptEdge(source=u, target=v) for u, v in edges]
+        return cls(
+            course_id=course_id,
+            nodes=nodes,
+            links=links,
+            layout=GraphLayout.from_layout(layout, edges) if layout is not None else None,
+        )
+
+
+class GraphLayer(BaseModel):
+    """Represents one topological layer of a course graph."""
+
+    index: int
+    nodes: list[ConceptNode]
+
+
+class CourseGraphPage(BaseModel):
+    """Represents a page of consecutive layers of a course graph.
+
+    `links` holds every edge into this page's concepts, so a client that has loaded the earlier pages has all edges between loaded concepts.
+    """
+
+    course_id: str
+    layers: list[GraphLayer]
+    links: list[ConceptEdge]
+    next_cursor: str | None = None
+
+    @classmethod
+    def from_compact(
+        cls,
+        course_id: str,
+        G: CompactGraph,
+        start: int,
+        max_nodes: int,
+    ) -> "CourseGraphPage":
+        """Build the page of a course graph that starts at a given layer.
+
+        Args:
+            course_id (str): The ID of the course.
+            G (CompactGraph): The compact form of the concept graph.
+            start (int): The index of the first layer of the page.
+            max_nodes (int): The page holds whole layers up to this many concepts, and at least one layer.
+
+        Returns:
+            CourseGraphPage: The page, with a cursor to the next one if there are more layers.
+        """
+        course = G.course(course_id)
+        if course is None:
+            return cls(course_id=course_id, layers=[], links=[])
+        layers = course.layers()
+        ids, concepts = course.ids, course.concepts
+        page: list[GraphLayer] = []
+        links: list[ConceptEdge] = []
+        count = 0
+        end = start
+        while end < len(layers) and (not page or count + len(layers[end]) <= max_nodes):
+            members = layers[end]
+            page.append(
+                GraphLayer(
+                    index=end,
+                    nodes=[ConceptNode(id=ids[i], concept=concepts[i]) for i in members],
+                )
+            )
+            links.extend(
+                ConceptEdge(source=ids[j], target=ids[i])
+                for i in members
+                for j in course.in_neighbors(i)
+            )
+            count += len(members)
+            end += 1
+        next_cursor = str(end) if end < len(layers) else None
+        return cls(course_id=course_id, layers=page, links=links, next_cursor=next_cursor)
+
+
+class ConceptNeighborhood(BaseModel):
+    """Represents the concepts within a few prerequisite and dependent hops of a concept, across courses."""
+
+    concept_id: str
+    nodes: list[ConceptNode]
+    links: list[ConceptEdge]
+    truncated: bool = False
+
+    @classmethod
+    def from_subgraph(
+        cls,
+        concept_id: str,
+        concepts: Sequence[Concept],
+        edges: list[tuple[str, str]],
+        truncated: bool,
+    ) -> "ConceptNeighborhood":
+        """Build a neighborhood from the concepts and edges extracted with `Catalog.neighborhood`.
+
+        Args:
+            concept_id (str): The ID of the center concept.
+            concepts (Sequence[Concept]): The neighborhood's concepts, in topological order.
+            edges (list[tuple[str, str]]): The prerequisite edges between them.
+            truncated (bool): Whether the expansion was cut short.
+
+        Returns:
+            ConceptNeighborhood: The neighborhood's concepts and the edges between them.
+        """
+        nodes = [ConceptNode(id=c.id, concept=c) for c in concepts]
+        links = [ConceptEdge(source=u, target=v) for u, v in edges]
+        return cls(concept_id=concept_id, nodes=nodes, links=links, truncated=truncated)
@@ -0,0 +1,24 @@
+"""Data models for the request profiler."""
+
+from pydantic import BaseModel, Field
+
+
+class ProfilerSettings(BaseModel):
+    """Represents which live requests the profiler samples.
+
+    A request is profiled when it is one in `every`, or matches `route` or carries `header`; all set criteria are alternatives.
+    """
+
+    every: int | None = Field(default=None, ge=1)
+    route: str | None = None
+    header: str | None = None
+    interval_ms: float = Field(default=5.0, gt=0, le=1000)
+
+
+class ProfilerStatus(BaseModel):
+    """Represents the profiler's current settings and how much it has collected."""
+
+    enabled: bool
+    settings: ProfilerSettings | None = None
+    profiled_requests: int
+    samples: int
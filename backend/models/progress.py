@@ -0,0 +1,19 @@
+"""Data models for learner progress."""
+
+from pydantic import BaseModel
+
+
+class Completion(BaseModel):
+    """Represents a concept a learner completed and the concepts that completing it unlocked."""
+
+    concept_id: str
+    unlocked: list[str]
+
+
+class CourseFrontier(BaseModel):
+    """Represents a learner's progress through a course and the concepts they can study next."""
+
+    course_id: str
+    completed: int
+    total: int
+    frontier: list[str]
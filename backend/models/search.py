@@ -0,0 +1,20 @@
+"""Data models for concept search."""
+
+from pydantic import BaseModel
+
+
+class SearchHit(BaseModel):
+    """Represents a concept matching a search query."""
+
+    id: str
+    name: str
+    description: str
+    course_id: str
+    score: float
+
+
+class SearchResults(BaseModel):
+    """Represents the ranked results of a search query."""
+
+    query: str
+    items: list[SearchHit]
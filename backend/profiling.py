@@ -0,0 +1,271 @@
+"""Opt-in sampling profiler for live requests.
+
+While profiling is enabled, `ProfilingMiddleware` selects requests (one in N, by route template, or by request header) and a background thread samples the Python stacks of the threads working on them every few milliseconds: the event loop thread, but only while the selected request's own coroutines are running on it, and the worker thread running a sync endpoint, whose routes `ProfiledRoute` wraps. Concurrent requests that were not selected are left out of the profile. Samples are aggregated as collapsed stacks (`frame;frame;frame count`), the input format of flamegraph.pl and speedscope.
+
+Profiling is off by default; the middleware then costs a single attribute check per request and the sampler thread is not started.
+"""
+
+from __future__ import annotations
+
+import functools
+import inspect
+import itertools
+import sys
+import threading
+from collections import Counter
+from collections.abc import Callable
+from contextvars import ContextVar
+from types import FrameType
+from typing import Any
+
+from fastapi.routing import APIRoute
+from starlette.routing import Match
+
+from backend.models.profiling import ProfilerSettings, ProfilerStatus
+
+# Threads whose innermost frame is in one of these modules are waiting, not working.
+IDLE_MODULES = frozenset({"threading", "selectors", "queue", "asyncio.base_events"})
+MAX_STACK_DEPTH = 128
+
+# The sampler profiling the current request, if it was selected; copied into the worker threads it hands sync work to.
+_current_sampler: ContextVar[StackSampler | None] = ContextVar("current_sampler", default=None)
+
+
+def collapse_stack(frame: FrameType | None) -> str:
+    """Render a stack as `module:function` frames from the outermost to the innermost, separated by semicolons."""
+    frames: list[str] = []
+    while frame is not None and len(frames) < MAX_STACK_DEPTH:
+        code = frame.f_code
+        module = frame.f_globals.get("__name__", "?")
+        frames.append(f"{module}:{getattr(code, 'co_qualname', code.co_name)}")
+        frame = frame.f_back
+    return ";".join(reversed(frames))
+
+
+class StackSampler:
+    """A thread that periodically samples the stacks of the threads working on profiled requests while there are any."""
+
+    def __init__(self, interval: float = 0.005) -> None:
+        """Create a stopped sampler.
+
+        Args:
+            interval (float, optional): Seconds between samples. Defaults to 5 ms.
+        """
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self.samples = 0
+        # The markers of each sampled thread; see `begin`.
+        self._targets: dict[int, list[FrameType | None]] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Start the sampler thread; it sleeps until `begin` is called."""
+        if self._thread is not None:
+            return
+        self._stopped.clear()
+        with self._lock:
+            # `stop` sets the wake event to end the loop; leave it set only if requests are still in flight.
+            if not self._targets:
+                self._wake.clear()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the sampler thread."""
+        self._stopped.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def begin(self, ident: int, marker: FrameType | None = None) -> None:
+        """Start sampling a thread working on a profiled request; sampling runs while any thread is.
+
+        Args:
+            ident (int): The thread's identifier.
+            marker (FrameType | None, optional): A frame of the request on that thread, e.g. of its outermost coroutine. The thread is then only sampled while that frame is on its stack, which leaves out the other requests an event loop thread serves. Defaults to sampling the thread whenever it is busy.
+        """
+        with self._lock:
+            self._targets.setdefault(ident, []).append(marker)
+            self._wake.set()
+
+    def end(self, ident: int, marker: FrameType | None = None) -> None:
+        """Stop sampling a thread for a request, given the arguments it was started with."""
+        with self._lock:
+            markers = self._targets[ident]
+            markers.remove(marker)
+            if not markers:
+                del self._targets[ident]
+            if not self._targets:
+                self._wake.clear()
+
+    def sample(self) -> None:
+        """Record the current stack of every busy thread working on a profiled request."""
+        names = {t.ident: t.name for t in threading.enumerate()}
+        with self._lock:
+            targets = {ident: list(markers) for ident, markers in self._targets.items()}
+        frames = sys._current_frames()
+        stacks = []
+        for ident, markers in targets.items():
+            frame = frames.get(ident)
+            if frame is None or frame.f_globals.get("__name__") in IDLE_MODULES:
+                continue
+            if None not in markers and not _runs_any(frame, markers):
+                continue
+            stacks.append(f"{names.get(ident, ident)};{collapse_stack(frame)}")
+        with self._lock:
+            self.stacks.update(stacks)
+            self.samples += 1
+
+    def collapsed(self) -> str:
+        """Return the aggregated samples in collapsed-stack format, most frequent first."""
+        with self._lock:
+            return "".join(f"{stack} {n}\n" for stack, n in self.stacks.most_common())
+
+    def reset(self) -> None:
+        """Drop every sample collected so far."""
+        with self._lock:
+            self.stacks.clear()
+            self.samples = 0
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            if not self._wake.wait(timeout=1.0) or self._stopped.is_set():
+                continue
+            self.sample()
+            self._stopped.wait(self.interval)
+
+
+def _runs_any(frame: FrameType | None, markers: list[FrameType | None]) -> bool:
+    while frame is not None:
+        if any(frame is marker for marker in markers):
+            return True
+        frame = frame.f_back
+    return False
+
+
+class RequestProfiler:
+    """Decides which requests to profile and owns the sampler that profiles them."""
+
+    def __init__(self) -> None:
+        """Create a disabled profiler."""
+        self.enabled = False
+        self.settings: ProfilerSettings | None = None
+        self.sampler = StackSampler()
+        self.profiled_requests = 0
+        self._counter = itertools.count()
+
+    def enable(self, settings: ProfilerSettings) -> None:
+        """Start profiling the requests selected by `settings`, keeping samples collected so far."""
+        self.sampler.interval = settings.interval_ms / 1e3
+        self.settings = settings
+        self._counter = itertools.count()
+        self.sampler.start()
+        self.enabled = True
+
+    def disable(self) -> None:
+        """Stop selecting requests and stop the sampler thread; collected samples are kept."""
+        self.enabled = False
+        self.sampler.stop()
+
+    def status(self) -> ProfilerStatus:
+        """Return the profiler's settings and counters."""
+        return ProfilerStatus(
+            enabled=self.enabled,
+            settings=self.settings,
+            profiled_requests=self.profiled_requests,
+            samples=self.sampler.samples,
+        )
+
+    def should_profile(self, scope: dict) -> bool:
+        """Return whether a request matches the current settings.
+
+        Args:
+            scope (dict): The request's ASGI scope.
+
+        Returns:
+            bool: True if the request should be profiled.
+        """
+        settings = self.settings
+        if not self.enabled or settings is None:
+            return False
+        if settings.every is not None and next(self._counter) % settings.every == 0:
+            return True
+        if settings.header is not None:
+            header = settings.header.lower().encode()
+            if any(name == header for name, _ in scope.get("headers", ())):
+                return True
+        if settings.route is not None:
+            return _route_template(scope) == settings.route
+        return False
+
+
+def _route_template(scope: dict) -> str | None:
+    # Middleware runs before routing, so resolve the route template the router would pick.
+    router = getattr(scope.get("app"), "router", None)
+    for route in getattr(router, "routes", ()):
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return str(route.path)
+    return None
+
+
+class ProfiledRoute(APIRoute):
+    """A route whose sync endpoint has its worker thread sampled while it serves a profiled request.
+
+    FastAPI runs sync endpoints in a thread pool, out of sight of the middleware; the wrapper registers the worker thread with the request's sampler, found through a context variable, so it costs a single lookup when the request is not profiled. Use it as the app router's `route_class`.
+    """
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any) -> None:
+        """Create a route, wrapping `endpoint` unless it is a coroutine function."""
+        if not inspect.iscoroutinefunction(endpoint):
+            endpoint = _sampled(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+
+def _sampled(endpoint: Callable[..., Any]) -> Callable[..., Any]:
+    @functools.wraps(endpoint)
+    def run(*args: Any, **kwargs: Any) -> Any:
+        sampler = _current_sampler.get()
+        if sampler is None:
+            return endpoint(*args, **kwargs)
+        ident = threading.get_ident()
+        sampler.begin(ident)
+        try:
+            return endpoint(*args, **kwargs)
+        finally:
+            sampler.end(ident)
+
+    return run
+
+
+class ProfilingMiddleware:
+    """ASGI middleware that profiles the requests selected by a `RequestProfiler`."""
+
+    def __init__(self, app: Callable, profiler: RequestProfiler) -> None:
+        """Wrap an ASGI app."""
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope: dict, receive: Callable, send: Callable) -> None:
+        """Handle one ASGI connection."""
+        profiler = self.profiler
+        if not profiler.enabled or scope["type"] != "http" or not profiler.should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profiler.profiled_requests += 1
+        sampler = profiler.sampler
+        # The event loop also runs other requests; only sample it while this coroutine is on its stack.
+        ident, marker = threading.get_ident(), sys._getframe()
+        sampler.begin(ident, marker)
+        token = _current_sampler.set(sampler)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _current_sampler.reset(token)
+            sampler.end(ident, marker)
+
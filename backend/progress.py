@@ -0,0 +1,297 @@
+"""Per-user progress through the catalog and the frontier of concepts each user has unlocked."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from typing import NamedTuple
+from uuid import UUID
+
+from backend.catalog import Catalog
+from backend.repositories.progress import ProgressRepository
+
+DEFAULT_MAX_USERS = 10_000
+DEFAULT_TTL_SECONDS = 60.0
+
+
+class CourseMasks(NamedTuple):
+    """The bits of a course's concepts in a `ConceptInterner`, for one version of the course."""
+
+    version: tuple[int, int]
+    concepts: int
+    roots: int
+
+
+class ConceptInterner:
+    """Append-only mapping of concept IDs to bit positions, shared by every user's completion bitset.
+
+    Positions are never reused, so a bitset stays valid across catalog versions; a removed concept just leaves an unused bit.
+    """
+
+    def __init__(self) -> None:
+        """Create an empty interner."""
+        self._bits: dict[str, int] = {}
+        self._ids: list[str] = []
+        self._masks: dict[str, CourseMasks] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Return the number of interned concept IDs."""
+        return len(self._ids)
+
+    def bit(self, concept_id: str) -> int:
+        """Return the bit position of a concept ID, interning it if needed."""
+        bit = self._bits.get(concept_id)
+        if bit is None:
+            with self._lock:
+                bit = self._bits.setdefault(concept_id, len(self._ids))
+                if bit == len(self._ids):
+                    self._ids.append(concept_id)
+        return bit
+
+    def mask(self, concept_ids: Iterable[str]) -> int:
+        """Return the bitset with the bits of the given concept IDs set, interning them if needed."""
+        bits = 0
+        for concept_id in concept_ids:
+            bits |= 1 << self.bit(concept_id)
+        return bits
+
+    def course_masks(self, catalog: Catalog, course_id: str) -> CourseMasks:
+        """Return the bitsets of a course's concepts and of its prerequisite-free concepts.
+
+        They are computed once per version of the course and shared by every user, so per-course questions about a completion bitset are a few big-integer operations instead of one bit test per concept.
+
+        Args:
+            catalog (Catalog): The catalog the course belongs to.
+            course_id (str): The ID of the course.
+
+        Returns:
+            CourseMasks: The masks for the course's current version.
+        """
+        version = catalog.course_version(course_id)
+        masks = self._masks.get(course_id)
+        if masks is None or masks.version != version:
+            masks = CourseMasks(
+                version,
+                self.mask(c.id for c in catalog.concepts_in_course(course_id)),
+                self.mask(catalog.roots(course_id)),
+            )
+            self._masks[course_id] = masks
+        return masks
+
+    def decode(self, bits: int) -> list[str]:
+        """Return the concept IDs whose bits are set, in interning order."""
+        ids = self._ids
+        result = []
+        while bits:
+            low = bits & -bits
+            result.append(ids[low.bit_length() - 1])
+            bits ^= low
+        return result
+
+
+class LearnerProgress:
+    """One user's completed concepts and the concepts they have unlocked, for one catalog revision.
+
+    Completions are a bitset over `ConceptInterner` positions. For every concept with at least one completed prerequisite, `remaining` counts the direct prerequisites still to complete; when a count drops to zero the concept joins its course's unlocked set. Completing a concept therefore only touches its direct dependents, and a course's frontier is its prerequisite-free concepts that are not completed plus its unlocked set.
+
+    The counters are only valid for the catalog revision they were built against; `ProgressTracker` rebuilds them from the bitset after an edit or reload.
+    """
+
+    def __init__(self, catalog: Catalog, interner: ConceptInterner, completed: Iterable[str] = ()) -> None:
+        """Build the progress state of a user.
+
+        Args:
+            catalog (Catalog): The catalog to track progress against.
+            interner (ConceptInterner): The interner the completion bitset is encoded with.
+            completed (Iterable[str], optional): The IDs of the concepts the user has completed. IDs missing from the catalog are kept in the bitset but otherwise ignored. Defaults to none.
+        """
+        self.revision = catalog.revision
+        self.completed = 0
+        self.remaining: dict[str, int] = {}
+        self.unlocked: dict[str, set[str]] = {}
+        self._interner = interner
+        for concept_id in completed:
+            self.complete(catalog, concept_id)
+
+    def is_complete(self, concept_id: str) -> bool:
+        """Return whether the user has completed a concept."""
+        return bool(self.completed >> self._interner.bit(concept_id) & 1)
+
+    def complete(self, catalog: Catalog, concept_id: str) -> list[str]:
+        """Mark a concept as completed and unlock the dependents whose prerequisites are now all complete.
+
+        Args:
+            catalog (Catalog): The catalog the state was built against.
+            concept_id (str): The ID of the completed concept.
+
+        Returns:
+            list[str]: The IDs of the concepts this completion unlocked; empty if it was already complete.
+        """
+        bit = 1 << self._interner.bit(concept_id)
+        if self.completed & bit:
+            return []
+        self.completed |= bit
+        concept = catalog.get_concept(concept_id)
+        if concept is None:
+            return []
+
+        self.unlocked.get(concept.course_id, set()).discard(concept_id)
+        self.remaining.pop(concept_id, None)
+
+        unlocked = []
+        for dependent_id in catalog.dependents_of(concept_id):
+            remaining = self.remaining.get(dependent_id)
+            if remaining is None:
+                remaining = len(set(catalog.concepts[dependent_id].prerequisites))
+            self.remaining[dependent_id] = remaining - 1
+            if remaining == 1 and not self.is_complete(dependent_id):
+                dependent = catalog.concepts[dependent_id]
+                self.unlocked.setdefault(dependent.course_id, set()).add(dependent_id)
+                unlocked.append(dependent_id)
+        return unlocked
+
+    def unlocked_by(self, catalog: Catalog, concept_id: str) -> list[str]:
+        """Return the direct dependents of a concept that are unlocked and not completed."""
+        unlocked = []
+        for dependent_id in catalog.dependents_of(concept_id):
+            if self.remaining.get(dependent_id) == 0 and not self.is_complete(dependent_id):
+                unlocked.append(dependent_id)
+        return unlocked
+
+    def completed_in(self, catalog: Catalog, course_id: str) -> int:
+        """Return how many of a course's concepts the user has completed."""
+        return (self.completed & self._interner.course_masks(catalog, course_id).concepts).bit_count()
+
+    def frontier(self, catalog: Catalog, course_id: str) -> list[str]:
+        """Return the concepts of a course the user can study next, in topological order.
+
+        Args:
+            catalog (Catalog): The catalog the state was built against.
+            course_id (str): The ID of the course.
+
+        Returns:
+            list[str]: The IDs of the course's concepts that are not completed and whose prerequisites all are.
+        """
+        course = catalog.compact.course(course_id)
+        if course is None:
+            return []
+        roots = self._interner.course_masks(catalog, course_id).roots
+        frontier = self._interner.decode(roots & ~self.completed)
+        frontier.extend(self.unlocked.get(course_id, ()))
+        return sorted(frontier, key=course.index.__getitem__)
+
+
+class _Entry(NamedTuple):
+    progress: LearnerProgress
+    loaded_at: float
+
+
+class ProgressTracker:
+    """Records completions in a `ProgressRepository` and keeps the `LearnerProgress` of recently active users in memory.
+
+    The repository is the source of truth. A user's state is loaded from it on first use, rebuilt from its own bitset when the catalog revision changes, and reloaded after `ttl` seconds so completions recorded by other workers show up. At most `max_users` states are kept, evicting the least recently used.
+    """
+
+    def __init__(
+        self,
+        repository: ProgressRepository,
+        max_users: int = DEFAULT_MAX_USERS,
+        ttl: float = DEFAULT_TTL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Create a tracker with no users loaded.
+
+        Args:
+            repository (ProgressRepository): Where completions are persisted.
+            max_users (int, optional): Maximum number of user states kept in memory. Defaults to 10,000.
+            ttl (float, optional): Seconds after which a state is reloaded from the repository. Defaults to 60.
+            clock (Callable[[], float], optional): Source of the current time in seconds. Defaults to `time.monotonic`.
+        """
+        self.repository = repository
+        self.max_users = max_users
+        self.ttl = ttl
+        self.interner = ConceptInterner()
+        self._clock = clock
+        self._entries: OrderedDict[UUID, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+        self.loads = 0
+        self.rebuilds = 0
+
+    def __len__(self) -> int:
+        """Return the number of user states held in memory."""
+        return len(self._entries)
+
+    def stats(self) -> dict[str, float]:
+        """Return a snapshot of the tracker's counters."""
+        return {
+            "users": len(self._entries),
+            "interned_concepts": len(self.interner),
+            "loads": self.loads,
+            "rebuilds": self.rebuilds,
+        }
+
+    def complete(self, catalog: Catalog, user_id: UUID, concept_id: str) -> list[str]:
+        """Record that a user completed a concept.
+
+        Completing a concept twice is harmless, and returns the same result.
+
+        Args:
+            catalog (Catalog): The current catalog.
+            user_id (UUID): The ID of the user.
+            concept_id (str): The ID of the completed concept.
+
+        Returns:
+            list[str]: The IDs of the concept's direct dependents that are now unlocked.
+        """
+        progress = self._progress(catalog, user_id)
+        self.repository.add_completed(user_id, concept_id)
+        with self._lock:
+            progress.complete(catalog, concept_id)
+            return progress.unlocked_by(catalog, concept_id)
+
+    def frontier(self, catalog: Catalog, user_id: UUID, course_id: str) -> tuple[list[str], int]:
+        """Return a user's frontier in a course and how many of its concepts they completed.
+
+        Args:
+            catalog (Catalog): The current catalog.
+            user_id (UUID): The ID of the user.
+            course_id (str): The ID of the course.
+
+        Returns:
+            tuple[list[str], int]: The IDs of the concepts the user can study next, and the number of completed concepts in the course.
+        """
+        progress = self._progress(catalog, user_id)
+        with self._lock:
+            return progress.frontier(catalog, course_id), progress.completed_in(catalog, course_id)
+
+    def forget(self, user_id: UUID) -> None:
+        """Drop a user's in-memory state; it is reloaded from the repository on next use."""
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def _progress(self, catalog: Catalog, user_id: UUID) -> LearnerProgress:
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and now - entry.loaded_at < self.ttl:
+                if entry.progress.revision != catalog.revision:
+                    completed = self.interner.decode(entry.progress.completed)
+                    entry = entry._replace(progress=LearnerProgress(catalog, self.interner, completed))
+                    self._entries[user_id] = entry
+                    self.rebuilds += 1
+                self._entries.move_to_end(user_id)
+                return entry.progress
+
+        # Query the repository without holding the lock; a concurrent load of the same user just wins or loses the race.
+        stored = self.repository.completed(user_id)
+        with self._lock:
+            entry = _Entry(LearnerProgress(catalog, self.interner, stored), now)
+            self._entries[user_id] = entry
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_users:
+                self._entries.popitem(last=False)
+            self.loads += 1
+            return entry.progress
@@ -0,0 +1,101 @@
+"""Progress repositories: the concepts each user has completed."""
+
+from __future__ import annotations
+
+import threading
+from abc import ABC, abstractmethod
+from uuid import UUID
+
+from pymongo import ASCENDING
+from pymongo.collection import Collection
+from pymongo.errors import DuplicateKeyError
+
+from backend.repositories.users import DEFAULT_DB_NAME, get_mongo_client
+
+
+class ProgressRepository(ABC):
+    """Storage for the set of concept IDs each user has completed."""
+
+    @abstractmethod
+    def completed(self, user_id: UUID) -> set[str]:
+        """Return the IDs of every concept the user has completed."""
+
+    @abstractmethod
+    def add_completed(self, user_id: UUID, concept_id: str) -> bool:
+        """Record that a user completed a concept.
+
+        Args:
+            user_id (UUID): The ID of the user.
+            concept_id (str): The ID of the completed concept.
+
+        Returns:
+            bool: True if the completion is new, False if it was already recorded.
+        """
+
+
+class InMemoryProgressRepository(ProgressRepository):
+    """Progress repository held in process memory, with one set of concept IDs per user."""
+
+    def __init__(self) -> None:
+        """Create an empty repository."""
+        self._completed: dict[UUID, set[str]] = {}
+        self._lock = threading.Lock()
+
+    def completed(self, user_id: UUID) -> set[str]:
+        """Return the IDs of every concept the user has completed."""
+        with self._lock:
+            return set(self._completed.get(user_id, ()))
+
+    def add_completed(self, user_id: UUID, concept_id: str) -> bool:
+        """Record that a user completed a concept, unless it already was."""
+        with self._lock:
+            completed = self._completed.setdefault(user_id, set())
+            if concept_id in completed:
+                return False
+            completed.add(concept_id)
+            return True
+
+
+class MongoProgressRepository(ProgressRepository):
+    """Progress repository backed by a MongoDB collection with one document per completion.
+
+    A unique index on `(user_id, concept_id)` makes recording a completion idempotent. Works with any pymongo-compatible collection, including `mongomock`.
+    """
+
+    def __init__(self, collection: Collection) -> None:
+        """Wrap a collection, creating the unique index if it does not exist.
+
+        Args:
+            collection (Collection): The collection holding completion documents.
+        """
+        self._collection = collection
+        self._collection.create_index(
+            [("user_id", ASCENDING), ("concept_id", ASCENDING)],
+            unique=True,
+        )
+
+    @classmethod
+    def from_uri(cls, uri: str, db_name: str = DEFAULT_DB_NAME) -> MongoProgressRepository:
+        """Create a repository on the `progress` collection of a MongoDB server.
+
+        Args:
+            uri (str): The MongoDB connection URI.
+            db_name (str, optional): The database name. Defaults to "nexus".
+
+        Returns:
+            MongoProgressRepository: A repository using the shared client for `uri`.
+        """
+        return cls(get_mongo_client(uri)[db_name]["progress"])
+
+    def completed(self, user_id: UUID) -> set[str]:
+        """Return the IDs of every concept the user has completed."""
+        docs = self._collection.find({"user_id": str(user_id)}, {"_id": 0, "concept_id": 1})
+        return {doc["concept_id"] for doc in docs}
+
+    def add_completed(self, user_id: UUID, concept_id: str) -> bool:
+        """Record a completion, relying on the unique index to reject duplicates."""
+        try:
+            self._collection.insert_one({"user_id": str(user_id), "concept_id": concept_id})
+        except DuplicateKeyError:
+            return False
+        return True
@@ -0,0 +1,193 @@
+"""User repositories: indexed lookup and atomic creation of users."""
+
+from __future__ import annotations
+
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Mapping
+from functools import lru_cache
+from uuid import UUID
+
+from pymongo import ASCENDING, MongoClient
+from pymongo.collection import Collection
+from pymongo.errors import DuplicateKeyError
+
+from backend.models.users import UserInDB
+
+DEFAULT_DB_NAME = "nexus"
+MONGO_MAX_POOL_SIZE = 50
+DEFAULT_CACHE_SIZE = 1024
+
+
+UserListener = Callable[[UserInDB], None]
+
+
+class UserRepository(ABC):
+    """Storage for users, looked up by ID or by (unique) username.
+
+    Listeners registered with `subscribe` are called with every user the repository writes, e.g. to evict cached sessions of that user.
+    """
+
+    def __init__(self) -> None:
+        """Create a repository without listeners."""
+        self._listeners: list[UserListener] = []
+
+    @abstractmethod
+    def get_by_id(self, user_id: UUID) -> UserInDB | None:
+        """Return the user with the given ID, or None if not found."""
+
+    @abstractmethod
+    def get_by_username(self, username: str) -> UserInDB | None:
+        """Return the user with the given username, or None if not found."""
+
+    @abstractmethod
+    def add(self, user: UserInDB) -> bool:
+        """Insert a user unless the username (or ID) is already taken.
+
+        The check and the insert happen atomically, so two concurrent signups for the same username cannot both succeed.
+
+        Args:
+            user (UserInDB): The user to insert.
+
+        Returns:
+            bool: True if the user was inserted, False if the username or ID already exists.
+        """
+
+    def username_available(self, username: str) -> bool:
+        """Return True if no user has the given username."""
+        return self.get_by_username(username) is None
+
+    def subscribe(self, listener: UserListener) -> None:
+        """Register a callback invoked with every user written to the repository."""
+        self._listeners.append(listener)
+
+    def _notify(self, user: UserInDB) -> None:
+        for listener in self._listeners:
+            listener(user)
+
+
+class InMemoryUserRepository(UserRepository):
+    """User repository held in process memory, with dict indexes on ID and username.
+
+    `UserInDB` instances are built once on insert and shared by every lookup.
+    """
+
+    def __init__(self, records: Iterable[Mapping] = ()) -> None:
+        """Create a repository seeded with raw user records.
+
+        Args:
+            records (Iterable[Mapping], optional): Raw user records to load. Defaults to none.
+        """
+        super().__init__()
+        self._by_id: dict[UUID, UserInDB] = {}
+        self._by_username: dict[str, UserInDB] = {}
+        self._lock = threading.Lock()
+        for record in records:
+            self.add(UserInDB.model_validate(record))
+
+    def __len__(self) -> int:
+        """Return the number of users."""
+        return len(self._by_id)
+
+    def get_by_id(self, user_id: UUID) -> UserInDB | None:
+        """Return the user with the given ID, or None if not found."""
+        return self._by_id.get(user_id)
+
+    def get_by_username(self, username: str) -> UserInDB | None:
+        """Return the user with the given username, or None if not found."""
+        return self._by_username.get(username)
+
+    def add(self, user: UserInDB) -> bool:
+        """Insert a user unless the username or ID is already taken."""
+        with self._lock:
+            if user.username in self._by_username or user.id in self._by_id:
+                return False
+            self._by_id[user.id] = user
+            self._by_username[user.username] = user
+        self._notify(user)
+        return True
+
+
+class MongoUserRepository(UserRepository):
+    """User repository backed by a MongoDB collection with unique indexes on `id` and `username`.
+
+    Works with any pymongo-compatible collection, including `mongomock`. The `UserInDB` instances found by recent lookups are kept in an LRU, keyed by both ID and username, so repeat lookups skip the query and validation; users are never updated once inserted, so cached instances cannot go stale. Misses are not cached, since a signup may add the user at any time.
+
+    Every call may block on the server, so async code should make them from a worker thread.
+    """
+
+    def __init__(self, collection: Collection, cache_size: int = DEFAULT_CACHE_SIZE) -> None:
+        """Wrap a collection, creating the unique indexes if they do not exist.
+
+        Args:
+            collection (Collection): The collection holding user documents.
+            cache_size (int, optional): Maximum number of users kept in the LRU. Defaults to 1024.
+        """
+        super().__init__()
+        self.cache_size = cache_size
+        self._cache: OrderedDict[tuple[str, str], UserInDB] = OrderedDict()
+        self._lock = threading.Lock()
+        self._collection = collection
+        self._collection.create_index([("id", ASCENDING)], unique=True)
+        self._collection.create_index([("username", ASCENDING)], unique=True)
+
+    @classmethod
+    def from_uri(cls, uri: str, db_name: str = DEFAULT_DB_NAME) -> MongoUserRepository:
+        """Create a repository on the `users` collection of a MongoDB server.
+
+        Args:
+            uri (str): The MongoDB connection URI.
+            db_name (str, optional): The database name. Defaults to "nexus".
+
+        Returns:
+            MongoUserRepository: A repository using the shared client for `uri`.
+        """
+        return cls(get_mongo_client(uri)[db_name]["users"])
+
+    def get_by_id(self, user_id: UUID) -> UserInDB | None:
+        """Return the user with the given ID, or None if not found."""
+        return self._find_one("id", str(user_id))
+
+    def get_by_username(self, username: str) -> UserInDB | None:
+        """Return the user with the given username, or None if not found."""
+        return self._find_one("username", username)
+
+    def add(self, user: UserInDB) -> bool:
+        """Insert a user, relying on the unique indexes to reject duplicates."""
+        try:
+            self._collection.insert_one(user.model_dump(mode="json"))
+        except DuplicateKeyError:
+            return False
+        self._notify(user)
+        return True
+
+    def _find_one(self, field: str, value: str) -> UserInDB | None:
+        with self._lock:
+            user = self._cache.get((field, value))
+            if user is not None:
+                self._cache.move_to_end((field, value))
+                return user
+        doc = self._collection.find_one({field: value}, {"_id": 0})
+        if not doc:
+            return None
+        user = UserInDB.model_validate(doc)
+        with self._lock:
+            self._cache[("id", str(user.id))] = user
+            self._cache[("username", user.username)] = user
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return user
+
+
+@lru_cache
+def get_mongo_client(uri: str) -> MongoClient:
+    """Return the process-wide pooled client for a MongoDB URI.
+
+    Args:
+        uri (str): The MongoDB connection URI.
+
+    Returns:
+        MongoClient: A client shared by every repository connecting to `uri`.
+    """
+    return MongoClient(uri, maxPoolSize=MONGO_MAX_POOL_SIZE)
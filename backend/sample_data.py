@@ -2,9 +2,10 @@
 
 from __future__ import annotations
 
+from typing import Any
 from uuid import uuid4
 
-concepts = [
+concepts: list[dict[str, Any]] = [
     {
         "id": "limits",
         "name": "Limits",
@@ -71,7 +72,7 @@ concepts = [
     },
 ]
 
-courses = [
+courses: list[dict[str, Any]] = [
     {
         "id": "calculus1",
         "name": "Calculus 1",
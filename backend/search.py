@@ -0,0 +1,214 @@
+"""In-memory inverted index over concept text, ranked with BM25."""
+
+from __future__ import annotations
+
+import math
+import re
+import threading
+from bisect import bisect_left
+from collections import Counter
+from collections.abc import Iterable
+from heapq import nsmallest
+
+from backend.models.concepts import Concept
+
+TOKEN_RE = re.compile(r"[^\W_]+")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from in is it of on or that the this to with".split()
+)
+# Term frequencies are weighted by the field they occur in, so a match in a name outranks one in the content.
+FIELD_WEIGHTS = {"name": 3.0, "description": 2.0, "content": 1.0}
+K1 = 1.2
+B = 0.75
+# A prefix is expanded to at most this many vocabulary terms.
+MAX_PREFIX_EXPANSIONS = 50
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into case-folded alphanumeric terms, dropping stopwords.
+
+    Args:
+        text (str): The text to tokenize.
+
+    Returns:
+        list[str]: The terms, in order of occurrence.
+    """
+    return [t for t in TOKEN_RE.findall(text.casefold()) if t not in STOPWORDS]
+
+
+class SearchIndex:
+    """Inverted index over the name, description and content of concepts, scored with BM25.
+
+    Each indexed concept gets a document number, never reused, and each term maps to a posting list of `(document, field-weighted term frequency)` pairs. `add` appends to the posting lists in place, and marks the vocabulary (the sorted terms that prefixes are expanded against) for re-sorting on the next prefix search. `remove` only retires the concept's document number, so searches skip its postings; a term's list is rebuilt once most of it is retired. Searches running concurrently with an edit may or may not see the edited concept, but never a posting list that changes under them in any other way. Edits themselves must be serialized by the caller.
+    """
+
+    def __init__(self, concepts: Iterable[Concept] = ()) -> None:
+        """Index a set of concepts.
+
+        Args:
+            concepts (Iterable[Concept], optional): The concepts to index. Defaults to none.
+        """
+        self._postings: dict[str, list[tuple[int, float]]] = {}
+        # The number of live and of retired documents in each term's posting list.
+        self._df: dict[str, int] = {}
+        self._retired: dict[str, int] = {}
+        self._ids: list[str] = []
+        self._doc_of: dict[str, int] = {}
+        self._doc_terms: dict[str, dict[str, float]] = {}
+        # Only live documents have a length.
+        self._lengths: dict[int, float] = {}
+        self._course_of: dict[int, str] = {}
+        self._total_length = 0.0
+        self._vocabulary: list[str] | None = None
+        self._lock = threading.Lock()
+        for concept in concepts:
+            self._insert(concept)
+
+    def __len__(self) -> int:
+        """Return the number of indexed concepts."""
+        return len(self._doc_terms)
+
+    def __contains__(self, concept_id: object) -> bool:
+        """Return whether a concept is indexed."""
+        return concept_id in self._doc_terms
+
+    def add(self, concept: Concept) -> None:
+        """Index a concept, replacing any previous version of it.
+
+        Args:
+            concept (Concept): The concept to index.
+        """
+        with self._lock:
+            self._remove(concept.id)
+            self._insert(concept)
+
+    def remove(self, concept_id: str) -> None:
+        """Remove a concept from the index, if present."""
+        with self._lock:
+            self._remove(concept_id)
+
+    def expand(self, prefix: str) -> list[str]:
+        """Return the indexed terms that start with a prefix, in lexicographic order.
+
+        Args:
+            prefix (str): The case-folded prefix.
+
+        Returns:
+            list[str]: At most `MAX_PREFIX_EXPANSIONS` terms.
+        """
+        vocabulary = self._vocabulary
+        if vocabulary is None:
+            with self._lock:
+                vocabulary = self._vocabulary
+                if vocabulary is None:
+                    vocabulary = self._vocabulary = sorted(self._postings)
+        start = bisect_left(vocabulary, prefix)
+        terms = vocabulary[start : start + MAX_PREFIX_EXPANSIONS]
+        return [t for t in terms if t.startswith(prefix)]
+
+    def search(
+        self,
+        query: str,
+        course_id: str | None = None,
+        limit: int = 10,
+        prefix: bool = False,
+    ) -> list[tuple[str, float]]:
+        """Rank the concepts matching any term of a query.
+
+        Args:
+            query (str): The free-text query.
+            course_id (str | None, optional): Only return concepts of this course. Defaults to all courses.
+            limit (int, optional): The maximum number of results. Defaults to 10.
+            prefix (bool, optional): Treat the last query term as a prefix, for search-as-you-type. Each concept scores its best-matching completion. Defaults to False.
+
+        Returns:
+            list[tuple[str, float]]: Concept IDs and their BM25 scores, best first, ties broken by ID.
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        n = len(self._doc_terms)
+        if not terms or not n:
+            return []
+
+        groups = [[t] for t in terms]
+        if prefix:
+            last = terms[-1]
+            groups[-1] = self.expand(last) or [last]
+
+        # Every indexed text may be made of stopwords only, leaving no terms at all.
+        avg_length = self._total_length / n or 1.0
+        norm_base = K1 * (1 - B)
+        norm_scale = K1 * B / avg_length
+        lengths = self._lengths
+        course_of = self._course_of
+
+        scores: dict[int, float] = {}
+        for group in groups:
+            best: dict[int, float] = {}
+            for term in group:
+                postings = self._postings.get(term)
+                df = self._df.get(term, 0)
+                if not postings or not df:
+                    continue
+                idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+                weight = idf * (K1 + 1)
+                for doc, tf in postings:
+                    length = lengths.get(doc)
+                    if length is None:
+                        # Retired by a removal.
+                        continue
+                    if course_id is not None and course_of.get(doc) != course_id:
+                        continue
+                    score = weight * tf / (tf + norm_base + norm_scale * length)
+                    if score > best.get(doc, 0.0):
+                        best[doc] = score
+            for doc, score in best.items():
+                scores[doc] = scores.get(doc, 0.0) + score
+
+        ids = self._ids
+        top = nsmallest(limit, scores.items(), key=lambda item: (-item[1], ids[item[0]]))
+        return [(ids[doc], score) for doc, score in top]
+
+    def _insert(self, concept: Concept) -> None:
+        doc_terms: dict[str, float] = {}
+        for field, weight in FIELD_WEIGHTS.items():
+            for term, count in Counter(tokenize(getattr(concept, field))).items():
+                doc_terms[term] = doc_terms.get(term, 0.0) + weight * count
+        length = sum(doc_terms.values())
+        doc = len(self._ids)
+        self._ids.append(concept.id)
+        self._doc_of[concept.id] = doc
+        self._doc_terms[concept.id] = doc_terms
+        self._course_of[doc] = concept.course_id
+        self._lengths[doc] = length
+        self._total_length += length
+        for term, tf in doc_terms.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                self._postings[term] = [(doc, tf)]
+                self._vocabulary = None
+            else:
+                postings.append((doc, tf))
+            self._df[term] = self._df.get(term, 0) + 1
+
+    def _remove(self, concept_id: str) -> None:
+        doc_terms = self._doc_terms.pop(concept_id, None)
+        if doc_terms is None:
+            return
+        doc = self._doc_of.pop(concept_id)
+        self._total_length -= self._lengths.pop(doc)
+        del self._course_of[doc]
+        for term in doc_terms:
+            df = self._df[term] - 1
+            retired = self._retired.get(term, 0) + 1
+            if not df:
+                del self._postings[term], self._df[term]
+                self._retired.pop(term, None)
+                self._vocabulary = None
+            elif retired > df:
+                # Replaced, not filtered in place, so searches iterating the old list are unaffected.
+                self._postings[term] = [(d, tf) for d, tf in self._postings[term] if d in self._lengths]
+                self._df[term] = df
+                self._retired.pop(term, None)
+            else:
+                self._df[term] = df
+                self._retired[term] = retired
@@ -0,0 +1,148 @@
+"""Cache of verified sessions, mapping access tokens to the users they resolve to."""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import NamedTuple
+from uuid import UUID
+
+from backend.models.users import UserInDB
+
+DEFAULT_MAX_ENTRIES = 10_000
+DEFAULT_TTL_SECONDS = 300.0
+
+
+class _Session(NamedTuple):
+    user: UserInDB
+    expires_at: float
+
+
+def token_digest(token: str) -> bytes:
+    """Return the key a token is cached under, so raw tokens are never held in memory."""
+    return hashlib.sha256(token.encode()).digest()
+
+
+class SessionCache:
+    """A bounded TTL/LRU cache from token digest to authenticated user.
+
+    An entry never outlives the token it was created for: it expires at the earlier of the token's `exp` claim and `ttl` seconds after insertion. Entries can also be evicted per token (on logout) or per user (when the user repository writes the user).
+
+    A user changed directly in the database, bypassing the repository, reaches requests carrying an already verified token at most `ttl` seconds later, once their entries expire. Admin rights are not part of the cached user; they come from `ADMIN_USERNAMES` and are checked on every request.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl: float = DEFAULT_TTL_SECONDS,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """Create an empty cache.
+
+        Args:
+            max_entries (int, optional): Maximum number of cached sessions. Defaults to 10,000.
+            ttl (float, optional): Maximum lifetime of an entry in seconds. Defaults to 300.
+            clock (Callable[[], float], optional): Source of the current UNIX time. Defaults to `time.time`.
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: OrderedDict[bytes, _Session] = OrderedDict()
+        self._by_user: dict[UUID, set[bytes]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        """Return the number of cached sessions."""
+        return len(self._entries)
+
+    @property
+    def hit_rate(self) -> float:
+        """Return the fraction of lookups served from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> dict[str, float]:
+        """Return a snapshot of the cache's counters."""
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+    def get(self, token: str) -> UserInDB | None:
+        """Return the cached user for a token, or None on a miss or expired entry.
+
+        Args:
+            token (str): The raw access token.
+
+        Returns:
+            UserInDB | None: The user the token was verified for.
+        """
+        key = token_digest(token)
+        with self._lock:
+            session = self._entries.get(key)
+            if session is None:
+                self.misses += 1
+                return None
+            if session.expires_at <= self._clock():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return session.user
+
+    def put(self, token: str, user: UserInDB, expires_at: float) -> None:
+        """Cache the user a token was verified for.
+
+        Args:
+            token (str): The raw access token.
+            user (UserInDB): The user the token resolved to.
+            expires_at (float): The token's expiry as a UNIX timestamp.
+        """
+        key = token_digest(token)
+        session = _Session(user, min(expires_at, self._clock() + self.ttl))
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = session
+            self._by_user.setdefault(user.id, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def evict_token(self, token: str) -> None:
+        """Drop the cached session for a token, if any."""
+        with self._lock:
+            self._remove(token_digest(token))
+
+    def evict_user(self, user_id: UUID) -> None:
+        """Drop every cached session of a user, e.g. after the user was written."""
+        with self._lock:
+            for key in list(self._by_user.get(user_id, ())):
+                self._remove(key)
+
+    def clear(self) -> None:
+        """Drop all cached sessions."""
+        with self._lock:
+            self._entries.clear()
+            self._by_user.clear()
+
+    def _remove(self, key: bytes) -> None:
+        session = self._entries.pop(key, None)
+        if session is None:
+            return
+        keys = self._by_user[session.user.id]
+        keys.discard(key)
+        if not keys:
+            del self._by_user[session.user.id]
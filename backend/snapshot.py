@@ -0,0 +1,581 @@
+"""Precompiled catalog snapshots for fast cold starts.
+
+A snapshot is a single binary file written offline from the catalog sources. It holds the concept and course IDs, with concepts grouped by course and in topological order within their course, the concept records of each course as a JSON array, the courses as one JSON array, the CSR adjacency arrays of every course graph (see `CompactCourse`) back to back, the dependents of every concept across courses, and a topological order of the whole catalog. Concept content is stored apart from the records, as the UTF-8 bodies back to back with an array of offsets.
+
+At startup the file is memory-mapped: the arrays and the content are used in place (so their pages are shared by every worker process mapping the same file), and only the IDs and courses are decoded. A course's concept records are decoded the first time something reads them, and the whole-catalog graph, topological order and prerequisite closure are only built once needed, so cold start does not grow with the number of concepts beyond their IDs. Nothing is re-checked for references or cycles.
+
+Each snapshot records a fingerprint of its sources and of the model schemas. `open_catalog` only uses a snapshot whose fingerprint matches, and otherwise falls back to loading and validating the sources.
+
+Layout: an 8-byte magic, a little-endian u32 header length, a JSON header listing each section's offset and length, then the sections, each aligned to 8 bytes.
+
+Usage:
+    python -m backend.snapshot catalog.snap [--concepts concepts.jsonl --courses courses.jsonl]
+"""
+
+from __future__ import annotations
+
+import argparse
+import fcntl
+import gc
+import hashlib
+import json
+import logging
+import mmap
+import os
+import struct
+import sys
+import threading
+from array import array
+from bisect import bisect_right
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Final, Literal
+
+import networkx as nx
+from pydantic import TypeAdapter
+
+from backend import sample_data
+from backend.catalog import (
+    Catalog,
+    CatalogEdit,
+    CatalogStore,
+    LazyMapping,
+    validate_records,
+)
+from backend.content import ContentStore
+from backend.graph.builder import build_graph
+from backend.graph.compact import NODE_TYPECODE, OFFSET_TYPECODE, CompactCourse
+from backend.ingest import load_catalog
+from backend.models.concepts import Concept
+from backend.models.courses import Course
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"NXSNAP\x00\x01"
+FORMAT_VERSION = 4
+ALIGNMENT = 8
+
+# Section name -> typecode of the array stored in it. Concept i is the i-th of the "ids" section. Course k holds concepts course_offsets[k]:course_offsets[k + 1], whose records span bytes record_offsets[k]:record_offsets[k + 1] of the "concepts" section. The offsets of a concept's course edges are absolute, and their targets are numbered within the concept's course; its dependents in any course are the concepts dependents[dependent_offsets[i]:dependent_offsets[i + 1]].
+ARRAY_SECTIONS: dict[str, Literal["i", "q"]] = {
+    "course_offsets": OFFSET_TYPECODE,
+    "record_offsets": OFFSET_TYPECODE,
+    "out_offsets": OFFSET_TYPECODE,
+    "out_targets": NODE_TYPECODE,
+    "in_offsets": OFFSET_TYPECODE,
+    "in_sources": NODE_TYPECODE,
+    "dependent_offsets": OFFSET_TYPECODE,
+    "dependents": NODE_TYPECODE,
+    "topological": NODE_TYPECODE,
+}
+# Body i of the content section spans content_offsets[i]:content_offsets[i + 1], for concept i.
+CONTENT_OFFSETS_TYPECODE: Final = OFFSET_TYPECODE
+
+_concepts_adapter = TypeAdapter(list[Concept])
+_courses_adapter = TypeAdapter(list[Course])
+_strings_adapter = TypeAdapter(list[str])
+
+
+class SnapshotError(ValueError):
+    """Raised when a file is not a readable catalog snapshot."""
+
+
+def source_fingerprint(paths: Iterable[Path]) -> str:
+    """Fingerprint the catalog sources together with the snapshot format and model schemas.
+
+    Any change to a source file, to the `Concept`/`Course` models or to the format makes the fingerprint, and thus every existing snapshot, stale.
+
+    Args:
+        paths (Iterable[Path]): The source files the catalog is loaded from.
+
+    Returns:
+        str: A hex digest.
+    """
+    digest = hashlib.sha256(f"{FORMAT_VERSION}".encode())
+    for model in (Concept, Course):
+        digest.update(json.dumps(model.model_json_schema(), sort_keys=True).encode())
+    for path in paths:
+        with path.open("rb") as f:
+            digest.update(hashlib.file_digest(f, "sha256").digest())
+    return digest.hexdigest()
+
+
+def catalog_sources(
+    concepts_path: Path | None = None,
+    courses_path: Path | None = None,
+) -> list[Path]:
+    """Return the files a catalog is loaded from: the JSONL exports if given, else the sample data module."""
+    if concepts_path and courses_path:
+        return [concepts_path, courses_path]
+    return [Path(sample_data.__file__)]
+
+
+def load_sources(
+    concepts_path: Path | None = None,
+    courses_path: Path | None = None,
+) -> tuple[list[Concept], list[Course]]:
+    """Load and validate the catalog from its sources: the JSONL exports if given, else the sample data.
+
+    Raises:
+        IngestError: If an export contains invalid records.
+        ValueError: If the sample data is invalid.
+    """
+    if concepts_path and courses_path:
+        return load_catalog(concepts_path, courses_path)
+    return validate_records(sample_data.concepts, sample_data.courses)
+
+
+def write_snapshot(
+    path: Path,
+    concepts: Iterable[Concept],
+    courses: Iterable[Course],
+    fingerprint: str,
+) -> None:
+    """Compile a validated catalog into a snapshot file.
+
+    The file is written next to `path` and renamed over it, so processes never map a half-written snapshot.
+
+    Args:
+        path (Path): The snapshot file to write.
+        concepts (Iterable[Concept]): The validated concepts.
+        courses (Iterable[Course]): The validated courses.
+        fingerprint (str): The `source_fingerprint` of the sources the catalog was loaded from.
+
+    Raises:
+        ValueError: If a prerequisite does not exist.
+        CycleError: If the prerequisites form a cycle.
+    """
+    concepts = list(concepts)
+    graph = build_graph(concepts)
+    by_course: dict[str, list[Concept]] = {}
+    for c in concepts:
+        by_course.setdefault(c.course_id, []).append(c)
+    graphs = [CompactCourse.from_concepts(members) for members in by_course.values()]
+    ids = [n for g in graphs for n in g.ids]
+    records = [c for g in graphs for c in g.concepts]
+    index = {n: i for i, n in enumerate(ids)}
+
+    arrays = {name: array(typecode) for name, typecode in ARRAY_SECTIONS.items()}
+    arrays["course_offsets"].append(0)
+    arrays["record_offsets"].append(0)
+    chunks = []
+    for g in graphs:
+        arrays["course_offsets"].append(arrays["course_offsets"][-1] + len(g))
+        chunks.append(_concepts_adapter.dump_json([c.model_copy(update={"content": ""}) for c in g.concepts]))
+        arrays["record_offsets"].append(arrays["record_offsets"][-1] + len(chunks[-1]))
+        for offsets, targets in (("out_offsets", "out_targets"), ("in_offsets", "in_sources")):
+            base = len(arrays[targets])
+            arrays[offsets].extend(o + base for o in getattr(g, offsets)[:-1])
+            arrays[targets].extend(getattr(g, targets))
+    for offsets, targets in (("out_offsets", "out_targets"), ("in_offsets", "in_sources")):
+        arrays[offsets].append(len(arrays[targets]))
+    dependents: list[list[int]] = [[] for _ in ids]
+    for c in concepts:
+        for prereq_id in dict.fromkeys(c.prerequisites):
+            dependents[index[prereq_id]].append(index[c.id])
+    arrays["dependent_offsets"].append(0)
+    for successors in dependents:
+        arrays["dependents"].extend(successors)
+        arrays["dependent_offsets"].append(len(arrays["dependents"]))
+    arrays["topological"].extend(index[n] for n in nx.topological_sort(graph))
+
+    bodies = [c.content.encode() for c in records]
+    content_offsets = array(CONTENT_OFFSETS_TYPECODE, [0])
+    for body in bodies:
+        content_offsets.append(content_offsets[-1] + len(body))
+    sections: dict[str, bytes] = {
+        "ids": json.dumps(ids).encode(),
+        "course_ids": json.dumps(list(by_course)).encode(),
+        "concepts": b"".join(chunks),
+        "content": b"".join(bodies),
+        "content_offsets": content_offsets.tobytes(),
+        "courses": _courses_adapter.dump_json(
+            [c.model_copy(update={"concepts": []}) for c in courses],
+        ),
+    }
+    for name, values in arrays.items():
+        sections[name] = values.tobytes()
+
+    # Sections start after the header, whose size depends on the offsets; lay them out relative to the data start first.
+    layout: dict[str, list[int]] = {}
+    offset = 0
+    for name, data in sections.items():
+        layout[name] = [offset, len(data)]
+        offset += _padded(len(data))
+    header = {"format": FORMAT_VERSION, "fingerprint": fingerprint, "sections": layout}
+    header_bytes = json.dumps(header).encode()
+    data_start = _padded(len(MAGIC) + 4 + len(header_bytes))
+
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with tmp.open("wb") as f:
+        f.write(MAGIC + struct.pack("<I", len(header_bytes)) + header_bytes)
+        f.write(b"\0" * (data_start - f.tell()))
+        for data in sections.values():
+            f.write(data + b"\0" * (_padded(len(data)) - len(data)))
+    os.replace(tmp, path)
+
+
+def build_snapshot(
+    path: Path,
+    concepts_path: Path | None = None,
+    courses_path: Path | None = None,
+) -> tuple[int, int]:
+    """Load and validate the catalog sources and compile them into a snapshot.
+
+    Args:
+        path (Path): The snapshot file to write.
+        concepts_path (Path | None, optional): The JSONL file of concepts; with `courses_path`, replaces the sample data. Defaults to None.
+        courses_path (Path | None, optional): The JSONL file of courses. Defaults to None.
+
+    Returns:
+        tuple[int, int]: The number of concepts and courses written.
+
+    Raises:
+        IngestError: If an export contains invalid records.
+        ValueError: If a prerequisite does not exist.
+        CycleError: If the prerequisites form a cycle.
+    """
+    concepts, courses = load_sources(concepts_path, courses_path)
+    fingerprint = source_fingerprint(catalog_sources(concepts_path, courses_path))
+    write_snapshot(path, concepts, courses, fingerprint)
+    return len(concepts), len(courses)
+
+
+class CatalogSnapshot:
+    """A memory-mapped catalog snapshot."""
+
+    def __init__(self, path: Path) -> None:
+        """Map a snapshot file and read its header.
+
+        Args:
+            path (Path): The snapshot file.
+
+        Raises:
+            OSError: If the file cannot be opened.
+            SnapshotError: If the file is not a snapshot of the current format.
+        """
+        self.path = path
+        with path.open("rb") as f:
+            self.identity = _identity(os.fstat(f.fileno()))
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[: len(MAGIC)] != MAGIC:
+            raise SnapshotError(f"{path} is not a catalog snapshot")
+        (header_length,) = struct.unpack_from("<I", self._mmap, len(MAGIC))
+        start = len(MAGIC) + 4
+        header: dict[str, Any] = json.loads(self._mmap[start : start + header_length])
+        if header.get("format") != FORMAT_VERSION:
+            raise SnapshotError(f"{path} has unsupported format {header.get('format')}")
+        self.fingerprint: str = header["fingerprint"]
+        self._data_start = _padded(start + header_length)
+        self._sections: dict[str, list[int]] = header["sections"]
+
+    def section(self, name: str) -> memoryview:
+        """Return a zero-copy view of one section of the file."""
+        offset, length = self._sections[name]
+        start = self._data_start + offset
+        return memoryview(self._mmap)[start : start + length]
+
+    def arrays(self) -> dict[str, memoryview]:
+        """Return zero-copy views of the snapshot's array sections, by name."""
+        return {name: self.section(name).cast(typecode) for name, typecode in ARRAY_SECTIONS.items()}
+
+    def content(self, ids: list[str]) -> ContentStore:
+        """Return a content store reading the snapshot's content section in place.
+
+        Args:
+            ids (list[str]): The snapshot's concept IDs.
+
+        Returns:
+            ContentStore: The store; bodies added later go to a private file, never to the snapshot.
+        """
+        offsets = self.section("content_offsets").cast(CONTENT_OFFSETS_TYPECODE)
+        return ContentStore.from_buffer(self.section("content"), ids, offsets)
+
+    def courses(self) -> list[Course]:
+        """Decode the snapshot's courses."""
+        return _courses_adapter.validate_json(self.section("courses").tobytes())
+
+    def catalog(self, version: int = 1) -> Catalog:
+        """Build a `Catalog` over lazy views of the snapshot, without rechecking the graph.
+
+        Only the IDs and courses are decoded here. The concept records of a course are decoded the first time one of them, or the course's graph, is read; edges are read from the mapped arrays.
+
+        Args:
+            version (int, optional): The catalog version number. Defaults to 1.
+
+        Returns:
+            Catalog: The catalog stored in the snapshot.
+        """
+        ids = _strings_adapter.validate_json(self.section("ids").tobytes())
+        course_ids = _strings_adapter.validate_json(self.section("course_ids").tobytes())
+        arrays = self.arrays()
+        course_offsets, record_offsets = arrays["course_offsets"], arrays["record_offsets"]
+        dependent_offsets, dependent_targets = arrays["dependent_offsets"], arrays["dependents"]
+        records = self.section("concepts")
+        index = {n: i for i, n in enumerate(ids)}
+        positions = {course_id: k for k, course_id in enumerate(course_ids)}
+
+        def course_concepts(course_id: str) -> list[Concept]:
+            k = positions[course_id]
+            return _concepts_adapter.validate_json(records[record_offsets[k] : record_offsets[k + 1]].tobytes())
+
+        by_course = LazyMapping(positions, course_concepts)
+
+        def concept(concept_id: str) -> Concept:
+            i = index[concept_id]
+            k = bisect_right(course_offsets, i) - 1
+            return by_course[course_ids[k]][i - course_offsets[k]]
+
+        def dependents(concept_id: str) -> list[str]:
+            i = index[concept_id]
+            return [ids[j] for j in dependent_targets[dependent_offsets[i] : dependent_offsets[i + 1]]]
+
+        def course_graph(course_id: str) -> CompactCourse:
+            k = positions[course_id]
+            start, end = course_offsets[k], course_offsets[k + 1]
+            return CompactCourse(
+                ids[start:end],
+                by_course[course_id],
+                arrays["out_offsets"][start : end + 1],
+                arrays["out_targets"],
+                arrays["in_offsets"][start : end + 1],
+                arrays["in_sources"],
+            )
+
+        topological = arrays["topological"]
+        return Catalog.from_views(
+            LazyMapping(index, concept),
+            by_course,
+            LazyMapping(index, dependents),
+            LazyMapping(positions, course_graph),
+            self.courses(),
+            version,
+            self.content(ids),
+            order=lambda: map(ids.__getitem__, topological),
+        )
+
+
+def open_catalog(
+    snapshot_path: Path | None,
+    concepts_path: Path | None = None,
+    courses_path: Path | None = None,
+) -> Catalog:
+    """Load the catalog from a snapshot if it is up to date, else from its sources.
+
+    Args:
+        snapshot_path (Path | None): The snapshot file, or None to always load the sources.
+        concepts_path (Path | None, optional): The JSONL file of concepts; with `courses_path`, replaces the sample data. Defaults to None.
+        courses_path (Path | None, optional): The JSONL file of courses. Defaults to None.
+
+    Returns:
+        Catalog: The loaded catalog.
+
+    Raises:
+        IngestError: If the snapshot is missing or stale and an export contains invalid records.
+    """
+    with _gc_paused():
+        return _open_catalog(snapshot_path, concepts_path, courses_path)
+
+
+def _open_catalog(
+    snapshot_path: Path | None,
+    concepts_path: Path | None,
+    courses_path: Path | None,
+) -> Catalog:
+    if snapshot_path is not None:
+        try:
+            snapshot = CatalogSnapshot(snapshot_path)
+        except FileNotFoundError:
+            logger.warning("Catalog snapshot %s not found; validating sources", snapshot_path)
+        except (OSError, SnapshotError) as err:
+            logger.warning("Catalog snapshot unreadable (%s); validating sources", err)
+        else:
+            fingerprint = source_fingerprint(catalog_sources(concepts_path, courses_path))
+            if snapshot.fingerprint == fingerprint:
+                return snapshot.catalog()
+            logger.warning("Catalog snapshot %s is stale; validating sources", snapshot_path)
+    return Catalog(*load_sources(concepts_path, courses_path))
+
+
+class SnapshotWatcher:
+    """Hot-swaps a store's catalog whenever its snapshot file is replaced, and writes the store's edits back to it.
+
+    Rebuilding the snapshot (e.g. with `python -m backend.snapshot`) renames a new file over the old one. Every worker process polls the path, maps the new file, builds a catalog from it on the side and swaps it in with `CatalogStore.install`. Requests already running keep the previous catalog, whose mapping stays valid until it is released, since the replaced file lives on as long as it is mapped.
+
+    A replaced snapshot is always installed, without comparing its fingerprint to the sources: it is the newer catalog.
+
+    Edits made through `edit` are shared the same way: the worker applying one first catches up with the file, then rewrites the snapshot from the edited catalog before swapping it in, so the other workers install it on their next poll. Workers writing the snapshot (`edit` and `rebuild`) serialize on an advisory lock file next to it, so no edit is lost to a concurrent write. Edits survive restarts for as long as the sources do not change; a rebuild from changed sources discards them.
+    """
+
+    def __init__(self, store: CatalogStore, path: Path, interval: float = 5.0) -> None:
+        """Watch a snapshot path.
+
+        The file present now is assumed to be reflected by the store already: either it was loaded at startup, or it was stale and deliberately skipped.
+
+        Args:
+            store (CatalogStore): The store to install new catalogs into.
+            path (Path): The snapshot file to watch.
+            interval (float, optional): Seconds between polls. Defaults to 5.
+        """
+        self.store = store
+        self.path = path
+        self.interval = interval
+        self._identity = _stat_identity(path)
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def check(self) -> bool:
+        """Install the snapshot if the file changed since it was last seen.
+
+        Returns:
+            bool: True if a new catalog was installed.
+        """
+        with self._lock:
+            return self._check()
+
+    def edit(self, edit: CatalogEdit) -> set[str]:
+        """Apply an edit to the store's catalog and write the edited catalog to the snapshot for every other worker.
+
+        Writing the snapshot re-encodes the whole catalog, so an edit takes time proportional to the catalog size.
+
+        Args:
+            edit (CatalogEdit): The edit, e.g. `lambda catalog: catalog.add_concept(concept)`.
+
+        Returns:
+            set[str]: The IDs of the courses whose content changed.
+
+        Raises:
+            OSError: If the snapshot cannot be written; the current catalog is left in place.
+            Exception: Whatever `edit` raises; the current catalog and the snapshot are left in place.
+        """
+
+        def write_through(catalog: Catalog) -> tuple[Catalog, set[str]]:
+            edited, affected = edit(catalog)
+            if affected:
+                write_snapshot(
+                    self.path,
+                    (edited.with_content(c, cached=False) for c in edited.concepts.values()),
+                    edited.courses.values(),
+                    self._fingerprint(),
+                )
+                self._identity = _stat_identity(self.path)
+            return edited, affected
+
+        with self._lock, _file_locked(self.path):
+            self._check()
+            return self.store.edit(write_through)
+
+    def rebuild(self, concepts_path: Path | None = None, courses_path: Path | None = None) -> Catalog:
+        """Rebuild the snapshot from the catalog sources and install it in this worker at once. See `build_snapshot`.
+
+        Returns:
+            Catalog: The store's catalog, built from the new snapshot.
+        """
+        with self._lock, _file_locked(self.path):
+            build_snapshot(self.path, concepts_path, courses_path)
+            self._check()
+            return self.store.current
+
+    def _fingerprint(self) -> str:
+        # Edits keep the fingerprint of the sources the snapshot was built from, so a restart from the same sources keeps them.
+        try:
+            return CatalogSnapshot(self.path).fingerprint
+        except (OSError, SnapshotError):
+            return ""
+
+    def _check(self) -> bool:
+        identity = _stat_identity(self.path)
+        if identity is None or identity == self._identity:
+            return False
+        try:
+            snapshot = CatalogSnapshot(self.path)
+        except (OSError, SnapshotError) as err:
+            logger.warning("Catalog snapshot unreadable (%s); keeping current catalog", err)
+            self._identity = identity
+            return False
+        self._identity = snapshot.identity
+        with _gc_paused():
+            catalog = self.store.install(snapshot.catalog)
+        logger.info("Installed catalog version %d from %s", catalog.version, self.path)
+        return True
+
+    def start(self) -> None:
+        """Start polling in a background thread."""
+        if self._thread is None:
+            self._stopped.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="snapshot-watcher", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop polling."""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            try:
+                self.check()
+            except Exception:
+                logger.exception("Failed to install catalog snapshot %s", self.path)
+
+
+def _identity(st: os.stat_result) -> tuple[int, int, int, int]:
+    return st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns
+
+
+def _stat_identity(path: Path) -> tuple[int, int, int, int] | None:
+    try:
+        return _identity(path.stat())
+    except FileNotFoundError:
+        return None
+
+
+@contextmanager
+def _file_locked(path: Path) -> Iterator[None]:
+    # The lock file is never replaced, unlike the snapshot, so every process locks the same inode.
+    with path.with_name(f".{path.name}.lock").open("a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+@contextmanager
+def _gc_paused() -> Iterator[None]:
+    # Loading allocates many long-lived objects and no garbage; collections triggered meanwhile would rescan the growing heap for nothing.
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _padded(n: int) -> int:
+    return -(-n // ALIGNMENT) * ALIGNMENT
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Build a catalog snapshot from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("output", type=Path, help="snapshot file to write")
+    parser.add_argument("--concepts", type=Path, help="JSONL file of concepts")
+    parser.add_argument("--courses", type=Path, help="JSONL file of courses")
+    args = parser.parse_args(argv)
+    if bool(args.concepts) != bool(args.courses):
+        parser.error("--concepts and --courses must be given together")
+
+    concepts, courses = build_snapshot(args.output, args.concepts, args.courses)
+    print(f"{concepts} concepts, {courses} courses -> {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,272 @@
+"""Load test that drives the app with many concurrent simulated users.
+
+Each user signs up once, then repeatedly runs a realistic session: log in, fetch /me, list courses, search as they type, open a course graph and read a few concepts. Requests go through an in-process ASGI transport by default, so event-loop stalls and threadpool saturation inside the app show up in the latencies; pass `--url` to target a running server (e.g. uvicorn on loopback) instead.
+
+The report lists requests/sec and p50/p95/p99 latency per route. With `--budgets`, the run fails if the checked-in budgets are exceeded.
+
+Usage:
+    python -m benchmarks.loadtest --users 50 --duration 20 --budgets benchmarks/loadtest_budgets.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+os.environ.setdefault("JWT_SECRET_KEY", "loadtest-secret-key-with-at-least-32-bytes")
+
+CONCEPTS_PER_SESSION = 3
+SEARCH_MIN_CHARS = 2
+
+
+class Recorder:
+    """Collects per-route latencies and status codes."""
+
+    def __init__(self) -> None:
+        """Create an empty recorder."""
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.statuses: dict[str, dict[int, int]] = defaultdict(lambda: defaultdict(int))
+        self.errors: dict[str, int] = defaultdict(int)
+
+    async def request(
+        self,
+        client: httpx.AsyncClient,
+        route: str,
+        method: str,
+        url: str,
+        **kwargs: Any,
+    ) -> httpx.Response | None:
+        """Send a request and record its latency under `route`.
+
+        Args:
+            client (httpx.AsyncClient): The client to send with.
+            route (str): The route template to aggregate under, e.g. "GET /concepts/{id}".
+            method (str): The HTTP method.
+            url (str): The concrete URL.
+            **kwargs (Any): Extra arguments for `httpx.AsyncClient.request`.
+
+        Returns:
+            httpx.Response | None: The response, or None if the request failed to complete.
+        """
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.errors[route] += 1
+            return None
+        self.latencies[route].append(time.perf_counter() - start)
+        self.statuses[route][response.status_code] += 1
+        if response.status_code >= 500:
+            self.errors[route] += 1
+        return response
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Return the nearest-rank percentile `q` (0-100) of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(q / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+async def run_user(
+    client: httpx.AsyncClient,
+    recorder: Recorder,
+    user_index: int,
+    deadline: float,
+    rng: random.Random,
+) -> None:
+    """Sign up one simulated user and run sessions until the deadline."""
+    username = f"loadtest-{os.getpid()}-{user_index}"
+    password = f"password-{user_index}"
+    await client.post("/signup", json={"username": username, "password": password})
+
+    while time.perf_counter() < deadline:
+        client.cookies.clear()
+        response = await recorder.request(
+            client,
+            "POST /login",
+            "POST",
+            "/login",
+            data={"username": username, "password": password},
+        )
+        token = response.cookies.get("access_token") if response else None
+        if token is None:
+            await asyncio.sleep(0.05)
+            continue
+        # The cookie is marked Secure; set it explicitly so it is also sent over plain HTTP.
+        client.cookies.set("access_token", token)
+
+        await recorder.request(client, "GET /me", "GET", "/me")
+        response = await recorder.request(client, "GET /courses", "GET", "/courses")
+        if response is None or response.status_code != 200:
+            continue
+        courses = [c for c in response.json()["items"] if c["concept_count"]]
+        if not courses:
+            continue
+        course_id = rng.choice(courses)["id"]
+
+        # Search-as-you-type: one request per keystroke of a word from the course description.
+        words = rng.choice(courses)["description"].split() or ["a"]
+        word = rng.choice(words)
+        for end in range(SEARCH_MIN_CHARS, len(word) + 1):
+            await recorder.request(
+                client, "GET /search", "GET", "/search", params={"q": word[:end]}
+            )
+
+        response = await recorder.request(
+            client, "GET /courses/{id}/graph", "GET", f"/courses/{course_id}/graph"
+        )
+        if response is None or response.status_code != 200:
+            continue
+        nodes = response.json()["nodes"]
+        for node in rng.sample(nodes, min(CONCEPTS_PER_SESSION, len(nodes))):
+            await recorder.request(
+                client,
+                "GET /concepts/{id}",
+                "GET",
+                f"/concepts/{node['id']}",
+                params={"fields": "content"},
+            )
+
+
+async def run(args: argparse.Namespace) -> tuple[Recorder, float]:
+    """Run the load test.
+
+    Args:
+        args (argparse.Namespace): The parsed command line options.
+
+    Returns:
+        tuple[Recorder, float]: The recorded requests and the wall-clock duration in seconds.
+    """
+    if args.url:
+        transport: httpx.AsyncBaseTransport = httpx.AsyncHTTPTransport(retries=0)
+        base_url = args.url
+        shutdown = None
+    else:
+        from backend import app as app_module
+
+        transport = httpx.ASGITransport(app=app_module.app)
+        base_url = "http://testserver"
+        shutdown = app_module.password_hasher.shutdown
+
+    recorder = Recorder()
+    rng = random.Random(args.seed)
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    start = time.perf_counter()
+    deadline = start + args.duration
+    try:
+        clients = [
+            httpx.AsyncClient(
+                transport=transport, base_url=base_url, limits=limits, timeout=30
+            )
+            for _ in range(args.users)
+        ]
+        await asyncio.gather(
+            *(
+                run_user(client, recorder, i, deadline, random.Random(rng.random()))
+                for i, client in enumerate(clients)
+            ),
+        )
+        for client in clients:
+            await client.aclose()
+    finally:
+        if shutdown is not None:
+            shutdown()
+    return recorder, time.perf_counter() - start
+
+
+def summarize(recorder: Recorder, elapsed: float) -> dict[str, Any]:
+    """Aggregate recorded requests into throughput and latency percentiles per route."""
+    routes = {}
+    total = 0
+    for route, latencies in sorted(recorder.latencies.items()):
+        latencies.sort()
+        total += len(latencies)
+        routes[route] = {
+            "requests": len(latencies),
+            "rps": len(latencies) / elapsed,
+            "p50_ms": percentile(latencies, 50) * 1e3,
+            "p95_ms": percentile(latencies, 95) * 1e3,
+            "p99_ms": percentile(latencies, 99) * 1e3,
+            "errors": recorder.errors.get(route, 0),
+            "statuses": dict(recorder.statuses[route]),
+        }
+    errors = sum(recorder.errors.values())
+    return {
+        "duration_s": elapsed,
+        "requests": total,
+        "rps": total / elapsed,
+        "error_rate": errors / total if total else 0.0,
+        "routes": routes,
+    }
+
+
+def check_budgets(summary: dict[str, Any], budgets: dict[str, Any]) -> list[str]:
+    """Return a description of every budget the run exceeded.
+
+    Budgets look like `{"min_rps": 100, "max_error_rate": 0.01, "routes": {"GET /me": {"p95_ms": 20}}}`; every key is optional.
+    """
+    violations = []
+    if "min_rps" in budgets and summary["rps"] < budgets["min_rps"]:
+        violations.append(f"throughput {summary['rps']:.1f} rps < {budgets['min_rps']}")
+    if "max_error_rate" in budgets and summary["error_rate"] > budgets["max_error_rate"]:
+        violations.append(
+            f"error rate {summary['error_rate']:.2%} > {budgets['max_error_rate']:.2%}",
+        )
+    for route, limits in budgets.get("routes", {}).items():
+        stats = summary["routes"].get(route)
+        if stats is None:
+            violations.append(f"{route}: no requests recorded")
+            continue
+        for key, limit in limits.items():
+            if stats[key] > limit:
+                violations.append(f"{route}: {key} {stats[key]:.1f} > {limit}")
+    return violations
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the load test from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds")
+    parser.add_argument("--url", help="target a running server instead of the in-process app")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--budgets", type=Path, help="JSON file of budgets to enforce")
+    parser.add_argument("--output", type=Path, help="write the summary to this JSON file")
+    args = parser.parse_args(argv)
+
+    summary = summarize(*asyncio.run(run(args)))
+
+    print(f"{'route':<26} {'reqs':>7} {'rps':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errs':>5}")
+    for route, stats in summary["routes"].items():
+        print(
+            f"{route:<26} {stats['requests']:>7} {stats['rps']:>8.1f} {stats['p50_ms']:>8.2f}"
+            f" {stats['p95_ms']:>8.2f} {stats['p99_ms']:>8.2f} {stats['errors']:>5}",
+        )
+    print(f"{'total':<26} {summary['requests']:>7} {summary['rps']:>8.1f}")
+
+    if args.output:
+        args.output.write_text(json.dumps(summary, indent=2))
+
+    if args.budgets:
+        violations = check_budgets(summary, json.loads(args.budgets.read_text()))
+        if violations:
+            print("Budgets exceeded:\n" + "\n".join(violations), file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,250 @@
+"""Benchmark suite for the catalog hot paths, run against a synthetic catalog.
+
+Times catalog validation, graph build, search indexing and queries, learner progress, course subgraph extraction and layout, CourseGraph construction and serialization, and each catalog endpoint through FastAPI's TestClient. Results are written as JSON so runs can be compared; with `--compare`, the run fails if any benchmark's median is slower than the baseline by more than `--threshold`.
+
+Usage:
+    python -m benchmarks.run --concepts 20000 --courses 50 --output results.json
+    python -m benchmarks.run --compare results.json --threshold 0.2
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from benchmarks.synthetic import generate_catalog
+
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret-key-with-at-least-32-bytes")
+
+
+def measure(fn: Callable[[], object], repeat: int) -> dict[str, float]:
+    """Time a callable `repeat` times.
+
+    Args:
+        fn (Callable[[], object]): The code to time.
+        repeat (int): The number of timed runs.
+
+    Returns:
+        dict[str, float]: The median and minimum run time in seconds, and the number of runs.
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return {"median": statistics.median(times), "min": min(times), "runs": repeat}
+
+
+def run_suite(args: argparse.Namespace) -> dict[str, dict[str, float]]:
+    """Generate a catalog and run every benchmark on it.
+
+    Args:
+        args (argparse.Namespace): The parsed command line options.
+
+    Returns:
+        dict[str, dict[str, float]]: The timings of each benchmark, by name.
+    """
+    from fastapi.testclient import TestClient
+
+    from backend import app as app_module
+    from backend.auth import create_access_token, user_repository
+    from backend.catalog import Catalog, validate_records
+    from backend.graph.builder import build_graph
+    from backend.graph.compact import CompactGraph
+    from backend.graph.layout import layered_layout
+    from backend.models.graph import CourseGraph
+    from backend.progress import ConceptInterner, LearnerProgress
+    from backend.search import SearchIndex
+    from backend.snapshot import CatalogSnapshot, write_snapshot
+
+    raw_concepts, raw_courses = generate_catalog(
+        args.courses, args.concepts, fan_in=args.fan_in, seed=args.seed
+    )
+    repeat = args.repeat
+    results: dict[str, dict[str, float]] = {}
+
+    def bench(name: str, fn: Callable[[], object], runs: int = repeat) -> None:
+        results[name] = measure(fn, runs)
+        print(f"{name:<28} {results[name]['median'] * 1e3:10.3f} ms", file=sys.stderr)
+
+    bench("validate_records", lambda: validate_records(raw_concepts, raw_courses), 1)
+    concepts, courses = validate_records(raw_concepts, raw_courses)
+    bench("build_graph", lambda: build_graph(concepts), max(1, repeat // 5))
+    bench("build_catalog", lambda: Catalog(concepts, courses), 1)
+    catalog = Catalog(concepts, courses)
+    bench("build_compact", lambda: CompactGraph.from_concepts(concepts), max(1, repeat // 5))
+    with tempfile.TemporaryDirectory() as tmp:
+        snapshot_path = Path(tmp) / "catalog.snap"
+        write_snapshot(snapshot_path, concepts, courses, "benchmark")
+        bench("load_snapshot", lambda: CatalogSnapshot(snapshot_path).catalog(), 1)
+
+    course_id = courses[0].id
+    bench("build_search_index", lambda: SearchIndex(concepts), 1)
+    search_index = catalog.search_index
+    bench("search_term", lambda: search_index.search("limit"))
+    bench("search_terms", lambda: search_index.search("limit derivative integral"))
+    bench("search_prefix", lambda: search_index.search("deriv", prefix=True))
+    bench("search_course", lambda: search_index.search("limit", course_id=course_id))
+
+    interner = ConceptInterner()
+    course_concepts = [c.id for c in catalog.concepts_in_course(course_id)]
+    completed = course_concepts[: len(course_concepts) // 2]
+    bench("progress_load", lambda: LearnerProgress(catalog, interner, completed))
+    progress = LearnerProgress(catalog, interner, completed)
+    bench("progress_frontier", lambda: progress.frontier(catalog, course_id))
+
+    content_id = concepts[-1].id
+    bench("content_read", lambda: catalog.get_content(content_id, cached=False))
+    bench("content_cached", lambda: catalog.get_content(content_id))
+
+    def course_subgraph(catalog: Catalog) -> tuple[list[str], list[tuple[str, str]]]:
+        course = catalog.compact.course(course_id)
+        return (list(course.ids), course.edges()) if course is not None else ([], [])
+
+    bench("subgraph_compact", lambda: course_subgraph(catalog))
+    # An edit only rebuilds the graph of the course it touched.
+    edited = next(c for c in catalog.concepts_in_course(course_id) if c.prerequisites)
+    bench(
+        "edit_subgraph",
+        lambda: course_subgraph(catalog.remove_prerequisite(edited.id, edited.prerequisites[0])[0]),
+    )
+
+    node_ids, edges = course_subgraph(catalog)
+    subG = catalog.graph.subgraph(node_ids).copy()
+    bench("layout", lambda: layered_layout(node_ids, edges), max(1, repeat // 5))
+    layout = layered_layout(node_ids, edges)
+    # A new concept depending on the last one only changes the bottom layers.
+    grown = ([*node_ids, "new"], [*edges, (node_ids[-1], "new")])
+    bench("layout_incremental", lambda: layered_layout(*grown, layout), max(1, repeat // 5))
+
+    bench("from_networkx", lambda: CourseGraph.from_networkx(course_id, subG))
+    bench("from_compact", lambda: CourseGraph.from_compact(course_id, catalog.compact))
+    course_graph = CourseGraph.from_compact(course_id, catalog.compact)
+    bench("serialize_course_graph", course_graph.model_dump_json)
+
+    store = app_module.CATALOG
+    original = store.current
+    store.reload(concepts, courses)
+    try:
+        user = user_repository.get_by_username("johndoe")
+        assert user is not None
+        with TestClient(app_module.app) as client:
+            client.cookies.set(
+                "access_token", create_access_token({"sub": str(user.id)})
+            )
+            concept_id = store.current.concepts_in_course(course_id)[-1].id
+
+            def cold_graph() -> None:
+                app_module.RESPONSE_CACHE.clear()
+                client.get(f"/courses/{course_id}/graph")
+
+            bench("endpoint_graph_uncached", cold_graph)
+            bench("endpoint_graph_cached", lambda: client.get(f"/courses/{course_id}/graph"))
+            bench("endpoint_courses", lambda: client.get("/courses"))
+            bench("endpoint_course", lambda: client.get(f"/courses/{course_id}"))
+            bench("endpoint_concept", lambda: client.get(f"/concepts/{concept_id}"))
+            bench("endpoint_path", lambda: client.get(f"/concepts/{concept_id}/path"))
+
+            def cold_layers() -> None:
+                app_module.RESPONSE_CACHE.clear()
+                client.get(f"/courses/{course_id}/graph/layers")
+
+            def cold_neighborhood() -> None:
+                app_module.RESPONSE_CACHE.clear()
+                client.get(f"/concepts/{concept_id}/neighborhood", params={"up": 2, "down": 2})
+
+            bench("endpoint_layers_uncached", cold_layers)
+            bench("endpoint_neighbors_uncached", cold_neighborhood)
+            bench("endpoint_search", lambda: client.get("/search", params={"q": "limit deriv"}))
+            batch_ids = [c.id for c in store.current.concepts_in_course(course_id)[:100]]
+            bench(
+                "endpoint_concepts_batch",
+                lambda: client.post("/concepts:batch", json={"ids": batch_ids}),
+            )
+    finally:
+        store.reload(
+            [original.with_content(c, cached=False) for c in original.concepts.values()],
+            original.courses.values(),
+        )
+
+    return results
+
+
+def compare(
+    results: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+    threshold: float,
+) -> list[str]:
+    """Compare a run against a baseline.
+
+    Args:
+        results (dict[str, dict[str, float]]): The timings of this run.
+        baseline (dict[str, dict[str, float]]): The timings of the baseline run.
+        threshold (float): The allowed relative slowdown, e.g. 0.2 for 20%.
+
+    Returns:
+        list[str]: A description of each benchmark that regressed beyond the threshold.
+    """
+    regressions = []
+    for name, timing in results.items():
+        base = baseline.get(name)
+        if base is None or base["median"] == 0:
+            continue
+        ratio = timing["median"] / base["median"]
+        print(f"{name:<28} {ratio:8.2f}x", file=sys.stderr)
+        if ratio > 1 + threshold:
+            regressions.append(
+                f"{name}: {base['median'] * 1e3:.3f} ms -> {timing['median'] * 1e3:.3f} ms ({ratio:.2f}x)",
+            )
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the benchmark suite from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--courses", type=int, default=20)
+    parser.add_argument("--concepts", type=int, default=10_000)
+    parser.add_argument("--fan-in", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--output", type=Path, help="write results to this JSON file")
+    parser.add_argument("--compare", type=Path, help="baseline JSON file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    results = run_suite(args)
+    report: dict[str, Any] = {
+        "params": {
+            "courses": args.courses,
+            "concepts": args.concepts,
+            "fan_in": args.fan_in,
+            "seed": args.seed,
+        },
+        "python": platform.python_version(),
+        "results": results,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        if baseline.get("params") != report["params"]:
+            print("warning: baseline was run with different parameters", file=sys.stderr)
+        regressions = compare(results, baseline["results"], args.threshold)
+        if regressions:
+            print("Regressions:\n" + "\n".join(regressions), file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+"""Seeded generator of large synthetic catalogs for benchmarks."""
+
+from __future__ import annotations
+
+import random
+from collections.abc import Mapping
+from typing import Any
+
+WORDS = (
+    "limit derivative integral series vector matrix function graph proof set "
+    "probability sequence field group ring space transform equation model rate"
+).split()
+
+
+def generate_catalog(
+    num_courses: int,
+    num_concepts: int,
+    fan_in: int = 3,
+    cross_course: float = 0.05,
+    content_words: int = 50,
+    seed: int = 0,
+) -> tuple[list[Mapping[str, Any]], list[Mapping[str, Any]]]:
+    """Generate a random catalog whose prerequisites form a DAG.
+
+    Concepts are spread evenly over courses. Each concept picks up to `fan_in` prerequisites among the concepts generated before it, which guarantees acyclicity; most come from its own course, and a `cross_course` fraction from any earlier concept.
+
+    Args:
+        num_courses (int): The number of courses.
+        num_concepts (int): The total number of concepts.
+        fan_in (int, optional): The maximum number of prerequisites per concept. Defaults to 3.
+        cross_course (float, optional): The probability that a prerequisite comes from another course. Defaults to 0.05.
+        content_words (int, optional): The number of words in each concept's content. Defaults to 50.
+        seed (int, optional): The random seed. Defaults to 0.
+
+    Returns:
+        tuple[list[Mapping[str, Any]], list[Mapping[str, Any]]]: Raw concept and course records, in the same shape as `backend.sample_data`.
+    """
+    rng = random.Random(seed)
+    course_ids = [f"course{i}" for i in range(num_courses)]
+    by_course: dict[str, list[str]] = {c: [] for c in course_ids}
+    all_ids: list[str] = []
+    concepts: list[Mapping[str, Any]] = []
+
+    for i in range(num_concepts):
+        concept_id = f"concept{i}"
+        course_id = course_ids[i % num_courses]
+        siblings = by_course[course_id]
+
+        prerequisites: set[str] = set()
+        for _ in range(rng.randint(0, fan_in)):
+            pool = all_ids if rng.random() < cross_course else siblings
+            if pool:
+                prerequisites.add(rng.choice(pool))
+
+        concepts.append(
+            {
+                "id": concept_id,
+                "name": f"Concept {i}",
+                "description": " ".join(rng.choices(WORDS, k=8)),
+                "course_id": course_id,
+                "prerequisites": sorted(prerequisites),
+                "content": " ".join(rng.choices(WORDS, k=content_words)),
+            },
+        )
+        siblings.append(concept_id)
+        all_ids.append(concept_id)
+
+    courses: list[Mapping[str, Any]] = [
+        {
+            "id": course_id,
+            "name": f"Course {i}",
+            "description": f"Synthetic course {i}.",
+            "concepts": [],
+        }
+        for i, course_id in enumerate(course_ids)
+    ]
+    return concepts, courses
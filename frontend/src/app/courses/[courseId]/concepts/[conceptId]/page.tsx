@@ -12,7 +12,7 @@ export default function ConceptPage() {
     const [error, setError] = useState<string | null>(null);
 
     useEffect(() => {
-        fetch(`http://localhost:8000/concepts/${conceptId}`, {
+        fetch(`http://localhost:8000/concepts/${conceptId}?fields=content`, {
             credentials: "include",
         })
             .then((r) => r.json())
@@ -13,7 +13,7 @@ export default function CoursePage() {
     const [error, setError] = useState<string | null>(null);
 
     useEffect(() => {
-        fetch(`http://localhost:8000/courses/${courseId}`, {
+        fetch(`http://localhost:8000/courses/${courseId}?fields=concepts`, {
             credentials: "include",
         })
             .then((r) => r.json())
@@ -53,7 +53,7 @@ export default function CoursePage() {
                         {course.description}
                     </p>
                 )}
-                {course?.concepts?.length > 0 && (
+                {course?.concepts && course.concepts.length > 0 && (
                     <ul className="flex flex-wrap gap-2 mt-4">
                         {course.concepts.map((c) => (
                             <li
@@ -2,23 +2,36 @@
 
 import { useEffect, useState } from "react";
 import CoursesList from "@/components/CoursesList";
-import type { Course } from "@/types/course";
+import type { CoursePage, CourseSummary } from "@/types/course";
 import PageLayout from "@/components/PageLayout";
 
 export default function CoursesPage() {
-    const [courses, setCourses] = useState<Course[]>([]);
+    const [courses, setCourses] = useState<CourseSummary[]>([]);
     const [loading, setLoading] = useState(true);
     const [error, setError] = useState<string | null>(null);
 
     useEffect(() => {
-        fetch("http://localhost:8000/courses", {
-            credentials: "include",
-        })
-            .then((r) => {
-                if (!r.ok) throw new Error(`${r.status} - ${r.statusText}`);
-                return r.json();
-            })
-            .then((data: Course[]) => {
+        const fetchPage = async (cursor: string | null) => {
+            const url = new URL("http://localhost:8000/courses");
+            if (cursor) url.searchParams.set("cursor", cursor);
+            const r = await fetch(url, { credentials: "include" });
+            if (!r.ok) throw new Error(`${r.status} - ${r.statusText}`);
+            return (await r.json()) as CoursePage;
+        };
+
+        const fetchAll = async () => {
+            const all: CourseSummary[] = [];
+            let cursor: string | null = null;
+            do {
+                const page = await fetchPage(cursor);
+                all.push(...page.items);
+                cursor = page.next_cursor;
+            } while (cursor);
+            return all;
+        };
+
+        fetchAll()
+            .then((data) => {
                 setCourses(data);
                 setLoading(false);
             })
@@ -1,7 +1,7 @@
 import Link from "next/link";
-import type { Course } from "@/types/course";
+import type { CourseSummary } from "@/types/course";
 
-export default function CoursesList({ courses }: { courses: Course[] }) {
+export default function CoursesList({ courses }: { courses: CourseSummary[] }) {
     if (courses.length === 0) {
         return <div className="text-gray-600">No courses available.</div>;
     }
@@ -4,12 +4,24 @@ export interface Concept {
     description: string;
     course_id: string;
     prerequisites: string[];
-    content: string;
+    content?: string;
 }
 
 export interface Course {
     id: string;
     name: string;
     description: string;
-    concepts: Concept[];
+    concepts?: Concept[];
+}
+
+export interface CourseSummary {
+    id: string;
+    name: string;
+    description: string;
+    concept_count: number;
+}
+
+export interface CoursePage {
+    items: CourseSummary[];
+    next_cursor: string | null;
 }
@@ -0,0 +1,17 @@
+import os
+
+from backend.models.concepts import Concept
+
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret-key-with-at-least-32-bytes")
+os.environ.setdefault("ADMIN_USERNAMES", "admin")
+
+
+def make_concept(id: str, course_id: str, prerequisites: list[str]) -> Concept:
+    return Concept(
+        id=id,
+        name=id,
+        description=f"concept {id}",
+        course_id=course_id,
+        prerequisites=prerequisites,
+        content=f"content {id}",
+    )
@@ -0,0 +1,396 @@
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend import app as app_module
+from backend import sample_data
+from backend.auth import create_access_token, user_repository
+from backend.metrics import REQUESTS
+from backend.models.users import UserInDB
+
+
+def login_as(client: TestClient, username: str) -> TestClient:
+    user = user_repository.get_by_username(username)
+    if user is None:
+        user = UserInDB(id=uuid4(), username=username, hashed_password="unused")
+        user_repository.add(user)
+    client.cookies.set("access_token", create_access_token({"sub": str(user.id)}))
+    return client
+
+
+@pytest.fixture
+def client():
+    with TestClient(app_module.app) as client:
+        yield login_as(client, "johndoe")
+
+
+@pytest.fixture
+def admin():
+    with TestClient(app_module.app) as client:
+        yield login_as(client, "admin")
+
+
+@pytest.fixture(autouse=True)
+def restore_catalog():
+    # Edits patch the current catalog in place, so keep the records rather than the catalog.
+    catalog = app_module.CATALOG.current
+    concepts = [catalog.with_content(c) for c in catalog.concepts.values()]
+    courses = list(catalog.courses.values())
+    yield
+    app_module.CATALOG.reload(concepts, courses)
+
+
+def test_course_graph_is_served_from_cache(client):
+    first = client.get("/courses/calculus1/graph")
+    hits = app_module.RESPONSE_CACHE.hits
+    second = client.get("/courses/calculus1/graph")
+
+    assert first.status_code == 200
+    assert first.content == second.content
+    assert app_module.RESPONSE_CACHE.hits == hits + 1
+    # Resident concepts do not hold their content, so it is left out rather than served empty.
+    assert "content" not in first.json()["nodes"][0]["concept"]
+    with_content = client.get("/courses/calculus1/graph?fields=content").json()
+    assert all(node["concept"]["content"] for node in with_content["nodes"])
+    assert client.get("/courses/precalculus/graph").status_code == 404
+
+
+def test_admin_edits_update_graph(client, admin):
+    client.get("/courses/calculus1/graph")
+
+    concept = {
+        "id": "lhopital",
+        "name": "L'Hopital's Rule",
+        "description": "Evaluating indeterminate limits with derivatives.",
+        "course_id": "calculus1",
+        "prerequisites": ["limits", "derivatives"],
+        "content": "lim f/g = lim f'/g' for 0/0 or inf/inf forms.",
+    }
+    assert client.post("/admin/concepts", json=concept).status_code == 403
+    assert admin.post("/admin/concepts", json=concept).status_code == 201
+
+    links = client.get("/courses/calculus1/graph").json()["links"]
+    assert {"source": "derivatives", "target": "lhopital"} in links
+
+    response = admin.put("/admin/concepts/limits/prerequisites/lhopital")
+    assert response.status_code == 409
+    response = admin.delete("/admin/concepts/lhopital/prerequisites/limits")
+    assert response.json()["prerequisites"] == ["derivatives"]
+
+    assert admin.delete("/admin/concepts/lhopital").status_code == 204
+    assert client.get("/concepts/lhopital").status_code == 404
+    assert admin.delete("/admin/concepts/lhopital").status_code == 404
+
+
+def test_learning_path_is_in_study_order(client, admin):
+    response = client.get("/concepts/related_rates/path")
+
+    ids = [c["id"] for c in response.json()["prerequisites"]]
+    assert ids[0] == "limits"
+    assert set(ids) == {"limits", "derivatives", "chain_rule", "implicit_diff"}
+    assert ids.index("chain_rule") < ids.index("implicit_diff")
+    assert client.get("/concepts/missing/path").status_code == 404
+
+    admin.put("/admin/concepts/chain_rule/prerequisites/continuity")
+    ids = [c["id"] for c in client.get("/concepts/related_rates/path").json()["prerequisites"]]
+    assert "continuity" in ids
+
+
+def test_prerequisite_check_follows_the_closure(client, admin):
+    def check(concept_id, prereq_id):
+        response = client.get(f"/concepts/{concept_id}/prerequisites/{prereq_id}")
+        return response.json()["is_prerequisite"] if response.status_code == 200 else response.status_code
+
+    assert check("related_rates", "limits") is True
+    assert check("limits", "related_rates") is False
+    assert check("related_rates", "continuity") is False
+    assert check("related_rates", "missing") == 404
+
+    admin.put("/admin/concepts/chain_rule/prerequisites/continuity")
+    assert check("related_rates", "continuity") is True
+
+
+def test_course_listing_is_paginated_summaries(client):
+    first = client.get("/courses", params={"limit": 1}).json()
+
+    assert first["items"] == [
+        {
+            "id": "calculus1",
+            "name": "Calculus 1",
+            "description": "A basic calculus 1 course.",
+            "concept_count": 8,
+        }
+    ]
+    second = client.get("/courses", params={"cursor": first["next_cursor"]}).json()
+    assert [c["id"] for c in second["items"]] == ["precalculus"]
+    assert second["next_cursor"] is None
+
+
+def test_field_projection(client):
+    assert "concepts" not in client.get("/courses/calculus1").json()
+
+    course = client.get("/courses/calculus1", params={"fields": "concepts"}).json()
+    assert len(course["concepts"]) == 8
+    assert "content" not in course["concepts"][0]
+
+    course = client.get(
+        "/courses/calculus1", params={"fields": "concepts,concepts.content"}
+    ).json()
+    assert course["concepts"][0]["content"] == sample_data.concepts[0]["content"]
+    implied = client.get("/courses/calculus1", params={"fields": "concepts.content"})
+    assert implied.json() == course
+
+    assert "content" not in client.get("/concepts/limits").json()
+    assert client.get("/concepts/limits?fields=content").json()["content"].startswith("A limit")
+    path = client.get("/concepts/derivatives/path").json()
+    assert [c["id"] for c in path["prerequisites"]] == ["limits"]
+    assert "content" not in path["prerequisites"][0]
+    layers = client.get("/courses/calculus1/graph/layers?fields=content").json()
+    assert layers["layers"][0]["nodes"][0]["concept"]["content"] != ""
+    assert client.get("/concepts/limits?fields=secret").status_code == 400
+
+
+def test_requests_report_server_timing_and_metrics(client):
+    route = "/courses/{course_id}/graph"
+    before = REQUESTS.value("GET", route, "200")
+    response = client.get("/courses/calculus1/graph")
+
+    assert response.status_code == 200
+    assert "auth;dur=" in response.headers["server-timing"]
+    assert REQUESTS.value("GET", route, "200") == before + 1
+
+    text = client.get("/metrics").text
+    assert f'http_request_duration_seconds_count{{method="GET",route="{route}"}}' in text
+    assert "response_cache_hits" in text
+    assert "session_cache_hit_rate" in text
+
+
+def test_admin_controls_profiler(client, admin):
+    assert client.put("/admin/profiler", json={"every": 1}).status_code == 403
+    assert admin.put("/admin/profiler", json={}).status_code == 400
+
+    status = admin.put("/admin/profiler", json={"every": 1, "interval_ms": 1}).json()
+    assert status["enabled"]
+    try:
+        client.get("/courses/calculus1/graph")
+        assert admin.get("/admin/profiler").json()["profiled_requests"] >= 1
+    finally:
+        assert not admin.delete("/admin/profiler").json()["enabled"]
+
+    response = admin.get("/admin/profiler/stacks", params={"reset": True})
+    assert response.status_code == 200
+    assert "profile.folded" in response.headers["content-disposition"]
+    assert admin.get("/admin/profiler").json()["samples"] == 0
+
+
+def test_admin_reloads_catalog(client, admin):
+    assert client.post("/admin/catalog/reload").status_code == 403
+
+    before = admin.get("/admin/catalog").json()
+    after = admin.post("/admin/catalog/reload").json()
+    assert after["version"] == before["version"] + 1
+    assert after["concepts"] == before["concepts"]
+
+
+@pytest.mark.parametrize(
+    "url",
+    ["/courses", "/courses/calculus1", "/courses/calculus1/graph", "/concepts/limits"],
+)
+def test_catalog_responses_support_conditional_requests(client, url):
+    first = client.get(url)
+    etag = first.headers["etag"]
+    assert first.headers["cache-control"] == "private, no-cache"
+
+    second = client.get(url, headers={"If-None-Match": f'W/"other", {etag}'})
+    assert second.status_code == 304
+    assert second.content == b""
+    assert second.headers["etag"] == etag
+
+    assert client.get(url, headers={"If-None-Match": '"other"'}).status_code == 200
+
+
+def test_etags_change_with_catalog_edits(client, admin):
+    course_etag = client.get("/courses/calculus1?fields=concepts").headers["etag"]
+    summary_etag = client.get("/courses/calculus1").headers["etag"]
+    listing_etag = client.get("/courses").headers["etag"]
+
+    admin.delete("/admin/concepts/limits")
+
+    response = client.get(
+        "/courses/calculus1?fields=concepts", headers={"If-None-Match": course_etag}
+    )
+    assert response.status_code == 200
+    assert response.headers["etag"] != course_etag
+    # The content-derived ETag only changes when the projected body does.
+    response = client.get("/courses/calculus1", headers={"If-None-Match": summary_etag})
+    assert response.status_code == 304
+    assert client.get("/courses", headers={"If-None-Match": listing_etag}).status_code == 200
+
+
+@pytest.mark.parametrize("encoding", ["gzip", "zstd"])
+def test_course_graph_is_served_precompressed(client, encoding):
+    if encoding == "zstd":
+        pytest.importorskip("zstandard")
+    identity = client.get("/courses/calculus1/graph", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in identity.headers
+    assert identity.headers["vary"].split(", ").count("Accept-Encoding") == 1
+
+    compressed = client.get("/courses/calculus1/graph", headers={"Accept-Encoding": encoding})
+    assert compressed.headers["content-encoding"] == encoding
+    assert compressed.content == identity.content
+    assert compressed.headers["etag"] != identity.headers["etag"]
+
+    revalidated = client.get(
+        "/courses/calculus1/graph",
+        headers={"Accept-Encoding": encoding, "If-None-Match": compressed.headers["etag"]},
+    )
+    assert revalidated.status_code == 304
+
+
+def test_identity_etag_is_weak_when_the_middleware_may_compress(client):
+    strong = client.get("/courses/calculus1/graph", headers={"Accept-Encoding": "gzip"}).headers["etag"]
+    # The negotiation refuses gzip at q=0, but GZipMiddleware still compresses the identity body.
+    response = client.get("/courses/calculus1/graph", headers={"Accept-Encoding": "gzip;q=0"})
+    assert response.headers["content-encoding"] == "gzip"
+    etag = response.headers["etag"]
+    assert etag.startswith("W/") and etag != strong
+
+    revalidated = client.get(
+        "/courses/calculus1/graph",
+        headers={"Accept-Encoding": "gzip;q=0", "If-None-Match": etag},
+    )
+    assert revalidated.status_code == 304
+
+
+def test_uncached_responses_are_compressed_on_the_fly(client):
+    response = client.get("/concepts/fundamental_theorem/path", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    if len(response.content) >= 1024:
+        assert response.headers["content-encoding"] == "gzip"
+
+
+def test_search_concepts(client, admin):
+    response = client.get("/search", params={"q": "fundamental theorem"})
+    assert response.status_code == 200
+    assert response.json()["items"][0]["id"] == "fundamental_theorem"
+
+    ids = [hit["id"] for hit in client.get("/search", params={"q": "deriv"}).json()["items"]]
+    assert "derivatives" in ids
+    assert client.get("/search", params={"q": "deriv", "prefix": False}).json()["items"] == []
+
+    response = client.get("/search", params={"q": "limits", "course_id": "statistics"})
+    assert response.status_code == 404
+    assert client.get("/search", params={"q": ""}).status_code == 422
+
+    concept = {
+        "id": "lhopital",
+        "name": "L'Hopital's Rule",
+        "description": "Evaluating indeterminate limits with derivatives.",
+        "course_id": "calculus1",
+        "prerequisites": ["limits"],
+        "content": "lim f/g = lim f'/g' for 0/0 forms.",
+    }
+    assert admin.post("/admin/concepts", json=concept).status_code == 201
+    hits = client.get("/search", params={"q": "indeterminate", "course_id": "calculus1"}).json()["items"]
+    assert [hit["id"] for hit in hits] == ["lhopital"]
+
+    assert admin.delete("/admin/concepts/lhopital").status_code == 204
+    assert client.get("/search", params={"q": "indeterminate"}).json()["items"] == []
+
+
+
+def test_progress_frontier(client):
+    login_as(client, f"learner-{uuid4()}")
+
+    response = client.get("/courses/calculus1/frontier")
+    assert response.json() == {"course_id": "calculus1", "completed": 0, "total": 8, "frontier": ["limits"]}
+
+    response = client.post("/concepts/limits/complete")
+    assert response.status_code == 200
+    assert set(response.json()["unlocked"]) == {"continuity", "derivatives"}
+    client.post("/concepts/derivatives/complete")
+
+    frontier = client.get("/courses/calculus1/frontier").json()
+    assert frontier["completed"] == 2
+    assert set(frontier["frontier"]) == {"continuity", "chain_rule", "integrals"}
+
+    assert client.post("/concepts/missing/complete").status_code == 404
+    assert client.get("/courses/statistics/frontier").status_code == 404
+
+
+def test_course_graph_includes_layout_on_request(client):
+    assert client.get("/courses/calculus1/graph").json()["layout"] is None
+    graph = client.get("/courses/calculus1/graph?layout=true").json()
+    positions = {node["id"]: node for node in graph["layout"]["nodes"]}
+
+    assert positions.keys() == {node["id"] for node in graph["nodes"]}
+    for link in graph["links"]:
+        assert positions[link["source"]]["layer"] < positions[link["target"]]["layer"]
+    assert positions["limits"]["layer"] == 0
+
+
+def test_concept_neighborhood(client):
+    response = client.get("/concepts/derivatives/neighborhood", params={"up": 1, "down": 1})
+    assert response.status_code == 200
+    body = response.json()
+    ids = {node["id"] for node in body["nodes"]}
+    assert ids == {"limits", "derivatives", "chain_rule", "implicit_diff", "related_rates", "integrals", "fundamental_theorem"}
+    assert {"source": "limits", "target": "derivatives"} in body["links"]
+    assert "content" not in body["nodes"][0]["concept"]
+    assert not body["truncated"]
+
+    body = client.get("/concepts/limits/neighborhood?up=0&down=0&fields=content").json()
+    assert [node["id"] for node in body["nodes"]] == ["limits"]
+    assert body["nodes"][0]["concept"]["content"].startswith("A limit")
+
+    assert client.get("/concepts/limits/neighborhood?up=9").status_code == 422
+    assert client.get("/concepts/missing/neighborhood").status_code == 404
+
+
+def test_course_graph_layers_are_paged(client):
+    loaded: list[str] = []
+    links = []
+    cursor = None
+    while True:
+        params = {"limit": 2} if cursor is None else {"limit": 2, "cursor": cursor}
+        page = client.get("/courses/calculus1/graph/layers", params=params).json()
+        for layer in page["layers"]:
+            loaded.extend(node["id"] for node in layer["nodes"])
+        links.extend(page["links"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    graph = client.get("/courses/calculus1/graph").json()
+    assert sorted(loaded) == sorted(node["id"] for node in graph["nodes"])
+    assert loaded[0] == "limits"
+    for link in links:
+        assert loaded.index(link["source"]) < loaded.index(link["target"])
+    assert len(links) == len(graph["links"])
+
+    assert client.get("/courses/calculus1/graph/layers?cursor=x").status_code == 400
+    assert client.get("/courses/statistics/graph/layers").status_code == 404
+
+
+
+def test_batch_concept_fetch(client):
+    response = client.get("/concepts", params={"ids": "limits,missing,derivatives,limits"})
+    assert response.status_code == 200
+    body = response.json()
+    assert [c["id"] for c in body["items"]] == ["limits", "derivatives"]
+    assert body["not_found"] == ["missing"]
+    assert "content" not in body["items"][0]
+    assert client.get("/concepts?ids=limits&fields=content").json()["items"][0]["content"].startswith("A limit")
+
+    response = client.post("/concepts:batch", json={"ids": ["integrals", "nope"], "fields": ["content"]})
+    assert response.status_code == 200
+    assert [c["id"] for c in response.json()["items"]] == ["integrals"]
+    assert response.json()["items"][0]["content"].startswith("The integral")
+    assert response.json()["not_found"] == ["nope"]
+
+    too_many = [f"c{i}" for i in range(101)]
+    assert client.get("/concepts", params={"ids": ",".join(too_many)}).status_code == 400
+    assert client.post("/concepts:batch", json={"ids": too_many}).status_code == 422
+    assert client.get("/concepts?ids=,").status_code == 400
+    assert client.post("/concepts:batch", json={"ids": ["limits"], "fields": ["secret"]}).status_code == 400
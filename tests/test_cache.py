@@ -0,0 +1,36 @@
+from backend.cache import ResponseCache, content_etag
+
+
+def test_response_cache_hit_and_miss():
+    cache = ResponseCache(max_bytes=100)
+
+    assert cache.get("course1", 1) is None
+    cache.put("course1", 1, b"{}")
+
+    entry = cache.get("course1", 1)
+    assert entry.body == b"{}"
+    assert entry.etag == content_etag(b"{}")
+    assert cache.get("course1", 2) is None
+    assert (cache.hits, cache.misses) == (1, 2)
+
+    cache.discard("course1")
+    assert cache.get("course1", 1) is None
+
+
+def test_response_cache_evicts_least_recently_used_by_size():
+    cache = ResponseCache(max_bytes=10)
+    cache.put("a", 1, b"aaaa")
+    cache.put("b", 1, b"bbbb")
+    cache.get("a", 1)
+    cache.put("c", 1, b"cccc")
+
+    assert cache.get("b", 1) is None
+    assert cache.get("a", 1).body == b"aaaa"
+    assert cache.size == 8
+    assert cache.evictions == 1
+
+    assert cache.put("big", 1, b"x" * 11).etag == content_etag(b"x" * 11)
+    assert cache.get("big", 1) is None
+
+    cache.clear()
+    assert len(cache) == 0 and cache.size == 0
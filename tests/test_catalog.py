@@ -0,0 +1,142 @@
+import pytest
+
+from backend.graph.toposort import CycleError
+
+from backend.catalog import Catalog, CatalogStore
+from backend.models.courses import Course
+from conftest import make_concept
+
+
+concepts = [
+    make_concept("A", "course1", []),
+    make_concept("B", "course1", ["A"]),
+    make_concept("C", "course2", ["A"]),
+]
+
+courses = [
+    Course(id="course1", name="Course 1", description="first", concepts=[]),
+    Course(id="course2", name="Course 2", description="second", concepts=[]),
+    Course(id="course3", name="Course 3", description="empty", concepts=[]),
+]
+
+
+def test_catalog_indexes():
+    catalog = Catalog(concepts, courses)
+
+    # Resident concepts leave their content in the content store.
+    assert catalog.get_concept("B") == concepts[1].model_copy(update={"content": ""})
+    assert catalog.with_content(catalog.get_concept("B")) == concepts[1]
+    assert catalog.get_content("C", cached=False) == "content C"
+    assert catalog.get_concept("Z") is None
+    assert [c.id for c in catalog.get_course("course1").concepts] == ["A", "B"]
+    assert catalog.get_course("course1").concepts[0] is catalog.get_concept("A")
+    assert catalog.compact.course("course1").concepts[0] is catalog.get_concept("A")
+    assert catalog.concepts_in_course("course3") == []
+    assert sorted(catalog.dependents_of("A")) == ["B", "C"]
+    assert set(catalog.graph.edges) == {("A", "B"), ("A", "C")}
+    assert catalog.compact.course("course2").ids == ["C"]
+
+
+def test_catalog_rejects_duplicate_ids():
+    with pytest.raises(ValueError, match="Duplicate concept ID A"):
+        Catalog([concepts[0], concepts[0]], courses)
+
+
+def test_store_reload_swaps_atomically():
+    store = CatalogStore(Catalog(concepts, courses))
+    old = store.current
+    seen = []
+    store.subscribe(lambda catalog, course_ids: seen.append((catalog, course_ids)))
+
+    new = store.reload(concepts[:1], courses[:1])
+
+    assert store.current is new
+    assert new.version == old.version + 1
+    assert seen == [(new, None)]
+    assert old.get_concept("B") is not None
+    assert new.get_concept("B") is None
+    # The new version is indexed for search before it is served.
+    assert old._search_index is not None and new._search_index is not None
+
+    with pytest.raises(ValueError):
+        store.reload([make_concept("X", "course1", ["missing"])], courses)
+    assert store.current is new
+
+
+def test_store_edits_swap_in_edited_copies():
+    store = CatalogStore(Catalog(concepts, courses))
+    catalog = store.current
+    seen = []
+    store.subscribe(lambda catalog, course_ids: seen.append(course_ids))
+    before = catalog.course_version("course1")
+    assert [c.id for c, _ in catalog.search("concept A")][0] == "A"
+    assert catalog.compact.course("course3") is None
+    course2 = catalog.compact.course("course2")
+
+    assert store.add_concept(make_concept("D", "course1", ["B"])) == {"course1"}
+    assert store.current.compact.course("course2") is course2
+    assert store.add_prerequisite("C", "D") == {"course2"}
+    edited = store.current
+    assert edited is not catalog
+    assert edited.get_concept("C").prerequisites == ["A", "D"]
+    assert edited.get_course("course1").concepts[-1].id == "D"
+    assert edited.compact.course("course1").edges() == [("A", "B"), ("B", "D")]
+    assert [c.id for c, _ in edited.search("content D")][0] == "D"
+    assert edited.get_content("D") == "content D"
+    assert edited.with_content(edited.get_concept("C")).content == "content C"
+    assert edited.course_version("course1") != before
+    assert edited.learning_path("C") == [edited.concepts[n] for n in ("A", "B", "D")]
+
+    # The previous version is left exactly as it was.
+    assert catalog.get_concept("D") is None
+    assert catalog.get_concept("C").prerequisites == ["A"]
+    assert [c.id for c in catalog.get_course("course1").concepts] == ["A", "B"]
+    assert catalog.compact.course("course1").edges() == [("A", "B")]
+    assert catalog.dependents_of("B") == []
+    assert [c.id for c in catalog.learning_path("C")] == ["A"]
+    assert catalog.course_version("course1") == before
+
+    with pytest.raises(CycleError):
+        store.add_prerequisite("A", "C")
+    assert store.current is edited
+    assert not edited.graph.has_edge("C", "A")
+    assert edited.get_concept("A").prerequisites == []
+
+    assert store.remove_concept("B") == {"course1"}
+    assert store.current.get_concept("D").prerequisites == []
+    assert store.current.dependents_of("A") == ["C"]
+    assert "B" not in store.current.compact.course("course1").ids
+    assert store.current.search("B") == []
+    assert store.current.get_content("B") == ""
+    assert edited.get_concept("D").prerequisites == ["B"]
+
+    assert store.remove_prerequisite("C", "A") == {"course2"}
+    with pytest.raises(KeyError):
+        store.remove_prerequisite("C", "A")
+    assert seen == [{"course1"}, {"course2"}, {"course1"}, {"course2"}]
+
+
+def test_neighborhood_crosses_courses_in_topological_order():
+    catalog = Catalog([*concepts, make_concept("D", "course2", ["C", "B"])], courses)
+
+    nodes, edges, truncated = catalog.neighborhood("D", up=2, down=0)
+    assert nodes == ["A", "C", "B", "D"]
+    assert edges == [("A", "B"), ("A", "C"), ("C", "D"), ("B", "D")]
+    assert not truncated
+
+    assert catalog.neighborhood("A", up=3, down=0) == (["A"], [], False)
+    nodes, _, truncated = catalog.neighborhood("A", up=0, down=2, max_nodes=2)
+    assert nodes == ["A", "B"] and truncated
+    with pytest.raises(KeyError):
+        catalog.neighborhood("missing", 1, 1)
+
+
+def test_add_concept_validates_references():
+    catalog = Catalog(concepts, courses)
+
+    with pytest.raises(KeyError):
+        catalog.add_concept(make_concept("X", "nope", []))
+    with pytest.raises(ValueError, match="Prerequisite Z not found"):
+        catalog.add_concept(make_concept("X", "course1", ["Z"]))
+    with pytest.raises(ValueError, match="Duplicate"):
+        catalog.add_concept(make_concept("A", "course1", []))
@@ -0,0 +1,44 @@
+import gzip
+
+import pytest
+
+from backend.compression import (MIN_COMPRESS_BYTES, compress_variants,
+                                 negotiate, variant_etag)
+
+
+def test_compress_variants_skips_small_bodies():
+    assert compress_variants(b"{}") == {}
+
+    body = b'{"content": "' + b"limit " * MIN_COMPRESS_BYTES + b'"}'
+    variants = compress_variants(body)
+    assert gzip.decompress(variants["gzip"]) == body
+    assert all(len(v) < len(body) for v in variants.values())
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        (None, None),
+        ("", None),
+        ("gzip", "gzip"),
+        ("gzip, deflate, br", "gzip"),
+        ("br", None),
+        ("gzip;q=0", None),
+        ("*", "zstd"),
+        ("gzip;q=1.0, zstd;q=0.5", "gzip"),
+        ("zstd, gzip", "zstd"),
+        ("*;q=0.1, gzip;q=0", "zstd"),
+    ],
+)
+def test_negotiate(header, expected):
+    assert negotiate(header, {"gzip", "zstd"}) == expected
+
+
+def test_negotiate_only_picks_available_variants():
+    assert negotiate("zstd, gzip;q=0.5", {"gzip"}) == "gzip"
+    assert negotiate("gzip", {}) is None
+
+
+def test_variant_etag():
+    assert variant_etag('"abc"', None) == '"abc"'
+    assert variant_etag('"abc"', "gzip") == '"abc-gzip"'
@@ -0,0 +1,51 @@
+from array import array
+
+from backend.content import ContentStore
+
+
+def test_content_store_appends_and_reads_back():
+    store = ContentStore(cache_size=2)
+    store.extend([("a", "alpha"), ("b", "béta"), ("empty", "")])
+    store.put("c", "gamma")
+
+    assert len(store) == 4
+    assert store.get("a") == "alpha"
+    assert store.get("b") == "béta"
+    assert store.get("empty") == ""
+    assert store.read("c") == "gamma"
+    assert store.get("missing") is None
+    assert "missing" not in store
+
+
+def test_content_store_lru_and_replacement():
+    store = ContentStore(cache_size=2)
+    store.extend([("a", "alpha"), ("b", "beta"), ("c", "gamma")])
+
+    store.get("a")
+    store.get("a")
+    assert store.hits == 1
+    store.get("b")
+    store.get("c")
+    assert store.stats()["cached"] == 2
+    store.get("a")
+    assert store.hits == 1
+
+    store.put("a", "alpha, revised")
+    assert store.get("a") == "alpha, revised"
+    store.discard("a")
+    assert store.get("a") is None
+    assert store.stats()["bytes"] == len("alphabetagammaalpha, revised")
+
+
+def test_content_store_over_buffer():
+    bodies = [b"first", b"", "sécond".encode()]
+    offsets = array("q", [0, 5, 5, 5 + len(bodies[2])])
+    store = ContentStore.from_buffer(memoryview(b"".join(bodies)), ["x", "y", "z"], offsets)
+
+    assert store.get("x") == "first"
+    assert store.get("y") == ""
+    assert store.get("z") == "sécond"
+
+    store.put("x", "replaced")
+    assert store.get("x") == "replaced"
+    assert store.read("z") == "sécond"
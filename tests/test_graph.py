@@ -1,21 +1,35 @@
+import random
+from itertools import pairwise
 from typing import List
 
+import networkx as nx
 import pytest
 
 from backend.graph.builder import build_graph
+from backend.graph.closure import PrerequisiteClosure
+from backend.graph.compact import CompactCourse, CompactGraph
+from backend.graph.layout import LayoutCache, layered_layout, longest_path_layers
+from backend.graph.toposort import CycleError, IncrementalTopologicalOrder
 from backend.graph.utils import get_course_subgraph
 from backend.models.concepts import Concept
-from backend.models.graph import ConceptEdge, ConceptNode, CourseGraph
+from backend.models.graph import (ConceptEdge, ConceptNode, CourseGraph,
+                                  CourseGraphPage, GraphLayout)
 
 valid_concepts: List[Concept] = [
     Concept(
-        id="A", name="A", course_id="course1", description="concept A", prerequisites=[]
+        id="A",
+        name="A",
+        course_id="course1",
+        description="concept A",
+        content="content A",
+        prerequisites=[],
     ),
     Concept(
         id="B",
         name="B",
         course_id="course1",
         description="concept B",
+        content="content B",
         prerequisites=["A"],
     ),
     Concept(
@@ -23,6 +37,7 @@ valid_concepts: List[Concept] = [
         name="C",
         course_id="course1",
         description="concept C",
+        content="content C",
         prerequisites=["A", "B"],
     ),
     Concept(
@@ -30,6 +45,7 @@ valid_concepts: List[Concept] = [
         name="D",
         course_id="course2",
         description="concept D",
+        content="content D",
         prerequisites=[],
     )
 ]
@@ -61,6 +77,7 @@ def test_build_graph_raises_on_missing_prereq():
             name="A",
             course_id="course",
             description="concept A",
+            content="content A",
             prerequisites=["Z"],
         ),
     ]
@@ -112,3 +129,240 @@ def test_coursegraph_from_networkx():
     assert sorted(course_graph.nodes, key=lambda n: n.id) == expected_nodes
 
     assert sorted(course_graph.links, key=lambda link: (link.source, link.target)) == sorted(valid_prereq_edges, key=lambda e: (e.source, e.target))
+
+
+def test_build_graph_raises_on_cycle():
+    concepts = [
+        c.model_copy(update={"prerequisites": ["C"]}) if c.id == "A" else c
+        for c in valid_concepts
+    ]
+
+    with pytest.raises(CycleError, match="Prerequisite cycle found"):
+        build_graph(concepts)
+
+
+def test_incremental_topological_order():
+    G = build_graph(valid_concepts)
+    order = IncrementalTopologicalOrder(G)
+
+    def assert_valid():
+        for u, v in G.edges:
+            assert order.position(u) < order.position(v)
+
+    def add_edge(u, v):
+        order.add_edge(u, v)
+        G.add_edge(u, v)
+
+    G.add_node("E")
+    order.add_node("E")
+    add_edge("A", "E")
+    assert_valid()
+
+    # D may sit anywhere in the initial order; depending on C must move it after C.
+    add_edge("C", "D")
+    add_edge("D", "E")
+    assert_valid()
+    assert order.order().index("D") > order.order().index("C")
+
+    with pytest.raises(CycleError):
+        add_edge("E", "B")
+    with pytest.raises(CycleError):
+        add_edge("B", "B")
+    assert not G.has_edge("E", "B")
+    assert_valid()
+
+
+def test_compact_graph_matches_networkx():
+    G = build_graph(valid_concepts)
+    compact = CompactGraph.from_concepts(valid_concepts)
+
+    for course_id in ("course1", "course2"):
+        course = compact.course(course_id)
+        nodes, edges = course.ids, course.edges()
+        subG = get_course_subgraph(G, course_id)
+        assert set(nodes) == set(subG.nodes)
+        assert set(edges) == set(subG.edges)
+        assert all(nodes.index(u) < nodes.index(v) for u, v in edges)
+
+        assert course.number_of_edges == subG.number_of_edges()
+        for i, n in enumerate(course.ids):
+            assert course.concepts[i] is G.nodes[n]["concept"]
+            assert sorted(course.ids[j] for j in course.out_neighbors(i)) == sorted(subG.successors(n))
+            assert sorted(course.ids[j] for j in course.in_neighbors(i)) == sorted(subG.predecessors(n))
+
+    assert compact.course("missing") is None
+
+
+def test_compact_graph_rebuilds_only_invalidated_courses():
+    by_course = {"course1": valid_concepts[:3], "course2": valid_concepts[3:]}
+    loads = []
+
+    def load(course_id):
+        loads.append(course_id)
+        return CompactCourse.from_concepts(by_course[course_id])
+
+    compact = CompactGraph(load)
+    course1, course2 = compact.course("course1"), compact.course("course2")
+    assert compact.course("course1") is course1
+    assert loads == ["course1", "course2"]
+
+    by_course["course1"] = valid_concepts[:2]
+    edited = compact.invalidated({"course1"}, load)
+    assert edited.course("course2") is course2
+    assert edited.course("course1").edges() == [("A", "B")]
+    assert compact.course("course1") is course1
+    assert loads == ["course1", "course2", "course1"]
+
+
+def test_coursegraph_from_compact_matches_from_networkx():
+    G = build_graph(valid_concepts)
+
+    from_compact = CourseGraph.from_compact("course1", CompactGraph.from_concepts(valid_concepts))
+    from_nx = CourseGraph.from_networkx("course1", get_course_subgraph(G, "course1"))
+
+    assert sorted(from_compact.nodes, key=lambda n: n.id) == sorted(
+        from_nx.nodes, key=lambda n: n.id
+    )
+    assert {(e.source, e.target) for e in from_compact.links} == {
+        (e.source, e.target) for e in from_nx.links
+    }
+
+
+def test_prerequisite_closure_tracks_edits():
+    G = build_graph(valid_concepts)
+    order = IncrementalTopologicalOrder(G)
+    closure = PrerequisiteClosure(G)
+
+    def assert_matches_networkx():
+        for n in G:
+            assert set(closure.ancestors(n)) == nx.ancestors(G, n)
+            path = closure.ancestors(n)
+            assert all(not G.has_edge(v, u) for i, u in enumerate(path) for v in path[i:])
+
+    assert closure.ancestors("B") == ["A"]
+    # Only the concepts asked about and their prerequisites are computed.
+    assert closure._ancestors.keys() == {"A", "B"}
+    assert closure.ancestors("C") == ["A", "B"]
+    assert closure.is_prerequisite("A", "C")
+    assert not closure.is_prerequisite("C", "A")
+    assert not closure.is_prerequisite("A", "D")
+
+    rng = random.Random(0)
+    for i in range(40):
+        G.add_node(f"N{i}")
+        order.add_node(f"N{i}")
+        closure.add_node(f"N{i}")
+        u, v = rng.sample(list(G), 2)
+        if not G.has_edge(u, v):
+            try:
+                order.add_edge(u, v)
+            except CycleError:
+                continue
+            G.add_edge(u, v)
+            closure.add_edge(u, v)
+    assert_matches_networkx()
+
+    for u, v in rng.sample(list(G.edges), 10):
+        G.remove_edge(u, v)
+        closure.remove_edge(u, v)
+    assert_matches_networkx()
+
+    dependents = list(G.successors("A"))
+    G.remove_node("A")
+    order.remove_node("A")
+    closure.remove_node("A", dependents)
+    assert_matches_networkx()
+
+
+def test_layered_layout_layers_and_orders_nodes():
+    # A and B are listed so that the initial order has their edges crossing.
+    nodes = ["A", "B", "C", "D", "E"]
+    edges = [("A", "D"), ("B", "C"), ("C", "E"), ("A", "E")]
+
+    assert longest_path_layers(nodes, edges) == {"A": 0, "B": 0, "C": 1, "D": 1, "E": 2}
+    layout = layered_layout(nodes, edges)
+    positions = {node: (layer, x) for node, layer, x, _ in layout.positions()}
+
+    assert {node: layer for node, (layer, _) in positions.items()} == longest_path_layers(nodes, edges)
+    # A -> D and B -> C do not cross.
+    assert (positions["A"][1] < positions["B"][1]) == (positions["D"][1] < positions["C"][1])
+    for layer in layout.layers:
+        xs = [layout.x[n] for n in layer]
+        assert all(b - a >= 1.0 - 1e-9 for a, b in pairwise(xs))
+    assert min(layout.x.values()) == 0
+    assert layout.height == 2
+
+    routes = GraphLayout.from_layout(layout, edges).routes
+    assert [(r.source, r.target, len(r.points)) for r in routes] == [("A", "E", 1)]
+
+
+def test_layered_layout_reuses_unchanged_layers():
+    nodes = ["A", "B", "C", "D", "E"]
+    edges = [("A", "C"), ("B", "D"), ("C", "E")]
+    layout = layered_layout(nodes, edges)
+
+    assert layered_layout(nodes, edges, layout) is layout
+
+    updated = layered_layout([*nodes, "F"], [*edges, ("D", "F")], layout)
+    assert updated.layers[:2] == layout.layers[:2]
+    for n in "ABCD":
+        assert updated.x[n] - updated.x["A"] == pytest.approx(layout.x[n] - layout.x["A"])
+    assert updated.x.keys() == set("ABCDEF")
+
+
+def test_layout_cache_recomputes_per_version():
+    cache = LayoutCache()
+    nodes, edges = ["A", "B"], [("A", "B")]
+
+    first = cache.get("course1", 1, nodes, edges)
+    assert cache.get("course1", 1, nodes, edges) is first
+    assert cache.get("course1", 2, nodes, edges) is first
+    assert cache.get("course1", 3, [*nodes, "C"], edges).x.keys() == {"A", "B", "C"}
+    assert cache.computed == 3
+
+    cache.get("course2", 1, nodes, edges)
+    cache.discard("course1")
+    assert len(cache) == 1
+    cache.retain({"course1"})
+    assert len(cache) == 0
+
+
+def chain_concepts(n: int, course_id: str = "course1") -> List[Concept]:
+    return [
+        Concept(
+            id=f"c{i}",
+            name=f"c{i}",
+            course_id=course_id,
+            description=f"concept {i}",
+            content=f"content {i}",
+            prerequisites=[f"c{i - 1}"] if i else [],
+        )
+        for i in range(n)
+    ]
+
+
+def test_compact_course_layers():
+    compact = CompactGraph.from_concepts(valid_concepts)
+
+    course = compact.course("course1")
+    layers = [[course.ids[i] for i in layer] for layer in course.layers()]
+    assert layers == [["A"], ["B"], ["C"]]
+    assert course.layers() is course.layers()
+    assert compact.course("course2").layers() == [[0]]
+
+
+def test_course_graph_pages_hold_whole_layers():
+    concepts = [*chain_concepts(3), *valid_concepts]
+    compact = CompactGraph.from_concepts(concepts)
+
+    first = CourseGraphPage.from_compact("course1", compact, 0, 2)
+    assert [{n.id for n in layer.nodes} for layer in first.layers] == [{"A", "c0"}]
+    assert first.next_cursor == "1"
+
+    second = CourseGraphPage.from_compact("course1", compact, 1, 4)
+    assert [{n.id for n in layer.nodes} for layer in second.layers] == [{"B", "c1"}, {"C", "c2"}]
+    assert {(e.source, e.target) for e in second.links} == {
+        ("A", "B"), ("c0", "c1"), ("A", "C"), ("B", "C"), ("c1", "c2"),
+    }
+    assert second.next_cursor is None
+
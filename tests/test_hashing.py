@@ -0,0 +1,60 @@
+import asyncio
+
+from backend.hashing import HashingOverloadedError, PasswordHashingService
+
+
+def test_hash_and_verify_in_process_pool():
+    service = PasswordHashingService(max_workers=1)
+
+    async def run():
+        hashed = await service.hash("secret")
+        return (
+            await service.verify("secret", hashed),
+            await service.verify("wrong", hashed),
+        )
+
+    try:
+        assert asyncio.run(run()) == (True, False)
+    finally:
+        service.shutdown()
+
+    stats = service.stats()
+    assert stats["completed"] == 3
+    assert stats["failed"] == 0
+    assert stats["in_flight"] == 0
+    assert stats["max_latency_seconds"] > 0
+
+
+def test_sheds_load_when_queue_is_full():
+    service = PasswordHashingService(max_workers=1, max_queue=0)
+
+    async def run():
+        return await asyncio.gather(
+            service.hash("a"), service.hash("b"), return_exceptions=True
+        )
+
+    try:
+        first, second = asyncio.run(run())
+    finally:
+        service.shutdown()
+
+    assert isinstance(first, str)
+    assert isinstance(second, HashingOverloadedError)
+    assert service.rejected == 1
+
+
+def test_failed_jobs_are_not_counted_as_completed():
+    service = PasswordHashingService(max_workers=1)
+
+    async def run():
+        return await asyncio.gather(service.verify("secret", "not a hash"), return_exceptions=True)
+
+    try:
+        (result,) = asyncio.run(run())
+    finally:
+        service.shutdown()
+
+    assert isinstance(result, Exception)
+    stats = service.stats()
+    assert (stats["completed"], stats["failed"], stats["in_flight"]) == (0, 1, 0)
+    assert stats["avg_latency_seconds"] == stats["max_latency_seconds"] == 0
@@ -0,0 +1,79 @@
+import json
+
+import pytest
+
+from backend.catalog import Catalog
+from backend.ingest import IngestError, load_catalog, load_records
+from backend.models.concepts import Concept
+
+
+def concept(id: str, prerequisites: list[str], course_id: str = "course1") -> dict:
+    return {
+        "id": id,
+        "name": id,
+        "description": f"concept {id}",
+        "course_id": course_id,
+        "prerequisites": prerequisites,
+        "content": f"content {id}",
+    }
+
+
+def write_jsonl(path, records):
+    path.write_text("\n".join(json.dumps(r) for r in records) + "\n")
+    return path
+
+
+@pytest.fixture
+def courses_path(tmp_path):
+    return write_jsonl(
+        tmp_path / "courses.jsonl",
+        [{"id": "course1", "name": "Course 1", "description": "first"}],
+    )
+
+
+def test_load_catalog_in_batches(tmp_path, courses_path):
+    # Prerequisites may refer to concepts later in the stream.
+    records = [concept(f"c{i}", [f"c{i + 1}"] if i < 9 else []) for i in range(10)]
+    concepts_path = write_jsonl(tmp_path / "concepts.jsonl", records)
+
+    concepts, courses = load_catalog(concepts_path, courses_path, batch_size=3)
+
+    assert [c.id for c in concepts] == [f"c{i}" for i in range(10)]
+    assert Catalog(concepts, courses).dependents_of("c9") == ["c8"]
+
+
+def test_load_catalog_reports_every_error(tmp_path, courses_path):
+    concepts_path = tmp_path / "concepts.jsonl"
+    concepts_path.write_text(
+        "\n".join(
+            [
+                json.dumps(concept("a", [])),
+                "",
+                json.dumps({"id": "b"}),
+                "{not json",
+                json.dumps(concept("c", ["missing"])),
+                json.dumps(concept("d", [], course_id="nope")),
+                json.dumps(concept("a", [])),
+            ]
+        )
+    )
+
+    with pytest.raises(IngestError) as excinfo:
+        load_catalog(concepts_path, courses_path, batch_size=2)
+
+    errors = excinfo.value.errors
+    assert any(e.startswith("line 3: name") for e in errors)
+    assert any(e.startswith("line 4:") for e in errors)
+    assert "concept c: prerequisite missing not found" in errors
+    assert "concept d: course nope not found" in errors
+    assert "concept a: duplicate ID" in errors
+
+
+def test_load_records_with_process_pool(tmp_path):
+    records = [concept(f"c{i}", []) for i in range(25)]
+    path = write_jsonl(tmp_path / "concepts.jsonl", records)
+
+    concepts, errors = load_records(path, Concept, batch_size=4, workers=2)
+
+    assert errors == []
+    assert [c.id for c in concepts] == [r["id"] for r in records]
@@ -0,0 +1,28 @@
+from benchmarks.loadtest import check_budgets, percentile
+
+
+def test_percentile_nearest_rank():
+    values = [float(v) for v in range(1, 101)]
+
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile(values, 100) == 100
+    assert percentile([], 95) == 0.0
+
+
+def test_check_budgets():
+    summary = {
+        "rps": 50.0,
+        "error_rate": 0.0,
+        "routes": {"GET /me": {"p95_ms": 12.0, "p99_ms": 40.0}},
+    }
+
+    assert check_budgets(summary, {"routes": {"GET /me": {"p95_ms": 20}}}) == []
+    assert check_budgets(
+        summary,
+        {"min_rps": 100, "routes": {"GET /me": {"p99_ms": 20}, "GET /courses": {}}},
+    ) == [
+        "throughput 50.0 rps < 100",
+        "GET /me: p99_ms 40.0 > 20",
+        "GET /courses: no requests recorded",
+    ]
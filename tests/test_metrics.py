@@ -0,0 +1,39 @@
+from backend.metrics import SPAN_LATENCY, Registry, span
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = Registry()
+    latency = registry.histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0))
+    latency.observe(0.05, "/a")
+    latency.observe(0.5, "/a")
+    latency.observe(5.0, "/a")
+
+    text = registry.render()
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{route="/a",le="1.0"} 2' in text
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 3' in text
+    assert 'latency_seconds_count{route="/a"} 3' in text
+    assert latency.count("/a") == 3
+
+
+def test_counters_gauges_and_stats():
+    registry = Registry()
+    requests = registry.counter("requests_total", "Requests.", ("status",))
+    in_flight = registry.gauge("in_flight", "In flight.")
+    registry.stats("cache", "Cache", lambda: {"hits": 3, "hit_rate": 0.75})
+    requests.inc("200")
+    requests.inc("200")
+    in_flight.inc()
+    in_flight.dec()
+
+    text = registry.render()
+    assert 'requests_total{status="200"} 2' in text
+    assert "# TYPE in_flight gauge\nin_flight 0" in text
+    assert "cache_hits 3" in text
+    assert "cache_hit_rate 0.75" in text
+
+
+def test_span_outside_request_is_recorded():
+    with span("test-span"):
+        pass
+    assert SPAN_LATENCY.count("test-span") == 1
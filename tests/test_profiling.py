@@ -0,0 +1,121 @@
+import sys
+import threading
+import time
+
+from backend import app as app_module
+from backend.models.profiling import ProfilerSettings
+from backend.profiling import (
+    ProfiledRoute,
+    RequestProfiler,
+    StackSampler,
+    _current_sampler,
+)
+
+
+def busy_work(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def test_sampler_collects_stacks_of_profiled_threads():
+    sampler = StackSampler(interval=0.001)
+    stop = threading.Event()
+    worker = threading.Thread(target=busy_work, args=(stop,), name="busy")
+    other = threading.Thread(target=busy_work, args=(stop,), name="other")
+    worker.start()
+    other.start()
+    sampler.start()
+    sampler.begin(worker.ident)
+    try:
+        time.sleep(0.05)
+    finally:
+        sampler.end(worker.ident)
+        sampler.stop()
+        stop.set()
+        worker.join()
+        other.join()
+
+    assert sampler.samples > 0
+    assert "busy;" in sampler.collapsed()
+    assert ":busy_work" in sampler.collapsed()
+    assert "other;" not in sampler.collapsed()
+
+    samples = sampler.samples
+    time.sleep(0.01)
+    assert sampler.samples == samples
+
+
+
+def test_sampler_samples_a_marked_thread_only_while_the_marker_runs():
+    def finished():
+        return sys._getframe()
+
+    sampler = StackSampler()
+    ident, marker = threading.get_ident(), sys._getframe()
+    for frame in (marker, finished()):
+        sampler.begin(ident, frame)
+        sampler.sample()
+        sampler.end(ident, frame)
+
+    assert sampler.samples == 2
+    assert sum(sampler.stacks.values()) == 1
+    assert ":test_sampler_samples_a_marked_thread_only_while_the_marker_runs" in sampler.collapsed()
+
+
+def test_profiled_route_samples_sync_endpoint_threads():
+    sampler = StackSampler()
+    seen = []
+
+    def endpoint():
+        seen.append({ident: list(markers) for ident, markers in sampler._targets.items()})
+
+    route = ProfiledRoute("/work", endpoint)
+    route.endpoint()
+    token = _current_sampler.set(sampler)
+    try:
+        route.endpoint()
+    finally:
+        _current_sampler.reset(token)
+
+    assert seen == [{}, {threading.get_ident(): [None]}]
+    assert sampler._targets == {}
+
+
+def test_restarted_sampler_stays_idle_without_requests():
+    sampler = StackSampler(interval=0.001)
+    sampler.start()
+    sampler.stop()
+    sampler.start()
+    try:
+        time.sleep(0.05)
+    finally:
+        sampler.stop()
+
+    assert sampler.samples == 0
+
+
+def scope(path: str, headers=()):
+    return {
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "root_path": "",
+        "headers": list(headers),
+        "app": app_module.app,
+    }
+
+
+def test_request_selection():
+    profiler = RequestProfiler()
+    assert not profiler.should_profile(scope("/me"))
+
+    profiler.settings = ProfilerSettings(every=3)
+    profiler.enabled = True
+    assert [profiler.should_profile(scope("/me")) for _ in range(6)] == [
+        True, False, False, True, False, False,
+    ]
+
+    profiler.settings = ProfilerSettings(route="/courses/{course_id}/graph", header="X-Profile")
+    assert profiler.should_profile(scope("/courses/calculus1/graph"))
+    assert not profiler.should_profile(scope("/courses/calculus1"))
+    assert profiler.should_profile(scope("/me", [(b"x-profile", b"1")]))
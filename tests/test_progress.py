@@ -0,0 +1,117 @@
+from uuid import uuid4
+
+import pytest
+
+from backend.catalog import Catalog, CatalogStore
+from backend.models.courses import Course
+from backend.progress import ConceptInterner, LearnerProgress, ProgressTracker
+from backend.repositories.progress import (InMemoryProgressRepository,
+                                           MongoProgressRepository)
+from conftest import make_concept
+
+
+# A -> B -> D, A -> C -> D, and E in course2 needs B.
+concepts = [
+    make_concept("A", "course1", []),
+    make_concept("B", "course1", ["A"]),
+    make_concept("C", "course1", ["A"]),
+    make_concept("D", "course1", ["B", "C"]),
+    make_concept("E", "course2", ["B"]),
+    make_concept("F", "course2", []),
+]
+
+courses = [
+    Course(id="course1", name="Course 1", description="first", concepts=[]),
+    Course(id="course2", name="Course 2", description="second", concepts=[]),
+]
+
+
+@pytest.fixture(params=["memory", "mongomock"])
+def repo(request):
+    if request.param == "memory":
+        return InMemoryProgressRepository()
+    mongomock = pytest.importorskip("mongomock")
+    return MongoProgressRepository(mongomock.MongoClient()["nexus"]["progress"])
+
+
+def test_repository_records_completions_once(repo):
+    user_id = uuid4()
+
+    assert repo.completed(user_id) == set()
+    assert repo.add_completed(user_id, "A")
+    assert not repo.add_completed(user_id, "A")
+    assert repo.add_completed(user_id, "B")
+    assert repo.completed(user_id) == {"A", "B"}
+    assert repo.completed(uuid4()) == set()
+
+
+def test_interner_round_trips_bitsets():
+    interner = ConceptInterner()
+    bits = 1 << interner.bit("x") | 1 << interner.bit("z")
+
+    assert interner.bit("y") == 2
+    assert interner.bit("x") == 0
+    assert interner.decode(bits) == ["x", "z"]
+
+
+def test_completions_unlock_dependents_incrementally():
+    catalog = Catalog(concepts, courses)
+    progress = LearnerProgress(catalog, ConceptInterner())
+
+    assert progress.frontier(catalog, "course1") == ["A"]
+    assert progress.frontier(catalog, "course2") == ["F"]
+    assert progress.complete(catalog, "A") == ["B", "C"]
+    assert progress.complete(catalog, "A") == []
+    assert progress.complete(catalog, "B") == ["E"]
+    assert progress.frontier(catalog, "course1") == ["C"]
+    assert sorted(progress.frontier(catalog, "course2")) == ["E", "F"]
+    assert progress.complete(catalog, "C") == ["D"]
+    assert progress.frontier(catalog, "course1") == ["D"]
+    assert progress.completed_in(catalog, "course1") == 3
+    assert progress.completed_in(catalog, "course2") == 0
+
+
+def test_completing_out_of_order_does_not_unlock_completed_concepts():
+    catalog = Catalog(concepts, courses)
+    progress = LearnerProgress(catalog, ConceptInterner(), ["D", "B"])
+
+    assert progress.frontier(catalog, "course1") == ["A"]
+    assert progress.complete(catalog, "A") == ["C"]
+    assert progress.complete(catalog, "C") == []
+    assert progress.frontier(catalog, "course1") == []
+
+
+def test_tracker_persists_and_rebuilds_after_edits(repo):
+    store = CatalogStore(Catalog(concepts, courses))
+    tracker = ProgressTracker(repo)
+    user_id = uuid4()
+
+    assert tracker.complete(store.current, user_id, "A") == ["B", "C"]
+    assert tracker.complete(store.current, user_id, "A") == ["B", "C"]
+    assert tracker.frontier(store.current, user_id, "course1") == (["B", "C"], 1)
+
+    store.add_concept(make_concept("G", "course1", ["A"]))
+    assert tracker.frontier(store.current, user_id, "course1") == (["B", "C", "G"], 1)
+    assert tracker.rebuilds == 1
+
+    # A fresh tracker, like another worker, loads the state from the repository.
+    other = ProgressTracker(repo)
+    assert other.frontier(store.current, user_id, "course1") == (["B", "C", "G"], 1)
+
+
+def test_tracker_reloads_expired_and_evicted_states():
+    now = [0.0]
+    repo = InMemoryProgressRepository()
+    tracker = ProgressTracker(repo, max_users=1, ttl=10.0, clock=lambda: now[0])
+    catalog = Catalog(concepts, courses)
+    user_id, other_id = uuid4(), uuid4()
+
+    tracker.frontier(catalog, user_id, "course1")
+    repo.add_completed(user_id, "A")
+    assert tracker.frontier(catalog, user_id, "course1") == (["A"], 0)
+    now[0] = 10.0
+    assert tracker.frontier(catalog, user_id, "course1") == (["B", "C"], 1)
+
+    tracker.frontier(catalog, other_id, "course1")
+    assert len(tracker) == 1
+    assert tracker.loads == 3
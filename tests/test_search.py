@@ -0,0 +1,94 @@
+import pytest
+
+from backend.models.concepts import Concept
+from backend.search import SearchIndex, tokenize
+
+
+def make_concept(id: str, name: str, description: str = "", content: str = "", course_id: str = "calc") -> Concept:
+    return Concept(
+        id=id,
+        name=name,
+        description=description,
+        course_id=course_id,
+        prerequisites=[],
+        content=content,
+    )
+
+
+concepts = [
+    make_concept("limits", "Limits", "The value a function approaches.", "Limits of sequences and functions."),
+    make_concept("derivatives", "Derivatives", "Rates of change, defined with limits."),
+    make_concept("integrals", "Integrals", "Area under a curve.", "Riemann sums of a function."),
+    make_concept("vectors", "Vectors", "Quantities with a direction.", course_id="linalg"),
+]
+
+
+def test_tokenize():
+    assert tokenize("The Chain_Rule, of f(g(x))!") == ["chain", "rule", "f", "g", "x"]
+    assert tokenize("Élan 2D") == ["élan", "2d"]
+
+
+def test_search_ranks_by_bm25():
+    index = SearchIndex(concepts)
+
+    ids = [concept_id for concept_id, _ in index.search("limits")]
+    # A match in the name outranks one in the description.
+    assert ids == ["limits", "derivatives"]
+    assert index.search("function area")[0][0] == "integrals"
+    assert index.search("the of") == []
+    assert index.search("missing") == []
+
+
+def test_search_filters_by_course_and_limits_results():
+    index = SearchIndex(concepts)
+
+    assert [hit for hit, _ in index.search("direction function", course_id="linalg")] == ["vectors"]
+    assert index.search("vectors", course_id="calc") == []
+    assert len(index.search("function", limit=1)) == 1
+
+
+def test_search_completes_the_last_term_as_a_prefix():
+    index = SearchIndex(concepts)
+
+    assert index.search("deriv") == []
+    assert [hit for hit, _ in index.search("deriv", prefix=True)] == ["derivatives"]
+    assert [hit for hit, _ in index.search("area cur", prefix=True)] == ["integrals"]
+    assert index.expand("li") == ["limits"]
+
+
+def test_search_handles_documents_without_terms():
+    index = SearchIndex([make_concept("empty", "The", "Of a", "")])
+
+    assert index.search("the") == []
+    assert index.search("empty") == []
+    index.add(make_concept("limits", "Limits"))
+    assert [hit for hit, _ in index.search("limits")] == ["limits"]
+
+
+def test_add_and_remove_patch_the_index():
+    index = SearchIndex(concepts)
+
+    index.add(make_concept("series", "Series", "Sums of sequences, defined with limits."))
+    assert "series" in index
+    assert "series" in {hit for hit, _ in index.search("sequences")}
+    assert index.expand("seri") == ["series"]
+
+    index.add(make_concept("series", "Series", "Infinite sums."))
+    assert "series" not in {hit for hit, _ in index.search("sequences")}
+
+    index.remove("series")
+    index.remove("series")
+    assert len(index) == len(concepts)
+    assert index.expand("seri") == []
+    assert index.search("infinite") == []
+
+
+def test_incremental_index_matches_a_rebuild():
+    index = SearchIndex(concepts[:2])
+    for concept in concepts[2:]:
+        index.add(concept)
+
+    incremental = index.search("function limits")
+    rebuilt = SearchIndex(concepts).search("function limits")
+    assert [hit for hit, _ in incremental] == [hit for hit, _ in rebuilt]
+    assert [score for _, score in incremental] == pytest.approx([score for _, score in rebuilt])
@@ -0,0 +1,55 @@
+from uuid import uuid4
+
+from backend.models.users import UserInDB
+from backend.sessions import SessionCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_user() -> UserInDB:
+    return UserInDB(id=uuid4(), username="alice", hashed_password="hash")
+
+
+def test_session_expires_at_token_exp_or_ttl():
+    clock = FakeClock()
+    cache = SessionCache(ttl=60, clock=clock)
+    user = make_user()
+
+    cache.put("short", user, expires_at=clock.now + 10)
+    cache.put("long", user, expires_at=clock.now + 3600)
+    assert cache.get("short") is user
+
+    clock.now += 10
+    assert cache.get("short") is None
+    assert cache.get("long") is user
+
+    clock.now += 50
+    assert cache.get("long") is None
+    assert cache.expirations == 2
+    assert cache.hit_rate == 0.5
+
+
+def test_session_eviction_by_size_token_and_user():
+    cache = SessionCache(max_entries=2)
+    alice, bob = make_user(), make_user()
+
+    cache.put("a1", alice, expires_at=float("inf"))
+    cache.put("a2", alice, expires_at=float("inf"))
+    cache.put("b1", bob, expires_at=float("inf"))
+    assert cache.get("a1") is None
+    assert cache.evictions == 1
+
+    cache.evict_token("b1")
+    assert cache.get("b1") is None
+
+    cache.put("b1", bob, expires_at=float("inf"))
+    cache.evict_user(alice.id)
+    assert cache.get("a2") is None
+    assert cache.get("b1") is bob
+    assert len(cache) == 1
@@ -0,0 +1,187 @@
+import json
+
+import pytest
+
+from backend.catalog import Catalog, CatalogStore
+from backend.snapshot import (CatalogSnapshot, SnapshotError,
+                              SnapshotWatcher, build_snapshot, main,
+                              open_catalog, source_fingerprint,
+                              write_snapshot)
+from benchmarks.synthetic import generate_catalog
+
+
+@pytest.fixture
+def sources(tmp_path):
+    raw_concepts, raw_courses = generate_catalog(5, 300, seed=1)
+    concepts_path = tmp_path / "concepts.jsonl"
+    courses_path = tmp_path / "courses.jsonl"
+    concepts_path.write_text("\n".join(json.dumps(c) for c in raw_concepts))
+    courses_path.write_text("\n".join(json.dumps(c) for c in raw_courses))
+    return concepts_path, courses_path
+
+
+@pytest.fixture
+def snapshot_path(tmp_path, sources):
+    path = tmp_path / "catalog.snap"
+    assert main([str(path), "--concepts", str(sources[0]), "--courses", str(sources[1])]) == 0
+    return path
+
+
+def test_snapshot_catalog_matches_validated_catalog(sources, snapshot_path):
+    loaded = CatalogSnapshot(snapshot_path).catalog()
+    expected = open_catalog(None, *sources)
+
+    assert loaded.concepts == expected.concepts
+    assert loaded.get_content("concept7") == expected.get_content("concept7") != ""
+    assert loaded.course_order == expected.course_order
+    assert set(loaded.graph.edges) == set(expected.graph.edges)
+    assert loaded.compact.course("course2").edges() == expected.compact.course("course2").edges()
+    assert loaded.learning_path("concept299") == expected.learning_path("concept299")
+
+
+def test_snapshot_catalog_decodes_on_first_use(snapshot_path):
+    catalog = CatalogSnapshot(snapshot_path).catalog()
+    assert (catalog._graph, catalog._order, catalog._closure) == (None, None, None)
+    assert len(catalog.concepts) == 300
+
+    concept = catalog.get_concept("concept7")
+    assert list(catalog.concepts_by_course._values) == [concept.course_id]
+    assert catalog.compact.course(concept.course_id).concepts is catalog.concepts_in_course(concept.course_id)
+    assert catalog.get_course(concept.course_id).concepts is catalog.concepts_in_course(concept.course_id)
+    assert (catalog._graph, catalog._order, catalog._closure) == (None, None, None)
+
+
+def test_snapshot_catalog_supports_edits(snapshot_path):
+    catalog = CatalogSnapshot(snapshot_path).catalog()
+    members = catalog.compact.course("course0").ids
+
+    edited, _ = catalog.remove_concept(members[0])
+    assert members[0] not in edited.compact.course("course0").ids
+    assert members[0] in catalog.compact.course("course0").ids
+
+    # Bodies added after loading go to a private file, after the snapshot's content section.
+    added = catalog.get_concept(members[1]).model_copy(update={"id": "added", "content": "new body"})
+    edited, _ = edited.add_concept(added)
+    assert edited.get_content("added") == "new body"
+    assert edited.get_content(members[1]) != ""
+
+
+def test_open_catalog_falls_back_when_stale_or_missing(tmp_path, sources, snapshot_path):
+    assert isinstance(open_catalog(snapshot_path, *sources).compact.course("course0").out_targets, memoryview)
+
+    with sources[0].open("a") as f:
+        f.write("\n")
+    stale = open_catalog(snapshot_path, *sources)
+    assert not isinstance(stale.compact.course("course0").out_targets, memoryview)
+
+    missing = open_catalog(tmp_path / "missing.snap", *sources)
+    assert isinstance(missing, Catalog)
+
+
+def test_snapshot_rejects_other_files(tmp_path):
+    path = tmp_path / "bogus.snap"
+    path.write_bytes(b"not a snapshot")
+    with pytest.raises(SnapshotError):
+        CatalogSnapshot(path)
+
+
+def test_fingerprint_tracks_source_content(sources):
+    before = source_fingerprint(sources)
+    assert source_fingerprint(sources) == before
+    sources[1].write_text("")
+    assert source_fingerprint(sources) != before
+
+
+def test_write_snapshot_from_sample_data(tmp_path):
+    path = tmp_path / "sample.snap"
+    assert main([str(path)]) == 0
+    assert open_catalog(path).get_concept("limits") is not None
+    assert not list(tmp_path.glob(".*.tmp"))
+
+
+def test_write_snapshot_is_atomic_on_error(tmp_path, sources):
+    path = tmp_path / "catalog.snap"
+    catalog = open_catalog(None, *sources)
+    concepts = list(catalog.concepts.values())
+    broken = concepts[-1].model_copy(update={"prerequisites": ["missing"]})
+    with pytest.raises(ValueError):
+        write_snapshot(path, [*concepts[:-1], broken], catalog.courses.values(), "x")
+    assert not path.exists()
+
+
+def test_watcher_swaps_in_replaced_snapshot(tmp_path, sources, snapshot_path):
+    store = CatalogStore(open_catalog(snapshot_path, *sources))
+    watcher = SnapshotWatcher(store, snapshot_path)
+    old = store.current
+    assert not watcher.check()
+
+    raw_concepts, raw_courses = generate_catalog(3, 50, seed=2)
+    sources[0].write_text("\n".join(json.dumps(c) for c in raw_concepts))
+    sources[1].write_text("\n".join(json.dumps(c) for c in raw_courses))
+    build_snapshot(snapshot_path, *sources)
+
+    assert watcher.check()
+    assert store.current.version == old.version + 1
+    assert len(store.current.concepts) == 50
+    # Requests still holding the previous version can keep reading its mapped arrays.
+    assert len(old.compact.course("course4").ids) == 60
+    assert not watcher.check()
+
+
+def test_watcher_shares_edits_with_other_workers(sources, snapshot_path):
+    workers = [CatalogStore(open_catalog(snapshot_path, *sources)) for _ in range(2)]
+    first, second = (SnapshotWatcher(store, snapshot_path) for store in workers)
+    members = workers[0].current.compact.course("course0").ids
+
+    first.edit(lambda catalog: catalog.remove_concept(members[0]))
+    assert members[0] not in workers[0].current.concepts
+    assert not first.check()
+
+    # The second worker catches up with the first edit before applying its own.
+    added = workers[1].current.get_concept(members[1]).model_copy(update={"id": "added", "content": "new body"})
+    second.edit(lambda catalog: catalog.add_concept(added))
+    assert members[0] not in workers[1].current.concepts
+
+    assert first.check()
+    for store in workers:
+        assert members[0] not in store.current.concepts
+        assert store.current.get_content("added") == "new body"
+    # A restart from the same sources keeps the edits.
+    assert "added" in open_catalog(snapshot_path, *sources).concepts
+
+    with pytest.raises(KeyError):
+        first.edit(lambda catalog: catalog.remove_concept(members[0]))
+    assert not second.check()
+
+
+def test_failed_watcher_edit_leaves_current_catalog_intact(monkeypatch, sources, snapshot_path):
+    store = CatalogStore(open_catalog(snapshot_path, *sources))
+    watcher = SnapshotWatcher(store, snapshot_path)
+    current = store.current
+    concept_id = current.compact.course("course0").ids[0]
+    body = current.get_content(concept_id)
+    name = current.get_concept(concept_id).name
+    assert current.search(name)[0][0].id == concept_id
+
+    def fail(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr("backend.snapshot.write_snapshot", fail)
+    with pytest.raises(OSError):
+        watcher.edit(lambda catalog: catalog.remove_concept(concept_id))
+    assert store.current is current
+    assert current.get_content(concept_id) == body != ""
+    assert current.search(name)[0][0].id == concept_id
+
+
+def test_watcher_keeps_catalog_on_unreadable_snapshot(tmp_path, sources, snapshot_path):
+    store = CatalogStore(open_catalog(snapshot_path, *sources))
+    watcher = SnapshotWatcher(store, snapshot_path)
+    current = store.current
+
+    replacement = tmp_path / "replacement"
+    replacement.write_bytes(b"garbage")
+    replacement.replace(snapshot_path)
+
+    assert not watcher.check()
+    assert store.current is current
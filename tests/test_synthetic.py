@@ -0,0 +1,13 @@
+from benchmarks.synthetic import generate_catalog
+from backend.catalog import Catalog, validate_records
+
+
+def test_generate_catalog_is_seeded_and_acyclic():
+    concepts, courses = generate_catalog(5, 200, fan_in=4, seed=1)
+
+    assert generate_catalog(5, 200, fan_in=4, seed=1) == (concepts, courses)
+    assert len(concepts) == 200 and len(courses) == 5
+    assert all(len(c["prerequisites"]) <= 4 for c in concepts)
+
+    catalog = Catalog(*validate_records(concepts, courses))
+    assert catalog.graph.number_of_edges() > 0
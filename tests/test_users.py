@@ -0,0 +1,64 @@
+from uuid import uuid4
+
+import pytest
+
+from backend.models.users import UserInDB
+from backend.repositories.users import InMemoryUserRepository, MongoUserRepository
+
+
+def make_user(username: str) -> UserInDB:
+    return UserInDB(id=uuid4(), username=username, hashed_password="hash")
+
+
+@pytest.fixture(params=["memory", "mongomock"])
+def repo(request):
+    if request.param == "memory":
+        return InMemoryUserRepository()
+    mongomock = pytest.importorskip("mongomock")
+    return MongoUserRepository(mongomock.MongoClient()["nexus"]["users"])
+
+
+def test_lookup_by_id_and_username(repo):
+    user = make_user("alice")
+    assert repo.add(user)
+
+    assert repo.get_by_id(user.id) == user
+    assert repo.get_by_username("alice") == user
+    assert repo.get_by_username("bob") is None
+    assert repo.get_by_id(uuid4()) is None
+    assert not repo.username_available("alice")
+    assert repo.username_available("bob")
+
+
+def test_add_rejects_duplicates(repo):
+    written = []
+    repo.subscribe(written.append)
+    user = make_user("alice")
+    assert repo.add(user)
+
+    assert not repo.add(make_user("alice"))
+    assert not repo.add(user.model_copy(update={"username": "other"}))
+    assert written == [user]
+
+
+def test_in_memory_repository_caches_instances():
+    record = {"id": str(uuid4()), "username": "alice", "hashed_password": "hash"}
+    repo = InMemoryUserRepository([record])
+
+    user = repo.get_by_username("alice")
+    assert user is repo.get_by_id(user.id)
+    assert len(repo) == 1
+
+
+def test_mongo_repository_caches_instances():
+    mongomock = pytest.importorskip("mongomock")
+    repo = MongoUserRepository(mongomock.MongoClient()["nexus"]["users"], cache_size=2)
+    alice, bob = make_user("alice"), make_user("bob")
+    assert repo.add(alice) and repo.add(bob)
+
+    user = repo.get_by_username("alice")
+    assert user == alice
+    assert repo.get_by_id(alice.id) is user
+    # Bob's two entries push alice's out of the LRU.
+    assert repo.get_by_id(bob.id) is repo.get_by_username("bob")
+    assert repo.get_by_username("alice") is not user